@@ -0,0 +1 @@
+# Micro-benchmarks for the agentic content generation pipeline
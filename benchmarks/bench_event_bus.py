@@ -0,0 +1,75 @@
+"""Micro-benchmark for EventBus dispatch throughput at different queue depths.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_event_bus
+    python -m benchmarks.bench_event_bus --depths 10 10000 --legacy
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from src.agent_core import EventBus, Message
+
+
+class _CountingAgent:
+    name = "CountingAgent"
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
+        self.count += 1
+
+
+class _ListEventBus:
+    """The original list-backed bus (pop(0) plus a subscriber copy per message), kept for comparison."""
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, List[_CountingAgent]] = {}
+        self._queue: List[Message] = []
+
+    def subscribe(self, message_type: str, agent: _CountingAgent) -> None:
+        self._subscribers.setdefault(message_type, []).append(agent)
+
+    def publish(self, msg: Message) -> None:
+        self._queue.append(msg)
+
+    def run(self) -> None:
+        while self._queue:
+            msg = self._queue.pop(0)
+            for agent in list(self._subscribers.get(msg.type, [])):
+                agent.on_message(msg, self.publish)
+
+
+def bench(bus_factory: Callable[[], object], depth: int) -> float:
+    """Fill the queue to ``depth`` messages, drain it, and return messages/sec."""
+    bus = bus_factory()
+    agent = _CountingAgent()
+    bus.subscribe("PING", agent)
+    msg = Message(type="PING", payload={})
+    for _ in range(depth):
+        bus.publish(msg)
+    start = time.perf_counter()
+    bus.run()
+    elapsed = time.perf_counter() - start
+    assert agent.count == depth
+    return depth / elapsed if elapsed > 0 else float("inf")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--depths", type=int, nargs="+", default=[10, 10_000, 1_000_000])
+    ap.add_argument("--legacy", action="store_true", help="also time the list-backed bus (depths <= 100k only)")
+    args = ap.parse_args()
+
+    print(f"{'depth':>10}  {'EventBus msg/s':>16}  {'list bus msg/s':>16}")
+    for depth in args.depths:
+        rate = bench(EventBus, depth)
+        legacy = "-"
+        if args.legacy and depth <= 100_000:
+            legacy = f"{bench(_ListEventBus, depth):,.0f}"
+        print(f"{depth:>10,}  {rate:>16,.0f}  {legacy:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Memory benchmark: bytes/product for keeping a catalog's products and answered questions.
+
+Compares mutable dataclasses, FrozenProduct/FrozenQuestion tuples and a QuestionTable.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --products 10000
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Callable
+
+from benchmarks.catalog import synthetic_catalog
+from src.agents.parser_agent import ParserAgent
+from src.blocks.question_sets import QuestionTable
+from src.blocks.questions import answer_question, generate_questions, generate_questions_bulk
+from src.models import FrozenProduct, FrozenQuestion
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Bytes still allocated by the object graph ``build`` returns."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--products", type=int, default=100_000)
+    args = ap.parse_args()
+
+    parser = ParserAgent()
+    raws = synthetic_catalog(args.products)
+
+    def dataclasses():
+        out = []
+        for raw in raws:
+            p = parser.run(raw)
+            out.append((p, [answer_question(q, p) for q in generate_questions(p)]))
+        return out
+
+    def frozen():
+        out = []
+        for raw in raws:
+            p = parser.run(raw)
+            qs = tuple(FrozenQuestion.from_question(answer_question(q, p)) for q in generate_questions(p))
+            out.append((FrozenProduct.from_product(p), qs))
+        return out
+
+    def table():
+        products = [FrozenProduct.from_product(parser.run(raw)) for raw in raws]
+        t = QuestionTable()
+        for start in range(0, len(products), 10_000):
+            t.extend(generate_questions_bulk(products[start:start + 10_000]))
+        return products, t
+
+    print(f"products={args.products:,}")
+    for label, build in (("dataclasses + lists", dataclasses), ("FrozenProduct/FrozenQuestion", frozen),
+                         ("FrozenProduct + QuestionTable", table)):
+        size = measure(build)
+        print(f"  {label:<30} {size / args.products:>10,.0f} bytes/product")
+
+
+if __name__ == "__main__":
+    main()
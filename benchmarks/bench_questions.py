@@ -0,0 +1,127 @@
+"""Benchmark question answering (if/elif chain vs precomputed intents) and bulk generation.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_questions
+    python -m benchmarks.bench_questions --products 10000
+"""
+import argparse
+import time
+from typing import List
+
+from benchmarks.catalog import iter_catalog
+from src.agents.parser_agent import ParserAgent
+from src.blocks.questions import answer_question, generate_questions, generate_questions_bulk
+from src.models import Product, Question
+
+
+# The original implementation, kept verbatim for comparison.
+def _legacy_answer_question(q: Question, product: Product) -> Question:
+    p = product
+    t = q.text.lower()
+
+    # Specific intents first
+    if "key ingredients" in t:
+        q.answer = ", ".join(p.key_ingredients) if p.key_ingredients else "Not specified."
+    elif "skin types" in t:
+        q.answer = ", ".join(p.skin_types) if p.skin_types else "Not specified."
+    elif "concentration" in t:
+        q.answer = p.concentration or "Not specified."
+    elif "benefits" in t:
+        q.answer = ", ".join(p.benefits) if p.benefits else "Not specified."
+    elif "price" in t:
+        q.answer = p.price or "Not specified."
+    elif t.startswith("how should i use") or "how should i use" in t:
+        q.answer = p.how_to_use or "Not specified."
+    elif "morning or night" in t:
+        if p.how_to_use and "morning" in p.how_to_use.lower():
+            q.answer = "Morning, before sunscreen."
+        else:
+            q.answer = "Not specified."
+    elif "how many drops" in t:
+        if p.how_to_use:
+            import re
+            # Capture counts like "2-3 drops", "2–3 drops", "2 to 3 drops", or a single number
+            m = re.search(r"(\d+)(?:\s*(?:\-|\u2013|to)\s*(\d+))?\s*drops", p.how_to_use.lower())
+            if m:
+                a, b = m.group(1), m.group(2)
+                q.answer = f"Apply {a}-{b} drops." if b else f"Apply {a} drops."
+            else:
+                q.answer = p.how_to_use
+        else:
+            q.answer = "Not specified."
+    elif "sunscreen" in t:
+        if p.how_to_use and "sunscreen" in p.how_to_use.lower():
+            q.answer = "Yes, apply before sunscreen."
+        else:
+            q.answer = "Not specified."
+    elif "side effects" in t:
+        q.answer = p.side_effects or "Not specified."
+    elif "sensitive skin" in t:
+        if p.side_effects and "sensitive" in p.side_effects.lower():
+            q.answer = p.side_effects
+        else:
+            q.answer = "Not specified."
+    elif "other actives" in t:
+        q.answer = "Not specified."
+    elif "how long will one bottle" in t:
+        q.answer = "Not specified."
+    elif "compare" in t and "vitamin c serums" in t:
+        q.answer = "Not specified."
+    elif "different from product b" in t:
+        q.answer = "See comparison page."
+    elif "what is" in t:
+        q.answer = f"{p.name} is a skincare serum."
+    else:
+        q.answer = "Not specified."
+    return q
+
+
+def _products(n: int) -> List[Product]:
+    parser = ParserAgent()
+    return [parser.run(raw) for raw in iter_catalog(n)]
+
+
+def _best(fn, repeat: int) -> float:
+    """Best wall time of ``repeat`` runs (the first run also pays for allocator warm-up)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--products", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    products = _products(args.products)
+    questions = [generate_questions(p) for p in products]
+    n_answers = sum(len(qs) for qs in questions)
+
+    def answer_all(answer):
+        for p, qs in zip(products, questions):
+            for q in qs:
+                answer(q, p)
+
+    def per_product():
+        for p in products:
+            for q in generate_questions(p):
+                answer_question(q, p)
+
+    legacy = _best(lambda: answer_all(_legacy_answer_question), args.repeat)
+    routed = _best(lambda: answer_all(answer_question), args.repeat)
+    print(f"products={args.products:,} answers={n_answers:,}")
+    print(f"  if/elif chain : {n_answers / legacy:>12,.0f} answers/s")
+    print(f"  intent router : {n_answers / routed:>12,.0f} answers/s  ({legacy / routed:.2f}x)")
+
+    looped = _best(per_product, args.repeat)
+    bulk = _best(lambda: generate_questions_bulk(products), args.repeat)
+    print(f"  generate+answer per product : {args.products / looped:>10,.0f} products/s")
+    print(f"  generate+answer bulk        : {args.products / bulk:>10,.0f} products/s  ({looped / bulk:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark peak memory and throughput of an EventBus with and without a queue ceiling.
+
+A whole synthetic catalog is published as ``RAW_INPUT`` up front (the worst case
+for an unbounded queue) and run through the compiled ``PIPELINE``; finished
+bundles are counted and dropped. Peak traced memory grows with the catalog on
+the unbounded bus and stays flat with ``max_queued``, at the cost of pickling
+the spilled messages to disk and back.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_spill
+    python -m benchmarks.bench_spill --products 1000000 --max-queued 10000
+"""
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+from benchmarks.catalog import iter_catalog
+from src.agent_core import EventBus, Message
+from src.graph import compile_graph
+from src.orchestrator import PIPELINE, Orchestrator
+
+
+class _Count:
+    def __init__(self) -> None:
+        self.n = 0
+
+    def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
+        self.n += 1
+
+
+def run(products: int, max_queued: Optional[int], spill_dir: Optional[str]) -> None:
+    orch = Orchestrator()
+    bus = compile_graph(PIPELINE, orch._agents()).wire(EventBus(max_queued=max_queued, spill_dir=spill_dir))
+    done = _Count()
+    bus.subscribe("ALL_OUTPUTS_READY", done)
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for i, raw in enumerate(iter_catalog(products)):
+        bus.publish(Message("RAW_INPUT", {"raw": raw}, str(i)))
+    bus.run()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    label = "unbounded" if max_queued is None else f"max_queued={max_queued:,}"
+    print(f"  {label:<22} peak {peak / 2**20:8.1f} MiB  {done.n / elapsed:9,.0f} products/s  (traced)")
+    stats = bus.spill_stats()
+    if stats:
+        print(
+            f"  {'':<22} spilled {stats['spilled']:,} / restored {stats['restored']:,} messages, "
+            f"{stats['bytes_written'] / 2**20:.1f} MiB written, peak resident {stats['peak_resident']:,}"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--products", type=int, default=20_000)
+    ap.add_argument("--max-queued", type=int, default=10_000)
+    ap.add_argument("--spill-dir", default=None, help="directory for segment files (default: system temp)")
+    ap.add_argument("--skip-unbounded", action="store_true", help="only run the bounded bus")
+    args = ap.parse_args()
+    print(f"products={args.products:,}")
+    with tempfile.TemporaryDirectory(dir=args.spill_dir) as spill_dir:
+        if not args.skip_unbounded:
+            run(args.products, None, None)
+        run(args.products, args.max_queued, spill_dir)
+
+
+if __name__ == "__main__":
+    main()
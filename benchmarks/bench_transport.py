@@ -0,0 +1,189 @@
+"""Benchmark the shared-memory wire transport against pickle over ``multiprocessing.Queue``.
+
+Three measurements:
+
+- ``codec``: bytes per message and encode+decode time, wire format vs pickle,
+  for every message type one product produces;
+- ``echo``: a round trip through a worker process that decodes each message
+  and sends it back, over ``multiprocessing.Queue`` (pickle), over a pair of
+  ``ShmRing`` (wire format) and over ``ShmRing`` carrying pickles;
+- ``orchestrator``: ``Orchestrator.run_batch`` with the ``process`` executor
+  (concurrent.futures pool, pickled tasks) and the ``shm`` executor.
+
+The codec is pure Python, so per message it is no faster than C pickle; what it
+saves is size (strings are interned per stream, classes are not named). The
+shared-memory ring removes the pipe, the queue's feeder thread and the per-task
+future bookkeeping.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_transport
+    python -m benchmarks.bench_transport --messages 50000 --workers 4
+"""
+import argparse
+import gc
+import multiprocessing as mp
+import pickle
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.catalog import synthetic_catalog
+from src.agent_core import EventBus, Message
+from src.executors import make_executor
+from src.orchestrator import Orchestrator
+from src.shm_ring import ShmRing
+from src.wire import WireDecoder, WireEncoder
+
+
+class _Tap:
+    def __init__(self, log: List[Message]) -> None:
+        self.log = log
+
+    def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
+        self.log.append(msg)
+
+
+def _pipeline_messages(raws: List[Dict[str, str]]) -> List[Message]:
+    """Every message the unfused pipeline publishes for ``raws`` (minus the final bundles)."""
+    orch = Orchestrator(fuse=False)
+    bus = EventBus()
+    log: List[Message] = []
+    tap = _Tap(log)
+    for message_type in dict(orch.bus.subscriptions()):
+        if message_type != "ALL_OUTPUTS_READY":
+            bus.subscribe(message_type, tap)
+    orch.graph.wire(bus)
+    for i, raw in enumerate(raws):
+        bus.publish(Message("RAW_INPUT", {"raw": raw}, str(i)))
+    bus.run()
+    return log
+
+
+def _best(fn: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _queue_echo(requests, responses) -> None:
+    while True:
+        msg = requests.get()
+        if msg is None:
+            break
+        responses.put(msg)
+
+
+def _ring_echo(requests: ShmRing, responses: ShmRing, wire: bool) -> None:
+    dec, enc = WireDecoder(), WireEncoder()
+    while True:
+        if wire:
+            msg = requests.consume(lambda v: None if not len(v) else dec.decode(v))
+        else:
+            msg = requests.consume(lambda v: None if not len(v) else pickle.loads(v))
+        if msg is None:
+            break
+        responses.put(enc.encode(msg) if wire else pickle.dumps(msg, pickle.HIGHEST_PROTOCOL))
+    requests.close()
+    responses.close()
+
+
+def _echo_queue(messages: List[Message], window: int) -> float:
+    requests, responses = mp.Queue(), mp.Queue()
+    proc = mp.Process(target=_queue_echo, args=(requests, responses))
+    proc.start()
+    t0 = time.perf_counter()
+    in_flight = 0
+    for msg in messages:
+        requests.put(msg)
+        in_flight += 1
+        if in_flight == window:
+            responses.get()
+            in_flight -= 1
+    for _ in range(in_flight):
+        responses.get()
+    elapsed = time.perf_counter() - t0
+    requests.put(None)
+    proc.join()
+    return elapsed
+
+
+def _echo_ring(messages: List[Message], window: int, wire: bool) -> float:
+    requests, responses = ShmRing(), ShmRing()
+    proc = mp.Process(target=_ring_echo, args=(requests, responses, wire))
+    proc.start()
+    enc, dec = WireEncoder(), WireDecoder()
+    read = dec.decode if wire else pickle.loads
+    try:
+        t0 = time.perf_counter()
+        in_flight = 0
+        for msg in messages:
+            requests.put(enc.encode(msg) if wire else pickle.dumps(msg, pickle.HIGHEST_PROTOCOL))
+            in_flight += 1
+            if in_flight == window:
+                responses.consume(read)
+                in_flight -= 1
+        for _ in range(in_flight):
+            responses.consume(read)
+        elapsed = time.perf_counter() - t0
+        requests.put(b"")
+        proc.join()
+    finally:
+        requests.unlink()
+        responses.unlink()
+    return elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--messages", type=int, default=20_000, help="messages per echo run")
+    ap.add_argument("--window", type=int, default=256, help="messages in flight during echo runs")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--products", type=int, default=2_000, help="catalog size for executor runs")
+    args = ap.parse_args()
+
+    sample = _pipeline_messages(synthetic_catalog(200))
+    print("codec (per message, warm string table)")
+    print(f"  {'type':<22} {'wire B':>7} {'pickle B':>9} {'wire us':>8} {'pickle us':>10}")
+    by_type: Dict[str, List[Message]] = {}
+    for msg in sample:
+        by_type.setdefault(msg.type, []).append(msg)
+    for message_type, msgs in by_type.items():
+        enc, dec = WireEncoder(), WireDecoder()
+        for m in msgs[:-1]:
+            dec.decode(enc.encode(m))
+        wire_size = len(enc.encode(msgs[-1]))
+        pickle_size = len(pickle.dumps(msgs[-1], pickle.HIGHEST_PROTOCOL))
+        wire_s = _best(lambda: [dec.decode(r) for r in [enc.encode(m) for m in msgs]], args.repeat)
+        pickle_s = _best(lambda: [pickle.loads(pickle.dumps(m, pickle.HIGHEST_PROTOCOL)) for m in msgs], args.repeat)
+        n = len(msgs)
+        print(f"  {message_type:<22} {wire_size:7d} {pickle_size:9d} {wire_s / n * 1e6:8.2f} {pickle_s / n * 1e6:10.2f}")
+
+    messages = (sample * (args.messages // len(sample) + 1))[:args.messages]
+    print(f"echo round trip (messages={len(messages):,}, window={args.window})")
+    for label, fn in (
+        ("mp.Queue  + pickle", lambda: _echo_queue(messages, args.window)),
+        ("ShmRing   + pickle", lambda: _echo_ring(messages, args.window, wire=False)),
+        ("ShmRing   + wire  ", lambda: _echo_ring(messages, args.window, wire=True)),
+    ):
+        seconds = min(fn() for _ in range(args.repeat))
+        print(f"  {label}  {len(messages) / seconds:10,.0f} msg/s  {seconds / len(messages) * 1e6:6.2f} us/msg")
+
+    raws = synthetic_catalog(args.products)
+    print(f"orchestrator (products={len(raws):,}, workers={args.workers})")
+    serial = Orchestrator()
+    us = _best(lambda: sum(1 for _ in serial.run_batch(raws, max_in_flight=256)), args.repeat) / len(raws) * 1e6
+    print(f"  serial    {us:8.2f} us/product")
+    for mode in ("process", "shm"):
+        with make_executor(mode, max_workers=args.workers) as executor:
+            orch = Orchestrator(executor=executor)
+            list(orch.run_batch(raws[:100]))  # warm up (worker start-up, agent registration)
+            us = _best(lambda: sum(1 for _ in orch.run_batch(raws, max_in_flight=256)), args.repeat) / len(raws) * 1e6
+        print(f"  {mode:<8}  {us:8.2f} us/product")
+
+
+if __name__ == "__main__":
+    main()
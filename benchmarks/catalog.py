@@ -0,0 +1,39 @@
+"""Deterministic synthetic catalogs in the same shape as ``RAW_INPUT``."""
+import random
+from typing import Dict, Iterator, List
+
+INGREDIENTS = [
+    "Vitamin C", "Hyaluronic Acid", "Niacinamide", "Retinol", "Ferulic Acid", "Vitamin E",
+    "Ceramides", "Peptides", "Salicylic Acid", "Glycolic Acid", "Squalane", "Zinc", "Panthenol",
+]
+SKIN_TYPES = ["Oily", "Dry", "Combination", "Normal", "Sensitive"]
+BENEFITS = ["Brightening", "Fades dark spots", "Hydration", "Anti-aging", "Oil control", "Evens skin tone", "Soothing"]
+USAGE = [
+    "Apply {a}–{b} drops in the morning before sunscreen",
+    "Apply {a} drops at night on clean skin",
+    "Use {a} to {b} drops twice daily",
+    "Massage gently into skin after cleansing",
+]
+SIDE_EFFECTS = ["Mild tingling for sensitive skin", "May cause dryness", "None known", ""]
+
+
+def iter_catalog(n: int, seed: int = 42) -> Iterator[Dict[str, str]]:
+    """Yield ``n`` raw product dicts; the same ``(n, seed)`` always yields the same catalog."""
+    rng = random.Random(seed)
+    for i in range(n):
+        a = rng.randint(1, 4)
+        raw = {
+            "Product Name": f"Serum {i:06d}",
+            "Concentration": f"{rng.choice([2, 5, 10, 12, 15, 20])}% {rng.choice(INGREDIENTS[:4])}",
+            "Skin Type": ", ".join(rng.sample(SKIN_TYPES, rng.randint(1, 3))),
+            "Key Ingredients": ", ".join(rng.sample(INGREDIENTS, rng.randint(1, 4))),
+            "Benefits": ", ".join(rng.sample(BENEFITS, rng.randint(1, 3))),
+            "How to Use": rng.choice(USAGE).format(a=a, b=a + 1),
+            "Side Effects": rng.choice(SIDE_EFFECTS),
+            "Price": f"₹{rng.randrange(199, 2999, 10)}",
+        }
+        yield {k: v for k, v in raw.items() if v}
+
+
+def synthetic_catalog(n: int, seed: int = 42) -> List[Dict[str, str]]:
+    return list(iter_catalog(n, seed))
@@ -0,0 +1,159 @@
+"""Closed-loop load generator for the HTTP content service (``src/service.py``).
+
+``--concurrency`` keep-alive connections each send ``POST /generate`` requests
+back to back (distinct synthetic products) for ``--duration`` seconds, then
+client-side throughput and p50/p99 latency are printed next to the server's
+``/metrics``. With ``--spawn`` a server is started in a subprocess for the run,
+using ``--max-batch`` / ``--max-wait-ms``, so batching settings can be compared:
+
+    python -m benchmarks.loadgen --spawn --max-batch 1
+    python -m benchmarks.loadgen --spawn --max-batch 32 --max-wait-ms 2
+    python -m benchmarks.loadgen --url http://127.0.0.1:8080 --concurrency 128
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.catalog import synthetic_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, method: str, path: str, body: bytes = b""
+) -> Tuple[int, bytes]:
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _client(host: str, port: int, bodies: List[bytes], offset: int, stop_at: float, latencies: List[float]) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    i = offset
+    try:
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, "POST", "/generate", bodies[i % len(bodies)])
+            latencies.append(time.perf_counter() - start)
+            errors += status != 200
+            i += 1
+    finally:
+        writer.close()
+    return errors
+
+
+async def _fetch_json(host: str, port: int, path: str) -> Dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await _request(reader, writer, host, "GET", path)
+    finally:
+        writer.close()
+    return json.loads(body)
+
+
+def _pct(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def run_load(host: str, port: int, concurrency: int, duration: float, products: int, warmup: float) -> None:
+    bodies = [json.dumps(raw, ensure_ascii=False).encode("utf-8") for raw in synthetic_catalog(products)]
+    if warmup > 0:
+        await asyncio.gather(*(_client(host, port, bodies, c, time.perf_counter() + warmup, []) for c in range(concurrency)))
+    before = await _fetch_json(host, port, "/metrics")
+    latencies: List[float] = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *(_client(host, port, bodies, c * 7919, start + duration, latencies) for c in range(concurrency))
+    )
+    elapsed = time.perf_counter() - start
+    server = await _fetch_json(host, port, "/metrics")
+    latencies.sort()
+    batches = server["batches"] - before["batches"]
+    print(f"concurrency={concurrency}  duration={elapsed:.1f}s  requests={len(latencies):,}  errors={sum(errors)}")
+    print(
+        f"  client  {len(latencies) / elapsed:9,.0f} req/s   p50 {_pct(latencies, 0.5) * 1e3:7.2f} ms   "
+        f"p99 {_pct(latencies, 0.99) * 1e3:7.2f} ms"
+    )
+    lat = server["latency_seconds"]
+    print(
+        f"  server  {server['recent_throughput_rps']:9,.0f} req/s   p50 {lat['p50'] * 1e3:7.2f} ms   "
+        f"p99 {lat['p99'] * 1e3:7.2f} ms   batches {batches:,} "
+        f"(mean size {len(latencies) / batches if batches else 0:.1f}, max {server['max_batch_size']})"
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _spawn(port: int, max_batch: int, max_wait_ms: float) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "run.py", "--serve", f"127.0.0.1:{port}", "--trusted",
+        "--max-batch", str(max_batch), "--max-wait-ms", str(max_wait_ms),
+    ]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {proc.returncode}")
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("server did not start within 15s")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://127.0.0.1:8080", help="service to load (ignored with --spawn)")
+    ap.add_argument("--spawn", action="store_true", help="start a local server for the run")
+    ap.add_argument("--max-batch", type=int, default=32, help="server batch size (with --spawn)")
+    ap.add_argument("--max-wait-ms", type=float, default=2.0, help="server batch window (with --spawn)")
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--duration", type=float, default=5.0, help="seconds of measured load")
+    ap.add_argument("--warmup", type=float, default=1.0, help="seconds of unmeasured load first")
+    ap.add_argument("--products", type=int, default=1000, help="distinct products to cycle through")
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        host, port = "127.0.0.1", _free_port()
+        proc = _spawn(port, args.max_batch, args.max_wait_ms)
+        print(f"spawned server: max_batch={args.max_batch} max_wait={args.max_wait_ms}ms")
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname or "127.0.0.1", url.port or 80
+    try:
+        asyncio.run(run_load(host, port, args.concurrency, args.duration, args.products, args.warmup))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
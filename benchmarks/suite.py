@@ -0,0 +1,184 @@
+"""Per-stage benchmark suite over synthetic catalogs, with baseline comparison.
+
+Each stage is timed in isolation over the whole catalog so a regression can be
+pinned to one part of the pipeline. Results are written as JSON; passing
+``--baseline`` compares against an earlier results file and exits non-zero if
+any stage's throughput dropped by more than ``--threshold``.
+
+Usage (from the repository root):
+    python -m benchmarks.suite --out bench.json
+    python -m benchmarks.suite --sizes 1000 10000 --baseline bench.json --threshold 0.15
+    python -m benchmarks.suite --compare new.json bench.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.catalog import synthetic_catalog
+from src.agents.comparison_agent import ComparisonAgent
+from src.agents.parser_agent import ParserAgent
+from src.agents.product_page_agent import ProductPageAgent
+from src.agents.question_agent import QuestionAgent
+from src.blocks.questions import answer_question, generate_questions
+from src.blocks.transform import compare_lists
+from src.blocks.vocab import Vocabulary
+from src.orchestrator import Orchestrator
+from src.templates.comparison_template import ComparisonTemplate
+from src.templates.faq_template import FAQTemplate
+from src.templates.product_template import ProductTemplate
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+LIST_FIELDS = ("key_ingredients", "benefits", "skin_types")
+
+
+def _timed(fn: Callable[[], int], repeat: int) -> Dict[str, float]:
+    """Best-of-``repeat`` wall time for ``fn``, which returns the number of items it processed."""
+    best, items = float("inf"), 0
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        items = fn()
+        best = min(best, time.perf_counter() - t0)
+    return {"seconds": round(best, 6), "items": items, "per_sec": round(items / best, 1) if best else 0.0}
+
+
+def run_size(n: int, repeat: int = 1, write_limit: int = 1_000) -> Dict[str, Dict[str, float]]:
+    raws = synthetic_catalog(n)
+    parser = ParserAgent()
+    products = [parser.run(raw) for raw in raws]
+    qa, pages, cmp_agent = QuestionAgent(), ProductPageAgent(), ComparisonAgent()
+    product_b = cmp_agent._make_product_b()
+    questions = [generate_questions(p) for p in products]
+    answered = [[answer_question(q, p) for q in qs] for qs, p in zip(questions, products)]
+    faq_pages = [qa.make_faq_page(p, qs) for p, qs in zip(products, answered)]
+    product_pages = [pages.run(p) for p in products]
+    comparison_pages = [cmp_agent.run(p, product_b) for p in products]
+    faq_t, product_t, cmp_t = FAQTemplate(), ProductTemplate(), ComparisonTemplate()
+    orch = Orchestrator()
+    bundles = [orch.run(raw) for raw in raws[:write_limit]]
+
+    def orchestrator_run() -> int:
+        run = orch.run
+        for raw in raws:
+            run(raw)
+        return n
+
+    def gen_questions() -> int:
+        return sum(len(generate_questions(p)) for p in products)
+
+    def answer() -> int:
+        count = 0
+        for qs, p in zip(questions, products):
+            for q in qs:
+                answer_question(q, p)
+            count += len(qs)
+        return count
+
+    def compare() -> int:
+        vocabs = [(field, Vocabulary()) for field in LIST_FIELDS]
+        for p in products:
+            for field, vocab in vocabs:
+                compare_lists(getattr(p, field), getattr(product_b, field), vocab)
+        return n * len(vocabs)
+
+    def render(tmpl, items: List[Any]) -> Callable[[], int]:
+        def go() -> int:
+            fn = tmpl.render
+            for page in items:
+                fn(page)
+            return len(items)
+        return go
+
+    def write() -> int:
+        with tempfile.TemporaryDirectory() as tmp:
+            for outputs in bundles:
+                orch.write_outputs(outputs, tmp)
+        return len(bundles)
+
+    stages: List[Tuple[str, Callable[[], int]]] = [
+        ("orchestrator_run", orchestrator_run),
+        ("generate_questions", gen_questions),
+        ("answer_question", answer),
+        ("compare_lists", compare),
+        ("render_faq", render(faq_t, faq_pages)),
+        ("render_product", render(product_t, product_pages)),
+        ("render_comparison", render(cmp_t, comparison_pages)),
+        ("write_outputs", write),
+    ]
+    return {name: _timed(fn, repeat) for name, fn in stages}
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a line per stage whose throughput fell more than ``threshold`` below the baseline."""
+    regressions = []
+    for size, stages in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size, {})
+        for name, stats in stages.items():
+            base = base_stages.get(name)
+            if not base or not base["per_sec"]:
+                continue
+            ratio = stats["per_sec"] / base["per_sec"]
+            line = f"  n={size:>7} {name:<20} {base['per_sec']:>14,.0f} -> {stats['per_sec']:>14,.0f}/s  ({ratio:.2f}x)"
+            if ratio < 1.0 - threshold:
+                regressions.append(line)
+    return regressions
+
+
+def _print_results(results: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    for size, stages in results.items():
+        print(f"products={int(size):,}")
+        for name, stats in stages.items():
+            print(f"  {name:<20} {stats['seconds']:>9.3f}s  {stats['per_sec']:>14,.0f} items/s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    ap.add_argument("--repeat", type=int, default=1, help="report the best of N runs per stage")
+    ap.add_argument("--write-limit", type=int, default=1_000, help="bundles written by the write_outputs stage")
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--baseline", help="results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed fractional throughput drop")
+    ap.add_argument("--compare", nargs=2, metavar=("CURRENT", "BASELINE"), help="compare two results files and exit")
+    args = ap.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        current = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "repeat": args.repeat,
+                "write_limit": args.write_limit,
+            },
+            "results": {str(n): run_size(n, args.repeat, args.write_limit) for n in args.sizes},
+        }
+        _print_results(current["results"])
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+
+    baseline_path = args.compare[1] if args.compare else args.baseline
+    if not baseline_path:
+        return 0
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_results(current, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        print("\n".join(regressions))
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,21 @@
-import json
+"""Generate content pages.
+
+    python run.py                              # the built-in sample product -> outputs/*.json
+    python run.py catalog.csv out/ --workers 8 --chunk-size 2000
+    python run.py catalog.jsonl.gz out/ --shard 0/4 --gzip
+    python run.py --serve 8080 --max-batch 32 --max-wait-ms 2
+
+Catalog runs write one JSONL file per page type to the output directory and can be
+resumed after a crash by re-running the same command (see ``src/runner.py``).
+``--serve`` starts the HTTP service instead (see ``src/service.py``).
+"""
+import argparse
+import asyncio
+import os
+import sys
 from src.orchestrator import Orchestrator
+from src.runner import parse_shard, run_catalog
+from src.service import serve
 
 RAW_INPUT = {
     "Product Name": "GlowBoost Vitamin C Serum",
@@ -12,10 +28,83 @@ RAW_INPUT = {
     "Price": "₹699",
 }
 
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("input", nargs="?", help="CSV or JSONL catalog (optionally .gz); omit to render the sample product")
+    ap.add_argument("out_dir", nargs="?", default="outputs")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    ap.add_argument("--shard", default="0/1", help="process only shard i of N, e.g. 2/8")
+    ap.add_argument("--chunk-size", type=int, default=1000, help="products per work unit and checkpoint entry")
+    ap.add_argument("--gzip", action="store_true", help="write .jsonl.gz outputs")
+    ap.add_argument("--trusted", action="store_true", help="skip template schema validation")
+    ap.add_argument("--keep-chunks", action="store_true", help="keep per-chunk files and the checkpoint after merging")
+    ap.add_argument("--max-queued", type=int, help="most bus messages per worker held in memory; the rest spill to disk")
+    ap.add_argument("--spill-dir", help="directory for spilled messages (default: system temp)")
+    ap.add_argument("--serve", metavar="[HOST:]PORT", help="run the HTTP service instead of rendering files")
+    ap.add_argument("--max-batch", type=int, default=32, help="service: most requests per micro-batch")
+    ap.add_argument("--max-wait-ms", type=float, default=2.0, help="service: longest a request waits for its batch to fill")
+    args = ap.parse_args(argv)
+
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        if not port.isdigit():
+            ap.error(f"--serve expects [HOST:]PORT, got {args.serve!r}")
+        try:
+            asyncio.run(serve(
+                host or "127.0.0.1",
+                int(port),
+                template_mode="trusted" if args.trusted else "strict",
+                max_batch_size=args.max_batch,
+                max_wait=args.max_wait_ms / 1000,
+            ))
+        except KeyboardInterrupt:
+            pass
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        return 0
+
+    if args.input is None:
+        orch = Orchestrator()
+        outputs = orch.run(RAW_INPUT)
+        orch.write_outputs(outputs, args.out_dir)
+        print(f"Generated outputs in {args.out_dir}/ directory:")
+        for k in ["faq.json", "product_page.json", "comparison_page.json", "all_questions.json"]:
+            print(f"- {args.out_dir}/" + k)
+        return 0
+
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        ap.error(str(e))
+    try:
+        summary = run_catalog(
+            args.input,
+            args.out_dir,
+            workers=args.workers,
+            shard=shard,
+            chunk_size=args.chunk_size,
+            use_gzip=args.gzip,
+            template_mode="trusted" if args.trusted else "strict",
+            keep_chunks=args.keep_chunks,
+            max_queued=args.max_queued,
+            spill_dir=args.spill_dir,
+        )
+    except ValueError as e:
+        # Bad options or a checkpoint from a different configuration
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(
+        f"Rendered {summary['products']:,} products in {summary['seconds']:.2f}s "
+        f"({summary['products_per_sec']:,.0f} products/s, {summary['workers']} workers)"
+    )
+    if summary["resumed_chunks"]:
+        print(f"Resumed from checkpoint: {summary['resumed_chunks']} chunks / {summary['resumed_products']:,} products already done")
+    for path in summary["outputs"]:
+        print("- " + path)
+    return 0
+
+
 if __name__ == "__main__":
-    orch = Orchestrator()
-    outputs = orch.run(RAW_INPUT)
-    orch.write_outputs(outputs)
-    print("Generated outputs in outputs/ directory:")
-    for k in ["faq.json", "product_page.json", "comparison_page.json", "all_questions.json"]:
-        print("- outputs/" + k)
+    sys.exit(main())
@@ -1,12 +1,25 @@
 from __future__ import annotations
+import asyncio
+import inspect
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Protocol, runtime_checkable
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Protocol, Tuple, Union, runtime_checkable
+
+from .spill import SpillQueue
 
 
 @dataclass(frozen=True)
 class Message:
     type: str
     payload: Dict[str, Any]
+    # Ties every message of one product's flow together so that several products
+    # can share a single bus without their pieces getting mixed up.
+    correlation_id: Optional[str] = None
+
+    def derive(self, type: str, payload: Dict[str, Any]) -> "Message":
+        """Create a follow-up message that carries this message's correlation id."""
+        return Message(type=type, payload=payload, correlation_id=self.correlation_id)
 
 
 @runtime_checkable
@@ -14,6 +27,8 @@ class Agent(Protocol):
     """Agents process messages and can publish new ones via the provided publish callable.
 
     Agents must be stateless or manage only local state; no hidden globals.
+    Agents that keep no state between messages may set ``parallel_safe = True`` so
+    that pooled bus executors can run them off the bus thread (see ``src/executors.py``).
     """
 
     name: str
@@ -21,26 +36,283 @@ class Agent(Protocol):
     def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None: ...
 
 
+@runtime_checkable
+class AsyncAgent(Protocol):
+    """Agents whose work involves I/O (lookups, model calls, database writes).
+
+    Same contract as ``Agent`` but ``on_message`` is a coroutine; ``publish`` stays a
+    plain callable. Only ``AsyncEventBus`` can drive these agents.
+    """
+
+    name: str
+
+    async def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None: ...
+
+
+class DispatchHook(Protocol):
+    """Observer for ``EventBus`` dispatch (see ``src/instrumentation.py``).
+
+    ``on_dequeue`` sees every message taken off the queue with the depth left
+    behind; ``before_dispatch``/``after_dispatch`` bracket each subscriber call,
+    the latter with its wall time and the number of messages it published.
+    """
+
+    def on_dequeue(self, msg: Message, queue_depth: int) -> None: ...
+
+    def before_dispatch(self, agent: Agent, msg: Message) -> None: ...
+
+    def after_dispatch(self, agent: Agent, msg: Message, elapsed: float, published: int) -> None: ...
+
+
 class EventBus:
     """Simple synchronous pub/sub event bus to coordinate autonomous agents.
 
     - Agents subscribe by message type.
     - Publishing a message fan-outs to all subscribers of that type.
     - Messages are processed synchronously in FIFO order (deterministic for this task).
+
+    The queue is a deque (O(1) publish and pop) and dispatch goes through a table of
+    subscriber tuples that is rebuilt on ``subscribe`` only, so ``run`` never copies
+    subscriber lists per message.
+
+    An optional executor (see ``src/executors.py``) switches ``run`` to wave mode:
+    up to ``wave_size`` queued messages are taken at once, all their
+    (subscriber, message) pairs are handed to the executor, and the published
+    follow-ups are enqueued in (message, subscriber) order. That is the order the
+    serial loop produces, so outputs are identical whichever executor is used.
+
+    Dispatch hooks (``add_hook``) observe every message and subscriber call; a bus
+    without hooks runs the plain loop with no instrumentation cost.
+
+    ``max_queued`` caps how many pending messages stay in memory; the rest spill
+    to a segment log under ``spill_dir`` (a temporary directory by default) and
+    are read back in FIFO order, so dispatch order and outputs do not change
+    (see ``src/spill.py``). ``spill_stats()`` reports how many were spilled and restored.
+    In wave mode a wave is capped at ``max_queued`` messages, so a spilling bus
+    never holds more than that many popped messages in a wave either.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        executor: Optional[Any] = None,
+        wave_size: int = 1024,
+        max_queued: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
         self._subscribers: Dict[str, List[Agent]] = {}
-        self._queue: List[Message] = []
+        self._dispatch: Dict[str, Tuple[Agent, ...]] = {}
+        self._queue: Union[Deque[Message], SpillQueue] = deque() if max_queued is None else SpillQueue(max_queued, spill_dir)
+        self._hooks: Tuple[DispatchHook, ...] = ()
+        self.executor = executor
+        self.wave_size = wave_size
+
+    def add_hook(self, hook: DispatchHook) -> None:
+        self._hooks += (hook,)
+
+    def remove_hook(self, hook: DispatchHook) -> None:
+        self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    def hooks(self) -> Tuple[DispatchHook, ...]:
+        return self._hooks
 
     def subscribe(self, message_type: str, agent: Agent) -> None:
         self._subscribers.setdefault(message_type, []).append(agent)
+        self._dispatch = {t: tuple(agents) for t, agents in self._subscribers.items()}
+
+    def subscriptions(self) -> Iterator[Tuple[str, Agent]]:
+        """Yield (message_type, agent) pairs in subscription order."""
+        for message_type, agents in self._subscribers.items():
+            for agent in agents:
+                yield message_type, agent
 
     def publish(self, msg: Message) -> None:
         self._queue.append(msg)
 
+    def clear(self) -> int:
+        """Drop any queued messages (e.g. left behind by a failed run); returns how many."""
+        dropped = len(self._queue)
+        self._queue.clear()
+        return dropped
+
+    def spill_stats(self) -> Dict[str, int]:
+        """Spill counters of a bus created with ``max_queued`` (empty dict otherwise)."""
+        queue = self._queue
+        return queue.stats() if isinstance(queue, SpillQueue) else {}
+
     def run(self) -> None:
-        while self._queue:
-            msg = self._queue.pop(0)
-            for agent in list(self._subscribers.get(msg.type, [])):
-                agent.on_message(msg, self.publish)
+        if self.executor is not None:
+            self._run_waves()
+            return
+        if self._hooks:
+            self._run_hooked()
+            return
+        queue = self._queue
+        publish = self.publish
+        while queue:
+            msg = queue.popleft()
+            for agent in self._dispatch.get(msg.type, ()):
+                agent.on_message(msg, publish)
+
+    def _run_hooked(self) -> None:
+        queue = self._queue
+        publish = self.publish
+        hooks = self._hooks
+        clock = time.perf_counter
+        while queue:
+            msg = queue.popleft()
+            for hook in hooks:
+                hook.on_dequeue(msg, len(queue))
+            for agent in self._dispatch.get(msg.type, ()):
+                for hook in hooks:
+                    hook.before_dispatch(agent, msg)
+                depth = len(queue)
+                start = clock()
+                agent.on_message(msg, publish)
+                elapsed = clock() - start
+                for hook in hooks:
+                    hook.after_dispatch(agent, msg, elapsed, len(queue) - depth)
+
+    def _run_waves(self) -> None:
+        queue = self._queue
+        hooks = self._hooks
+        wave_size = min(self.wave_size, queue.max_in_memory) if isinstance(queue, SpillQueue) else self.wave_size
+        while queue:
+            wave = [queue.popleft() for _ in range(min(wave_size, len(queue)))]
+            for i, msg in enumerate(wave):
+                for hook in hooks:
+                    hook.on_dequeue(msg, len(queue) + len(wave) - i - 1)
+            tasks = [(agent, msg) for msg in wave for agent in self._dispatch.get(msg.type, ())]
+            if not hooks:
+                for published in self.executor.run_tasks(tasks):
+                    for out in published:
+                        self.publish(out)
+                continue
+            for agent, msg in tasks:
+                for hook in hooks:
+                    hook.before_dispatch(agent, msg)
+            for (agent, msg), (published, elapsed) in zip(tasks, self.executor.run_tasks(tasks, timed=True)):
+                for hook in hooks:
+                    hook.after_dispatch(agent, msg, elapsed, len(published))
+                for out in published:
+                    self.publish(out)
+
+
+class AsyncEventBus:
+    """asyncio pub/sub bus that keeps many products in flight at once.
+
+    - Accepts both ``AsyncAgent`` and plain ``Agent`` subscribers. Sync agents run
+      inline on the loop; with ``offload_sync=True`` the ``parallel_safe`` ones are
+      moved to a thread so they do not block I/O-bound agents.
+    - At most ``max_concurrency`` messages are being handled at any time.
+    - Backpressure: ``await publish(msg)`` waits while ``max_pending`` messages are
+      queued. Follow-up messages published by agents are never blocked (that could
+      deadlock the workers), so the bound applies to work entering the bus.
+    - Ordering across products is not deterministic; use the correlation id.
+
+    Use ``await bus.run()`` to drain what is queued, or ``async with bus:`` to keep
+    workers running while a producer publishes; leaving the block drains the bus.
+    """
+
+    def __init__(self, max_concurrency: int = 64, max_pending: int = 1024, offload_sync: bool = False) -> None:
+        if max_concurrency < 1 or max_pending < 1:
+            raise ValueError("max_concurrency and max_pending must be at least 1")
+        self._subscribers: Dict[str, List[Any]] = {}
+        self._dispatch: Dict[str, Tuple[Tuple[Any, bool], ...]] = {}
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.offload_sync = offload_sync
+        self._queue: Optional[asyncio.Queue] = None
+        self._space: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        self._errors: List[BaseException] = []
+
+    def subscribe(self, message_type: str, agent: Any) -> None:
+        self._subscribers.setdefault(message_type, []).append(agent)
+        self._dispatch = {
+            t: tuple((a, inspect.iscoroutinefunction(a.on_message)) for a in agents)
+            for t, agents in self._subscribers.items()
+        }
+
+    def _ensure_queue(self) -> asyncio.Queue:
+        # Created lazily so the bus binds to the loop that actually runs it
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._space = asyncio.Condition()
+        return self._queue
+
+    def publish_nowait(self, msg: Message) -> None:
+        """Enqueue without waiting for capacity (used for agents' follow-up messages)."""
+        self._ensure_queue().put_nowait(msg)
+
+    async def publish(self, msg: Message) -> None:
+        """Enqueue ``msg``, waiting while ``max_pending`` messages are already queued."""
+        queue = self._ensure_queue()
+        async with self._space:
+            await self._space.wait_for(lambda: queue.qsize() < self.max_pending)
+            queue.put_nowait(msg)
+
+    async def _deliver(self, agent: Any, is_async: bool, msg: Message) -> None:
+        if is_async:
+            await agent.on_message(msg, self.publish_nowait)
+            return
+        out: List[Message] = []
+        if self.offload_sync and getattr(agent, "parallel_safe", False):
+            # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+            await asyncio.get_running_loop().run_in_executor(None, agent.on_message, msg, out.append)
+        else:
+            agent.on_message(msg, out.append)
+        for m in out:
+            self.publish_nowait(m)
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            msg = await queue.get()
+            async with self._space:
+                self._space.notify_all()
+            try:
+                subs = self._dispatch.get(msg.type, ())
+                if len(subs) == 1:
+                    await self._deliver(subs[0][0], subs[0][1], msg)
+                elif subs:
+                    await asyncio.gather(*(self._deliver(a, is_async, msg) for a, is_async in subs))
+            except Exception as exc:  # surfaced from drain(); keep the worker alive
+                self._errors.append(exc)
+            finally:
+                queue.task_done()
+
+    def start(self) -> None:
+        self._ensure_queue()
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+
+    async def drain(self) -> None:
+        """Wait until the queue is empty and no handler is running; re-raise the first agent error."""
+        await self._ensure_queue().join()
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise errors[0]
+
+    async def stop(self) -> None:
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def run(self) -> None:
+        self.start()
+        try:
+            await self.drain()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self) -> "AsyncEventBus":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self.drain()
+        finally:
+            await self.stop()
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import Callable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 from ..agent_core import Agent, Message
+from ..encoding import encode_opt_str, encode_str
 from ..models import Product
 from .parser_agent import ParserAgent
 from .question_agent import QuestionAgent
@@ -10,6 +11,7 @@ from .comparison_agent import ComparisonAgent
 
 class ParseAgentNode:
     name = "ParseAgentNode"
+    parallel_safe = True
 
     def __init__(self) -> None:
         self.parser = ParserAgent()
@@ -17,11 +19,12 @@ class ParseAgentNode:
     def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
         if msg.type == "RAW_INPUT":
             product = self.parser.run(msg.payload["raw"])
-            publish(Message(type="PRODUCT_PARSED", payload={"product": product}))
+            publish(msg.derive("PRODUCT_PARSED", {"product": product}))
 
 
 class QuestionAgentNode:
     name = "QuestionAgentNode"
+    parallel_safe = True
 
     def __init__(self) -> None:
         self.agent = QuestionAgent()
@@ -31,12 +34,13 @@ class QuestionAgentNode:
             product: Product = msg.payload["product"]
             qs = self.agent.run(product)
             faq_page = self.agent.make_faq_page(product, qs)
-            publish(Message(type="QUESTIONS_ANSWERED", payload={"questions": qs}))
-            publish(Message(type="FAQ_PAGE_READY", payload={"page": faq_page}))
+            publish(msg.derive("QUESTIONS_ANSWERED", {"questions": qs}))
+            publish(msg.derive("FAQ_PAGE_READY", {"page": faq_page}))
 
 
 class ProductPageAgentNode:
     name = "ProductPageAgentNode"
+    parallel_safe = True
 
     def __init__(self) -> None:
         self.agent = ProductPageAgent()
@@ -45,11 +49,12 @@ class ProductPageAgentNode:
         if msg.type == "PRODUCT_PARSED":
             product: Product = msg.payload["product"]
             page = self.agent.run(product)
-            publish(Message(type="PRODUCT_PAGE_READY", payload={"page": page}))
+            publish(msg.derive("PRODUCT_PAGE_READY", {"page": page}))
 
 
 class ComparisonAgentNode:
     name = "ComparisonAgentNode"
+    parallel_safe = True
 
     def __init__(self) -> None:
         self.agent = ComparisonAgent()
@@ -58,25 +63,51 @@ class ComparisonAgentNode:
         if msg.type == "PRODUCT_PARSED":
             product: Product = msg.payload["product"]
             page = self.agent.run(product)
-            publish(Message(type="COMPARISON_PAGE_READY", payload={"page": page}))
+            publish(msg.derive("COMPARISON_PAGE_READY", {"page": page}))
 
 
 class OutputCollectorAgent:
+    """Gathers the rendered pieces of each product, keyed by correlation id.
+
+    State for a correlation id is dropped as soon as its bundle is complete, so one
+    collector can serve any number of products flowing through the same bus.
+    With ``as_bytes=True`` ``all_questions`` is emitted as compact JSON bytes, to
+    match render agents that publish pre-encoded pages. ``required`` narrows the
+    keys a bundle must contain before it is emitted (default: all of ``REQUIRED``).
+    """
+
     name = "OutputCollectorAgent"
+    REQUIRED = ("faq", "product_page", "comparison_page", "all_questions")
 
-    def __init__(self) -> None:
-        self.outputs = {}
+    def __init__(self, as_bytes: bool = False, required: Iterable[str] = REQUIRED) -> None:
+        self.outputs: Dict[Optional[str], Dict[str, Any]] = {}
+        self.as_bytes = as_bytes
+        self.required = tuple(required)
+
+    def reset(self) -> None:
+        """Forget partially collected bundles."""
+        self.outputs.clear()
 
     def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
+        outputs = self.outputs.setdefault(msg.correlation_id, {})
         if msg.type == "FAQ_JSON":
-            self.outputs["faq"] = msg.payload["data"]
+            outputs["faq"] = msg.payload["data"]
         elif msg.type == "PRODUCT_JSON":
-            self.outputs["product_page"] = msg.payload["data"]
+            outputs["product_page"] = msg.payload["data"]
         elif msg.type == "COMPARISON_JSON":
-            self.outputs["comparison_page"] = msg.payload["data"]
+            outputs["comparison_page"] = msg.payload["data"]
         elif msg.type == "QUESTIONS_ANSWERED":
             qs = msg.payload["questions"]
-            self.outputs["all_questions"] = [{"category": q.category, "question": q.text, "answer": q.answer} for q in qs]
+            if self.as_bytes:
+                outputs["all_questions"] = b"[" + b",".join(
+                    b'{"category":' + encode_str(q.category)
+                    + b',"question":' + encode_str(q.text)
+                    + b',"answer":' + encode_opt_str(q.answer) + b"}"
+                    for q in qs
+                ) + b"]"
+            else:
+                outputs["all_questions"] = [{"category": q.category, "question": q.text, "answer": q.answer} for q in qs]
         # Emit when all pieces are present
-        if all(k in self.outputs for k in ("faq", "product_page", "comparison_page", "all_questions")):
-            publish(Message(type="ALL_OUTPUTS_READY", payload={"outputs": dict(self.outputs)}))
+        if all(k in outputs for k in self.required):
+            del self.outputs[msg.correlation_id]
+            publish(msg.derive("ALL_OUTPUTS_READY", {"outputs": outputs}))
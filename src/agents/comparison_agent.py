@@ -1,9 +1,118 @@
-from typing import Dict
-from ..models import Product, ComparisonPage
-from ..blocks.transform import compare_lists, summarize_comparison
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from ..models import FrozenComparisonPage, FrozenProduct, Product, ProductFrame, ComparisonPage
+from ..blocks.competitors import CompetitorIndex
+from ..blocks.transform import compare_lists, compare_masks, parse_percent, parse_price, summarize_comparison
+from ..blocks.vocab import Vocabulary
+
+Row = Dict[str, str]
+
+
+@lru_cache(maxsize=1 << 12)
+def _list_summary(section: str, a: Tuple[str, ...], b: Tuple[str, ...]) -> str:
+    # Catalogs repeat a small set of list combinations (and product B rarely changes)
+    cmp = compare_lists(a, b)
+    return summarize_comparison(section, cmp["overlap"], cmp["only_a"], cmp["only_b"])
+
+
+def _list_row(section: str, a: Sequence[str], b: Sequence[str]) -> Row:
+    return {
+        "a": ", ".join(a) or "Not specified",
+        "b": ", ".join(b) or "Not specified",
+        "summary": _list_summary(section, tuple(a), tuple(b)),
+    }
+
+
+def _mask_row(section: str, vocab: Vocabulary, a: Sequence[str], mask_a: int, b: Sequence[str], mask_b: int) -> Row:
+    cmp = compare_masks(mask_a, mask_b, vocab)
+    return {
+        "a": ", ".join(a) or "Not specified",
+        "b": ", ".join(b) or "Not specified",
+        "summary": summarize_comparison(section, cmp["overlap"], cmp["only_a"], cmp["only_b"]),
+    }
+
+
+def _known(x: Optional[float]) -> bool:
+    return x is not None and x == x  # frames store missing numbers as NaN
+
+
+def _concentration_row(a: Optional[str], b: Optional[str], pct_a: Optional[float], pct_b: Optional[float]) -> Row:
+    if not (_known(pct_a) and _known(pct_b)):
+        summary = "Similar or unspecified"
+    elif pct_b > pct_a:
+        summary = "Higher concentration in Product B"
+    elif pct_b < pct_a:
+        summary = "Higher concentration in Product A"
+    else:
+        summary = "Similar concentration"
+    return {"a": a or "Not specified", "b": b or "Not specified", "summary": summary}
+
+
+def _price_row(a: Optional[str], b: Optional[str], price_a: Optional[float], price_b: Optional[float]) -> Row:
+    if not (_known(price_a) and _known(price_b)):
+        summary = "Similar or unspecified"
+    elif price_b > price_a:
+        summary = "Product B is priced higher"
+    elif price_b < price_a:
+        summary = "Product B is priced lower"
+    else:
+        summary = "Similarly priced"
+    return {"a": a or "Not specified", "b": b or "Not specified", "summary": summary}
+
+
+def _usage_row(a: Product, b: Product) -> Row:
+    return {
+        "a": a.how_to_use or "Not specified",
+        "b": b.how_to_use or "Not specified",
+        "summary": "Different recommended timing",
+    }
+
+
+# Row builders, in page order
+ROW_BUILDERS: Dict[str, Callable[[Product, Product], Row]] = {
+    "Concentration": lambda a, b: _concentration_row(
+        a.concentration, b.concentration, parse_percent(a.concentration), parse_percent(b.concentration)
+    ),
+    "Ingredients": lambda a, b: _list_row("Ingredients", a.key_ingredients, b.key_ingredients),
+    "Skin Types": lambda a, b: _list_row("Skin Types", a.skin_types, b.skin_types),
+    "Benefits": lambda a, b: _list_row("Benefits", a.benefits, b.benefits),
+    "Usage": _usage_row,
+    "Price": lambda a, b: _price_row(a.price, b.price, parse_price(a.price), parse_price(b.price)),
+}
+
+# List rows and the product field (and vocabulary dimension) each compares
+LIST_ROWS: Dict[str, str] = {"Ingredients": "key_ingredients", "Skin Types": "skin_types", "Benefits": "benefits"}
+
+
+def _encoded_rows(
+    a: Product,
+    b: Product,
+    masks: Dict[str, Tuple[int, int]],
+    vocabs: Dict[str, Vocabulary],
+    pct: Tuple[Optional[float], Optional[float]],
+    price: Tuple[Optional[float], Optional[float]],
+) -> Dict[str, Row]:
+    """``ROW_BUILDERS`` output from precomputed ``(a, b)`` masks per dimension and parsed numbers."""
+    rows: Dict[str, Row] = {"Concentration": _concentration_row(a.concentration, b.concentration, *pct)}
+    for key, dim in LIST_ROWS.items():
+        rows[key] = _mask_row(key, vocabs[dim], getattr(a, dim), masks[dim][0], getattr(b, dim), masks[dim][1])
+    rows["Usage"] = _usage_row(a, b)
+    rows["Price"] = _price_row(a.price, b.price, *price)
+    return rows
+
+# Product fields each row is derived from (used for incremental re-rendering)
+ROW_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "Concentration": ("concentration",),
+    "Ingredients": ("key_ingredients",),
+    "Skin Types": ("skin_types",),
+    "Benefits": ("benefits",),
+    "Usage": ("how_to_use",),
+    "Price": ("price",),
+}
+
 
 class ComparisonAgent:
-    """Create a fictional Product B and compare with Product A."""
+    """Compare Product A with Product B (a fictional one unless a competitor is given)."""
 
     def _make_product_b(self) -> Product:
         # Fictional structured product B
@@ -18,50 +127,48 @@ class ComparisonAgent:
             price="₹799",
         )
 
-    def run(self, product_a: Product) -> ComparisonPage:
-        product_b = self._make_product_b()
-
-        # Ingredients comparison
-        ing_cmp = compare_lists(product_a.key_ingredients, product_b.key_ingredients)
-        ing_summary = summarize_comparison("Ingredients", ing_cmp["overlap"], ing_cmp["only_a"], ing_cmp["only_b"])
-
-        skin_cmp = compare_lists(product_a.skin_types, product_b.skin_types)
-        skin_summary = summarize_comparison("Skin Types", skin_cmp["overlap"], skin_cmp["only_a"], skin_cmp["only_b"])
-
-        ben_cmp = compare_lists(product_a.benefits, product_b.benefits)
-        ben_summary = summarize_comparison("Benefits", ben_cmp["overlap"], ben_cmp["only_a"], ben_cmp["only_b"])
-
-        comparisons: Dict[str, Dict[str, str]] = {
-            "Concentration": {
-                "a": product_a.concentration or "Not specified",
-                "b": product_b.concentration or "Not specified",
-                "summary": "Higher concentration in Product B" if (product_b.concentration and product_a.concentration and product_b.concentration != product_a.concentration) else "Similar or unspecified",
-            },
-            "Ingredients": {
-                "a": ", ".join(product_a.key_ingredients) or "Not specified",
-                "b": ", ".join(product_b.key_ingredients) or "Not specified",
-                "summary": ing_summary,
-            },
-            "Skin Types": {
-                "a": ", ".join(product_a.skin_types) or "Not specified",
-                "b": ", ".join(product_b.skin_types) or "Not specified",
-                "summary": skin_summary,
-            },
-            "Benefits": {
-                "a": ", ".join(product_a.benefits) or "Not specified",
-                "b": ", ".join(product_b.benefits) or "Not specified",
-                "summary": ben_summary,
-            },
-            "Usage": {
-                "a": product_a.how_to_use or "Not specified",
-                "b": product_b.how_to_use or "Not specified",
-                "summary": "Different recommended timing",
-            },
-            "Price": {
-                "a": product_a.price or "Not specified",
-                "b": product_b.price or "Not specified",
-                "summary": "Product B is priced higher" if (product_a.price and product_b.price and product_a.price != product_b.price) else "Similar or unspecified",
-            },
-        }
+    def row(self, key: str, product_a: Product, product_b: Product) -> Row:
+        return ROW_BUILDERS[key](product_a, product_b)
 
+    def run(self, product_a: Product, product_b: Optional[Product] = None) -> ComparisonPage:
+        if product_b is None:
+            product_b = self._make_product_b()
+        comparisons: Dict[str, Row] = {key: build(product_a, product_b) for key, build in ROW_BUILDERS.items()}
         return ComparisonPage(product_a=product_a, product_b=product_b, comparisons=comparisons)
+
+    def compare_catalog(
+        self, products: Sequence[Product], k: int = 3, index: Optional[CompetitorIndex] = None
+    ) -> Iterator[Tuple[int, int, ComparisonPage]]:
+        """Compare every product with its ``k`` nearest competitors from the same catalog.
+
+        Yields ``(a_index, b_index, page)`` in catalog order, best competitor first.
+        Rows are built from the index's masks and parsed prices/concentrations.
+        """
+        index = index or CompetitorIndex(products)
+        items, masks, vocabs = index.products, index.masks, index.vocabs
+        pct, price = index.concentration, index.price
+        for i, neighbours in index.neighbours(k):
+            a = items[i]
+            for j, _ in neighbours:
+                b = items[j]
+                pair = {dim: (masks[dim][i], masks[dim][j]) for dim in LIST_ROWS.values()}
+                rows = _encoded_rows(a, b, pair, vocabs, (pct[i], pct[j]), (price[i], price[j]))
+                yield i, j, ComparisonPage(product_a=a, product_b=b, comparisons=rows)
+
+    def run_frame(self, frame: ProductFrame, product_b: Optional[Product] = None) -> List[FrozenComparisonPage]:
+        """Comparison pages for every row of ``frame`` against ``product_b``.
+
+        List rows compare the frame's precomputed masks directly; product B's terms
+        are added to the frame's vocabularies for that.
+        """
+        b = FrozenProduct.from_product(product_b or self._make_product_b())
+        vocabs = frame.vocabs
+        masks_b = {dim: vocabs[dim].encode(getattr(b, dim)) for dim in LIST_ROWS.values()}
+        mask_cols = {dim: getattr(frame, dim + "_mask") for dim in LIST_ROWS.values()}
+        pct_b, price_b = parse_percent(b.concentration), parse_price(b.price)
+        pages = []
+        for i, a in enumerate(frame.rows()):
+            pair = {dim: (col[i], masks_b[dim]) for dim, col in mask_cols.items()}
+            rows = _encoded_rows(a, b, pair, vocabs, (frame.concentration_pct[i], pct_b), (frame.price_value[i], price_b))
+            pages.append(FrozenComparisonPage(a, b, rows))
+        return pages
@@ -1,5 +1,13 @@
-from typing import Dict, Any
-from ..models import Product
+import math
+import sys
+from typing import Dict, Any, Iterable, Optional, Tuple
+from ..models import Product, ProductFrame
+from ..blocks.transform import PUNCTUATION_TABLE, parse_percent, parse_price
+
+
+def _split_list(cell: str) -> Tuple[str, ...]:
+    return tuple(sys.intern(s) for s in map(str.strip, cell.split(",")) if s)
+
 
 class ParserAgent:
     """Single-responsibility: parse raw dict into Product model."""
@@ -15,3 +23,58 @@ class ParserAgent:
             side_effects=raw.get("Side Effects"),
             price=raw.get("Price"),
         )
+
+    def parse_many(self, raws: Iterable[Dict[str, Any]]) -> ProductFrame:
+        """Parse a chunk of raw rows into one columnar ``ProductFrame``.
+
+        List cells repeat heavily across a catalog, so each distinct cell is split,
+        interned and encoded to a mask in the frame's vocabulary once per call.
+        """
+        frame = ProductFrame()
+        list_columns = [
+            ("Skin Type", frame.skin_types, frame.skin_types_mask, frame.vocabs["skin_types"], {}),
+            ("Key Ingredients", frame.key_ingredients, frame.key_ingredients_mask, frame.vocabs["key_ingredients"], {}),
+            ("Benefits", frame.benefits, frame.benefits_mask, frame.vocabs["benefits"], {}),
+        ]
+        # Distinct free-text / numeric cells, parsed once each
+        texts: Dict[str, str] = {}
+        prices: Dict[Optional[str], Tuple[Optional[str], float]] = {None: (None, math.nan)}
+        percents: Dict[Optional[str], float] = {None: math.nan}
+        for raw in raws:
+            get = raw.get
+            concentration: Optional[str] = get("Concentration")
+            how_to_use: Optional[str] = get("How to Use")
+            side_effects: Optional[str] = get("Side Effects")
+            price: Optional[str] = get("Price")
+            frame.name.append(get("Product Name", ""))
+            frame.concentration.append(concentration)
+            frame.how_to_use.append(how_to_use)
+            frame.side_effects.append(side_effects)
+            frame.price.append(price)
+            for key, items_col, mask_col, vocab, seen in list_columns:
+                cell = get(key, "")
+                hit = seen.get(cell)
+                if hit is None:
+                    items = _split_list(cell)
+                    hit = seen[cell] = (items, vocab.encode(items))
+                items_col.append(hit[0])
+                mask_col.append(hit[1])
+            for value, col in ((how_to_use, frame.how_to_use_text), (side_effects, frame.side_effects_text)):
+                if value is not None:
+                    norm = texts.get(value)
+                    if norm is None:
+                        norm = texts[value] = value.translate(PUNCTUATION_TABLE)
+                    value = norm
+                col.append(value)
+            hit = prices.get(price)
+            if hit is None:
+                amount = parse_price(price)
+                hit = prices[price] = (price.translate(PUNCTUATION_TABLE), math.nan if amount is None else amount)
+            frame.price_text.append(hit[0])
+            frame.price_value.append(hit[1])
+            pct = percents.get(concentration)
+            if pct is None:
+                parsed = parse_percent(concentration)
+                pct = percents[concentration] = math.nan if parsed is None else parsed
+            frame.concentration_pct.append(pct)
+        return frame
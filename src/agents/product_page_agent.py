@@ -1,18 +1,41 @@
-from typing import Dict
-from ..models import Product, ProductPage
+from typing import Callable, Dict, List, Tuple
+from ..models import FrozenProductPage, Product, ProductFrame, ProductPage
 from ..blocks.transform import bullet_list
 
+# Section builders, in page order
+SECTION_BUILDERS: Dict[str, Callable[[Product], str]] = {
+    "Overview": lambda p: f"{p.name} with {p.concentration or 'unspecified concentration'}.",
+    "Ingredients": lambda p: bullet_list(p.key_ingredients),
+    "Benefits": lambda p: bullet_list(p.benefits),
+    "Usage": lambda p: p.how_to_use or "Not specified",
+    "Safety": lambda p: p.side_effects or "Not specified",
+    "Suitable For": lambda p: bullet_list(p.skin_types),
+    "Price": lambda p: p.price or "Not specified",
+}
+
+# Product fields each section is derived from (used for incremental re-rendering)
+SECTION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "Overview": ("name", "concentration"),
+    "Ingredients": ("key_ingredients",),
+    "Benefits": ("benefits",),
+    "Usage": ("how_to_use",),
+    "Safety": ("side_effects",),
+    "Suitable For": ("skin_types",),
+    "Price": ("price",),
+}
+
+
 class ProductPageAgent:
     """Assemble a product page sections from reusable blocks."""
 
+    def section(self, key: str, product: Product) -> str:
+        return SECTION_BUILDERS[key](product)
+
     def run(self, product: Product) -> ProductPage:
-        sections: Dict[str, str] = {
-            "Overview": f"{product.name} with {product.concentration or 'unspecified concentration'}.",
-            "Ingredients": bullet_list(product.key_ingredients),
-            "Benefits": bullet_list(product.benefits),
-            "Usage": product.how_to_use or "Not specified",
-            "Safety": product.side_effects or "Not specified",
-            "Suitable For": bullet_list(product.skin_types),
-            "Price": product.price or "Not specified",
-        }
+        sections: Dict[str, str] = {key: build(product) for key, build in SECTION_BUILDERS.items()}
         return ProductPage(product=product, sections=sections)
+
+    def run_frame(self, frame: ProductFrame) -> List[FrozenProductPage]:
+        """Product pages for every row of ``frame``, over lightweight row views."""
+        builders = list(SECTION_BUILDERS.items())
+        return [FrozenProductPage(p, {key: build(p) for key, build in builders}) for p in frame.rows()]
@@ -9,35 +9,41 @@ from ..templates.comparison_template import ComparisonTemplate
 
 class FAQRenderAgent:
     name = "FAQRenderAgent"
+    parallel_safe = True
 
-    def __init__(self) -> None:
-        self.tmpl = FAQTemplate()
+    def __init__(self, mode: str = "strict", as_bytes: bool = False) -> None:
+        self.tmpl = FAQTemplate(mode)
+        self.render = self.tmpl.render_bytes if as_bytes else self.tmpl.render
 
     def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
         if msg.type == "FAQ_PAGE_READY":
             page: FAQPage = msg.payload["page"]
-            publish(Message(type="FAQ_JSON", payload={"data": self.tmpl.render(page)}))
+            publish(msg.derive("FAQ_JSON", {"data": self.render(page)}))
 
 
 class ProductRenderAgent:
     name = "ProductRenderAgent"
+    parallel_safe = True
 
-    def __init__(self) -> None:
-        self.tmpl = ProductTemplate()
+    def __init__(self, mode: str = "strict", as_bytes: bool = False) -> None:
+        self.tmpl = ProductTemplate(mode)
+        self.render = self.tmpl.render_bytes if as_bytes else self.tmpl.render
 
     def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
         if msg.type == "PRODUCT_PAGE_READY":
             page: ProductPage = msg.payload["page"]
-            publish(Message(type="PRODUCT_JSON", payload={"data": self.tmpl.render(page)}))
+            publish(msg.derive("PRODUCT_JSON", {"data": self.render(page)}))
 
 
 class ComparisonRenderAgent:
     name = "ComparisonRenderAgent"
+    parallel_safe = True
 
-    def __init__(self) -> None:
-        self.tmpl = ComparisonTemplate()
+    def __init__(self, mode: str = "strict", as_bytes: bool = False) -> None:
+        self.tmpl = ComparisonTemplate(mode)
+        self.render = self.tmpl.render_bytes if as_bytes else self.tmpl.render
 
     def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
         if msg.type == "COMPARISON_PAGE_READY":
             page: ComparisonPage = msg.payload["page"]
-            publish(Message(type="COMPARISON_JSON", payload={"data": self.tmpl.render(page)}))
+            publish(msg.derive("COMPARISON_JSON", {"data": self.render(page)}))
@@ -0,0 +1,107 @@
+import heapq
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from ..models import Product
+from .transform import parse_percent, parse_price
+from .vocab import Vocabulary, popcount
+
+# Set-valued dimensions and their weight in the similarity score
+SET_WEIGHTS: Dict[str, float] = {
+    "key_ingredients": 0.5,
+    "benefits": 0.3,
+    "skin_types": 0.2,
+}
+
+
+class CompetitorIndex:
+    """Precomputed index for picking each product's nearest competitors.
+
+    Ingredient, benefit and skin-type lists are interned into the index's own
+    per-dimension vocabularies as bitmasks; concentration and price are parsed to floats once.
+    Similarity is the weighted Jaccard index of the bitmasks (popcounts only, no
+    Python sets). Candidates come from inverted posting lists; terms shared by
+    more than ``max_posting`` products are ignored for candidate generation (they
+    still count in the score), and short candidate lists are topped up with the
+    products closest in price. Ties break on price gap, then concentration gap,
+    then catalog position, so results are deterministic.
+    """
+
+    def __init__(self, products: Sequence[Product], max_posting: int = 2000) -> None:
+        self.products = list(products)
+        self.max_posting = max_posting
+        self.vocabs: Dict[str, Vocabulary] = {dim: Vocabulary() for dim in SET_WEIGHTS}
+        self.masks: Dict[str, List[int]] = {dim: [] for dim in SET_WEIGHTS}
+        self.postings: Dict[str, Dict[int, List[int]]] = {dim: {} for dim in SET_WEIGHTS}
+        self.concentration: List[Optional[float]] = []
+        self.price: List[Optional[float]] = []
+        for i, p in enumerate(self.products):
+            for dim, vocab in self.vocabs.items():
+                mask = vocab.encode(getattr(p, dim))
+                self.masks[dim].append(mask)
+                postings = self.postings[dim]
+                for tid in vocab.ids(mask):
+                    postings.setdefault(tid, []).append(i)
+            self.concentration.append(parse_percent(p.concentration))
+            self.price.append(parse_price(p.price))
+        self._by_price: List[Tuple[float, int]] = sorted((v, i) for i, v in enumerate(self.price) if v is not None)
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def similarity(self, i: int, j: int) -> float:
+        score = 0.0
+        for dim, weight in SET_WEIGHTS.items():
+            a, b = self.masks[dim][i], self.masks[dim][j]
+            union = popcount(a | b)
+            if union:
+                score += weight * popcount(a & b) / union
+        return score
+
+    @staticmethod
+    def _gap(x: Optional[float], y: Optional[float]) -> float:
+        return abs(x - y) if x is not None and y is not None else float("inf")
+
+    def _price_neighbours(self, i: int, k: int) -> List[int]:
+        price = self.price[i]
+        if price is None or not self._by_price:
+            return [j for j in range(min(len(self.products), k + 1)) if j != i][:k]
+        pos = bisect_left(self._by_price, (price, i))
+        lo, hi, out = pos - 1, pos, []
+        while len(out) < k and (lo >= 0 or hi < len(self._by_price)):
+            take_hi = lo < 0 or (hi < len(self._by_price) and self._by_price[hi][0] - price <= price - self._by_price[lo][0])
+            if take_hi:
+                j = self._by_price[hi][1]
+                hi += 1
+            else:
+                j = self._by_price[lo][1]
+                lo -= 1
+            if j != i:
+                out.append(j)
+        return out
+
+    def candidates(self, i: int, k: int) -> Set[int]:
+        found: Set[int] = set()
+        for dim, vocab in self.vocabs.items():
+            postings = self.postings[dim]
+            for tid in vocab.ids(self.masks[dim][i]):
+                plist = postings[tid]
+                if len(plist) <= self.max_posting:
+                    found.update(plist)
+        found.discard(i)
+        if len(found) < k:
+            found.update(self._price_neighbours(i, k))
+        return found
+
+    def nearest(self, i: int, k: int = 3) -> List[Tuple[int, float]]:
+        """Top-``k`` competitors of product ``i`` as ``(index, similarity)``, best first."""
+        ranked = heapq.nsmallest(
+            k,
+            ((-self.similarity(i, j), self._gap(self.price[i], self.price[j]),
+              self._gap(self.concentration[i], self.concentration[j]), j)
+             for j in self.candidates(i, k)),
+        )
+        return [(j, -neg) for neg, _, _, j in ranked]
+
+    def neighbours(self, k: int = 3) -> Iterator[Tuple[int, List[Tuple[int, float]]]]:
+        for i in range(len(self.products)):
+            yield i, self.nearest(i, k)
@@ -0,0 +1,194 @@
+import json
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from ..models import FrozenQuestion, Product, Question, QuestionCategory
+
+NAME_SLOT = "{name}"
+
+
+@dataclass(frozen=True)
+class QuestionSkeleton:
+    """A question template with a single ``{name}`` slot, pre-split for fast rendering."""
+
+    category: QuestionCategory
+    template: str
+    intent: str
+    prefix: str = field(init=False, repr=False, compare=False)
+    suffix: Optional[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.template.count(NAME_SLOT) > 1:
+            raise ValueError(f"Question template may contain {NAME_SLOT} at most once: {self.template!r}")
+        prefix, slot, suffix = self.template.partition(NAME_SLOT)
+        object.__setattr__(self, "prefix", prefix)
+        # Templates without a slot render as-is
+        object.__setattr__(self, "suffix", suffix if slot else None)
+
+    def render(self, name: str) -> str:
+        if self.suffix is None:
+            return self.prefix
+        return self.prefix + name + self.suffix
+
+
+@dataclass
+class QuestionColumns:
+    """Questions for many products stored column-wise.
+
+    ``categories``/``intents`` hold one entry per skeleton and are shared by all
+    products; ``texts[j][i]`` (and ``answers[j][i]`` once answered) is skeleton
+    ``j`` rendered for product ``i``.
+    """
+
+    names: List[str]
+    categories: Tuple[QuestionCategory, ...]
+    intents: Tuple[str, ...]
+    texts: List[List[str]]
+    answers: Optional[List[List[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def questions_for(self, i: int) -> List[Question]:
+        """Materialise product ``i``'s questions as ``Question`` objects."""
+        answers = self.answers
+        return [
+            Question(cat, self.texts[j][i], answers[j][i] if answers is not None else None, intent)
+            for j, (cat, intent) in enumerate(zip(self.categories, self.intents))
+        ]
+
+
+class QuestionSet:
+    """An ordered, immutable collection of question skeletons."""
+
+    def __init__(self, skeletons: Sequence[QuestionSkeleton]) -> None:
+        self.skeletons: Tuple[QuestionSkeleton, ...] = tuple(skeletons)
+        self.categories: Tuple[QuestionCategory, ...] = tuple(s.category for s in self.skeletons)
+        self.intents: Tuple[str, ...] = tuple(s.intent for s in self.skeletons)
+
+    @classmethod
+    def from_file(cls, path: str) -> "QuestionSet":
+        """Load skeletons from a JSON list of ``{"category", "template", "intent"}`` objects."""
+        with open(path, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        return cls([QuestionSkeleton(i["category"], i["template"], i["intent"]) for i in items])
+
+    def render(self, name: str) -> List[Question]:
+        return [Question(s.category, s.render(name), intent=s.intent) for s in self.skeletons]
+
+    def render_many(self, products: Sequence[Product]) -> QuestionColumns:
+        names = [p.name for p in products]
+        texts = []
+        for s in self.skeletons:
+            if s.suffix is None:
+                texts.append([s.prefix] * len(names))
+            else:
+                prefix, suffix = s.prefix, s.suffix
+                texts.append([prefix + n + suffix for n in names])
+        return QuestionColumns(names=names, categories=self.categories, intents=self.intents, texts=texts)
+
+
+DEFAULT_QUESTION_SET = QuestionSet([
+    # Informational
+    QuestionSkeleton("Informational", "What is {name}?", "what_is"),
+    QuestionSkeleton("Informational", "What are the key ingredients in {name}?", "ingredients"),
+    QuestionSkeleton("Informational", "What skin types is {name} suitable for?", "skin_types"),
+    QuestionSkeleton("Informational", "What is the concentration of active ingredients in {name}?", "concentration"),
+    QuestionSkeleton("Informational", "What benefits does {name} offer?", "benefits"),
+    # Usage
+    QuestionSkeleton("Usage", "How should I use {name}?", "how_to_use"),
+    QuestionSkeleton("Usage", "Can {name} be used in the morning or night?", "timing"),
+    QuestionSkeleton("Usage", "How many drops of {name} should I apply?", "drops"),
+    QuestionSkeleton("Usage", "Should I apply sunscreen with {name}?", "sunscreen"),
+    # Safety
+    QuestionSkeleton("Safety", "Are there any side effects of using {name}?", "side_effects"),
+    QuestionSkeleton("Safety", "Is {name} suitable for sensitive skin?", "sensitive_skin"),
+    QuestionSkeleton("Safety", "Can I use {name} with other actives?", "other_actives"),
+    # Purchase
+    QuestionSkeleton("Purchase", "What is the price of {name}?", "price"),
+    QuestionSkeleton("Purchase", "How long will one bottle of {name} last?", "bottle_life"),
+    # Comparison
+    QuestionSkeleton("Comparison", "How does {name} compare to other Vitamin C serums?", "compare_serums"),
+    QuestionSkeleton("Comparison", "What makes {name} different from Product B?", "vs_product_b"),
+])
+
+class QuestionTable:
+    """Columnar, deduplicated storage for a catalog's answered questions.
+
+    Every product contributes one row per skeleton of ``question_set``, so a row's
+    product and skeleton follow from its position and question texts are rendered
+    only on access. Answers are pooled (each distinct string stored once) and rows
+    hold a 4-byte pool id, which keeps a full catalog's Q&As small enough for
+    in-memory dedup and analytics.
+    """
+
+    def __init__(self, question_set: Optional[QuestionSet] = None) -> None:
+        self.question_set = question_set or DEFAULT_QUESTION_SET
+        self.names: List[str] = []
+        self._answer_ids = array("I")
+        self._pool: List[Optional[str]] = [None]
+        self._pool_ids: Dict[Optional[str], int] = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self._answer_ids)
+
+    def _pool_id(self, answer: Optional[str]) -> int:
+        aid = self._pool_ids.get(answer)
+        if aid is None:
+            aid = self._pool_ids[answer] = len(self._pool)
+            self._pool.append(answer)
+        return aid
+
+    def add(self, name: str, answers: Sequence[Optional[str]]) -> int:
+        """Append one product's answers (one per skeleton, in order); returns its product index."""
+        if len(answers) != len(self.question_set.skeletons):
+            raise ValueError("QuestionTable.add expects one answer per question skeleton")
+        self._answer_ids.extend(self._pool_id(a) for a in answers)
+        self.names.append(name)
+        return len(self.names) - 1
+
+    def extend(self, columns: QuestionColumns) -> None:
+        """Append every product of a ``QuestionColumns`` batch from the same question set."""
+        if columns.intents != self.question_set.intents:
+            raise ValueError("QuestionColumns were generated from a different question set")
+        answers = columns.answers or [[None] * len(columns)] * len(columns.intents)
+        for i, name in enumerate(columns.names):
+            self.add(name, [col[i] for col in answers])
+
+    def row(self, r: int) -> FrozenQuestion:
+        k = len(self.question_set.skeletons)
+        skeleton = self.question_set.skeletons[r % k]
+        return FrozenQuestion(
+            skeleton.category,
+            skeleton.render(self.names[r // k]),
+            self._pool[self._answer_ids[r]],
+            skeleton.intent,
+        )
+
+    def questions_for(self, product_index: int) -> List[FrozenQuestion]:
+        k = len(self.question_set.skeletons)
+        return [self.row(r) for r in range(product_index * k, (product_index + 1) * k)]
+
+    def answer_counts(self, intent: Optional[str] = None) -> Dict[Optional[str], int]:
+        """How often each distinct answer occurs, optionally for one intent only."""
+        ids = self._answer_ids
+        if intent is not None:
+            k = len(self.question_set.skeletons)
+            ids = ids[self.question_set.intents.index(intent)::k]
+        return {self._pool[aid]: n for aid, n in Counter(ids).items()}
+
+
+_REGISTRY: Dict[str, QuestionSet] = {"default": DEFAULT_QUESTION_SET}
+
+
+def register_question_set(key: str, question_set: QuestionSet) -> None:
+    """Register a question set, e.g. per product category."""
+    _REGISTRY[key] = question_set
+
+
+def get_question_set(key: str = "default") -> QuestionSet:
+    try:
+        return _REGISTRY[key]
+    except KeyError:
+        raise ValueError(f"Unknown question set: {key}") from None
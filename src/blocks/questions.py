@@ -1,107 +1,135 @@
-from typing import List
+import re
+from typing import Callable, Dict, List, Sequence, Tuple
 from ..models import Product, Question
+from .question_sets import QuestionColumns, get_question_set
 
+NOT_SPECIFIED = "Not specified."
 
-def generate_questions(product: Product) -> List[Question]:
-    name = product.name
-    qs: List[Question] = []
-
-    # Informational
-    qs += [
-        Question("Informational", f"What is {name}?"),
-        Question("Informational", f"What are the key ingredients in {name}?"),
-        Question("Informational", f"What skin types is {name} suitable for?"),
-        Question("Informational", f"What is the concentration of active ingredients in {name}?"),
-        Question("Informational", f"What benefits does {name} offer?"),
-    ]
-
-    # Usage
-    qs += [
-        Question("Usage", f"How should I use {name}?"),
-        Question("Usage", f"Can {name} be used in the morning or night?"),
-        Question("Usage", f"How many drops of {name} should I apply?"),
-        Question("Usage", f"Should I apply sunscreen with {name}?"),
-    ]
-
-    # Safety
-    qs += [
-        Question("Safety", f"Are there any side effects of using {name}?"),
-        Question("Safety", f"Is {name} suitable for sensitive skin?"),
-        Question("Safety", f"Can I use {name} with other actives?"),
-    ]
-
-    # Purchase
-    qs += [
-        Question("Purchase", f"What is the price of {name}?"),
-        Question("Purchase", f"How long will one bottle of {name} last?"),
-    ]
-
-    # Comparison
-    qs += [
-        Question("Comparison", f"How does {name} compare to other Vitamin C serums?"),
-        Question("Comparison", f"What makes {name} different from Product B?"),
-    ]
-
-    # Ensure at least 15
-    return qs
+# Capture counts like "2-3 drops", "2–3 drops", "2 to 3 drops", or a single number
+_DROPS_RE = re.compile(r"(\d+)(?:\s*(?:\-|\u2013|to)\s*(\d+))?\s*drops")
+
+
+def generate_questions(product: Product, question_set: str = "default") -> List[Question]:
+    return get_question_set(question_set).render(product.name)
+
+
+def generate_questions_bulk(
+    products: Sequence[Product], question_set: str = "default", answer: bool = True
+) -> QuestionColumns:
+    """Generate (and by default answer) questions for many products in one columnar pass."""
+    columns = get_question_set(question_set).render_many(products)
+    if answer:
+        columns.answers = [[ANSWERERS[intent](p) for p in products] for intent in columns.intents]
+    return columns
+
+
+# Text-based fallback for questions built without an intent. Order matters: the
+# first rule whose substrings all occur in the lowercased question wins.
+_INTENT_RULES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("ingredients", ("key ingredients",)),
+    ("skin_types", ("skin types",)),
+    ("concentration", ("concentration",)),
+    ("benefits", ("benefits",)),
+    ("price", ("price",)),
+    ("how_to_use", ("how should i use",)),
+    ("timing", ("morning or night",)),
+    ("drops", ("how many drops",)),
+    ("sunscreen", ("sunscreen",)),
+    ("side_effects", ("side effects",)),
+    ("sensitive_skin", ("sensitive skin",)),
+    ("other_actives", ("other actives",)),
+    ("bottle_life", ("how long will one bottle",)),
+    ("compare_serums", ("compare", "vitamin c serums")),
+    ("vs_product_b", ("different from product b",)),
+    ("what_is", ("what is",)),
+)
+
+
+def classify_question(text: str) -> str:
+    t = text.lower()
+    for intent, needles in _INTENT_RULES:
+        if all(n in t for n in needles):
+            return intent
+    return "unknown"
+
+
+def _join_or_missing(items: List[str]) -> str:
+    return ", ".join(items) if items else NOT_SPECIFIED
+
+
+def _answer_timing(p: Product) -> str:
+    if p.how_to_use and "morning" in p.how_to_use.lower():
+        return "Morning, before sunscreen."
+    return NOT_SPECIFIED
+
+
+def _answer_drops(p: Product) -> str:
+    if not p.how_to_use:
+        return NOT_SPECIFIED
+    m = _DROPS_RE.search(p.how_to_use.lower())
+    if not m:
+        return p.how_to_use
+    a, b = m.group(1), m.group(2)
+    return f"Apply {a}-{b} drops." if b else f"Apply {a} drops."
+
+
+def _answer_sunscreen(p: Product) -> str:
+    if p.how_to_use and "sunscreen" in p.how_to_use.lower():
+        return "Yes, apply before sunscreen."
+    return NOT_SPECIFIED
+
+
+def _answer_sensitive_skin(p: Product) -> str:
+    if p.side_effects and "sensitive" in p.side_effects.lower():
+        return p.side_effects
+    return NOT_SPECIFIED
+
+
+ANSWERERS: Dict[str, Callable[[Product], str]] = {
+    "ingredients": lambda p: _join_or_missing(p.key_ingredients),
+    "skin_types": lambda p: _join_or_missing(p.skin_types),
+    "concentration": lambda p: p.concentration or NOT_SPECIFIED,
+    "benefits": lambda p: _join_or_missing(p.benefits),
+    "price": lambda p: p.price or NOT_SPECIFIED,
+    "how_to_use": lambda p: p.how_to_use or NOT_SPECIFIED,
+    "timing": _answer_timing,
+    "drops": _answer_drops,
+    "sunscreen": _answer_sunscreen,
+    "side_effects": lambda p: p.side_effects or NOT_SPECIFIED,
+    "sensitive_skin": _answer_sensitive_skin,
+    "other_actives": lambda p: NOT_SPECIFIED,
+    "bottle_life": lambda p: NOT_SPECIFIED,
+    "compare_serums": lambda p: NOT_SPECIFIED,
+    "vs_product_b": lambda p: "See comparison page.",
+    "what_is": lambda p: f"{p.name} is a skincare serum.",
+    "unknown": lambda p: NOT_SPECIFIED,
+}
+
+
+# Product fields each intent's answer is derived from (used for incremental re-rendering)
+INTENT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "ingredients": ("key_ingredients",),
+    "skin_types": ("skin_types",),
+    "concentration": ("concentration",),
+    "benefits": ("benefits",),
+    "price": ("price",),
+    "how_to_use": ("how_to_use",),
+    "timing": ("how_to_use",),
+    "drops": ("how_to_use",),
+    "sunscreen": ("how_to_use",),
+    "side_effects": ("side_effects",),
+    "sensitive_skin": ("side_effects",),
+    "other_actives": (),
+    "bottle_life": (),
+    "compare_serums": (),
+    "vs_product_b": (),
+    "what_is": ("name",),
+    "unknown": (),
+}
 
 
 def answer_question(q: Question, product: Product) -> Question:
-    p = product
-    t = q.text.lower()
-
-    # Specific intents first
-    if "key ingredients" in t:
-        q.answer = ", ".join(p.key_ingredients) if p.key_ingredients else "Not specified."
-    elif "skin types" in t:
-        q.answer = ", ".join(p.skin_types) if p.skin_types else "Not specified."
-    elif "concentration" in t:
-        q.answer = p.concentration or "Not specified."
-    elif "benefits" in t:
-        q.answer = ", ".join(p.benefits) if p.benefits else "Not specified."
-    elif "price" in t:
-        q.answer = p.price or "Not specified."
-    elif t.startswith("how should i use") or "how should i use" in t:
-        q.answer = p.how_to_use or "Not specified."
-    elif "morning or night" in t:
-        if p.how_to_use and "morning" in p.how_to_use.lower():
-            q.answer = "Morning, before sunscreen."
-        else:
-            q.answer = "Not specified."
-    elif "how many drops" in t:
-        if p.how_to_use:
-            import re
-            # Capture counts like "2-3 drops", "2–3 drops", "2 to 3 drops", or a single number
-            m = re.search(r"(\d+)(?:\s*(?:\-|\u2013|to)\s*(\d+))?\s*drops", p.how_to_use.lower())
-            if m:
-                a, b = m.group(1), m.group(2)
-                q.answer = f"Apply {a}-{b} drops." if b else f"Apply {a} drops."
-            else:
-                q.answer = p.how_to_use
-        else:
-            q.answer = "Not specified."
-    elif "sunscreen" in t:
-        if p.how_to_use and "sunscreen" in p.how_to_use.lower():
-            q.answer = "Yes, apply before sunscreen."
-        else:
-            q.answer = "Not specified."
-    elif "side effects" in t:
-        q.answer = p.side_effects or "Not specified."
-    elif "sensitive skin" in t:
-        if p.side_effects and "sensitive" in p.side_effects.lower():
-            q.answer = p.side_effects
-        else:
-            q.answer = "Not specified."
-    elif "other actives" in t:
-        q.answer = "Not specified."
-    elif "how long will one bottle" in t:
-        q.answer = "Not specified."
-    elif "compare" in t and "vitamin c serums" in t:
-        q.answer = "Not specified."
-    elif "different from product b" in t:
-        q.answer = "See comparison page."
-    elif "what is" in t:
-        q.answer = f"{p.name} is a skincare serum."
-    else:
-        q.answer = "Not specified."
+    if q.intent is None:
+        q.intent = classify_question(q.text)
+    q.answer = ANSWERERS[q.intent](product)
     return q
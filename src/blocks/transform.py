@@ -1,19 +1,45 @@
-from typing import List, Dict, Optional
+import re
+from typing import List, Dict, Optional, Sequence
+from .vocab import Vocabulary
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the batched comparison falls back to int bitmasks
+    np = None
 
 
 PUNCTUATION_MAP = {
     "\u2013": "-",  # en dash
     "\u2014": "-",  # em dash
 }
+# All replacements in one pass over the string
+PUNCTUATION_TABLE = str.maketrans(PUNCTUATION_MAP)
 
 
 def normalize_punctuation(text: Optional[str]) -> Optional[str]:
     if text is None:
         return None
-    out = text
-    for src, dst in PUNCTUATION_MAP.items():
-        out = out.replace(src, dst)
-    return out
+    return text.translate(PUNCTUATION_TABLE)
+
+
+_PERCENT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_percent(text: Optional[str]) -> Optional[float]:
+    """First percentage in ``text`` (e.g. "10% Vitamin C" -> 10.0), or None."""
+    if not text:
+        return None
+    m = _PERCENT_RE.search(text)
+    return float(m.group(1)) if m else None
+
+
+def parse_price(text: Optional[str]) -> Optional[float]:
+    """Numeric amount of a price string, ignoring currency symbols and thousands separators."""
+    if not text:
+        return None
+    m = _NUMBER_RE.search(text.replace(",", ""))
+    return float(m.group(0)) if m else None
 
 
 def join_list(items: List[str]) -> str:
@@ -37,18 +63,66 @@ def bullet_list(items: List[str]) -> str:
     return "\n".join(f"- {i}" for i in items)
 
 
-def compare_lists(a: List[str], b: List[str]) -> Dict[str, List[str]]:
-    sa, sb = set(map(str.lower, a)), set(map(str.lower, b))
-    overlap = sorted(sa & sb)
-    only_a = sorted(sa - sb)
-    only_b = sorted(sb - sa)
+def compare_masks(ma: int, mb: int, vocab: Vocabulary) -> Dict[str, List[str]]:
     return {
-        "overlap": [s.title() for s in overlap],
-        "only_a": [s.title() for s in only_a],
-        "only_b": [s.title() for s in only_b],
+        "overlap": vocab.sorted_display(ma & mb),
+        "only_a": vocab.sorted_display(ma & ~mb),
+        "only_b": vocab.sorted_display(mb & ~ma),
     }
 
 
+def compare_lists(a: List[str], b: List[str], vocab: Optional[Vocabulary] = None) -> Dict[str, List[str]]:
+    """Case-insensitive overlap/only-a/only-b of two term lists, sorted and title-cased.
+
+    Pass a ``vocab`` to reuse interned terms across many calls; without one a
+    single pair is compared with plain sets, leaving nothing behind.
+    """
+    if vocab is None:
+        ka = {t.lower() for t in a}
+        kb = {t.lower() for t in b}
+        return {
+            "overlap": [k.title() for k in sorted(ka & kb)],
+            "only_a": [k.title() for k in sorted(ka - kb)],
+            "only_b": [k.title() for k in sorted(kb - ka)],
+        }
+    return compare_masks(vocab.encode(a), vocab.encode(b), vocab)
+
+
+def compare_one_to_many(
+    a: List[str], many: Sequence[List[str]], vocab: Optional[Vocabulary] = None
+) -> List[Dict[str, List[str]]]:
+    """``compare_lists(a, b)`` for every ``b`` in ``many``, in one batched pass.
+
+    With NumPy installed the lists become a boolean (len(many) x vocabulary)
+    matrix whose columns are in alphabetical order, so each result row is read
+    off already sorted; otherwise it runs on int bitmasks.
+    """
+    if vocab is None:
+        vocab = Vocabulary()
+    ma = vocab.encode(a)
+    masks = [vocab.encode(b) for b in many]
+    if np is None or not masks:
+        return [compare_masks(ma, mb, vocab) for mb in masks]
+    order = vocab.alpha_order()
+    col = np.empty(len(order), dtype=np.int64)
+    col[order] = np.arange(len(order))
+    matrix = np.zeros((len(masks), len(order)), dtype=bool)
+    for r, mb in enumerate(masks):
+        matrix[r, col[vocab.ids(mb)]] = True
+    row_a = np.zeros(len(order), dtype=bool)
+    row_a[col[vocab.ids(ma)]] = True
+    names = [vocab.display[i] for i in order]
+    overlap, only_a, only_b = matrix & row_a, ~matrix & row_a, matrix & ~row_a
+    return [
+        {
+            "overlap": [names[c] for c in np.flatnonzero(overlap[r])],
+            "only_a": [names[c] for c in np.flatnonzero(only_a[r])],
+            "only_b": [names[c] for c in np.flatnonzero(only_b[r])],
+        }
+        for r in range(len(masks))
+    ]
+
+
 def summarize_comparison(section: str, overlap: List[str], only_a: List[str], only_b: List[str]) -> str:
     if not overlap and not only_a and not only_b:
         return f"No {section.lower()} data available for comparison."
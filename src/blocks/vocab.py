@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, List, Tuple
+
+SORTED_CACHE_SIZE = 1 << 16
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(mask: int) -> int:
+        return bin(mask).count("1")
+
+
+class Vocabulary:
+    """Interns terms (case-insensitively) to dense integer ids.
+
+    A list of terms encodes to an int bitmask with bit ``id`` set per term, so set
+    operations between products become integer ``&``, ``|`` and ``&~``. Each id's
+    lowercase key and title-cased display form are computed once, at intern time.
+
+    A vocabulary only grows, so it belongs to whatever encodes with it and is
+    dropped with it (a ``ProductFrame``, a ``CompetitorIndex``); masks are only
+    comparable within one vocabulary. It is not locked: do not share one
+    between threads.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        # Exact input spellings seen so far, so repeat lookups skip str.lower()
+        self._raw: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.display: List[str] = []
+        self._alpha: List[int] = []
+        # mask -> sorted display tuple; catalogs reuse a small set of term combinations
+        self._sorted: Dict[int, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def intern(self, term: str) -> int:
+        tid = self._raw.get(term)
+        if tid is not None:
+            return tid
+        key = term.lower()
+        tid = self._ids.get(key)
+        if tid is None:
+            tid = self._ids[key] = len(self.terms)
+            self.terms.append(key)
+            self.display.append(key.title())
+        self._raw[term] = tid
+        return tid
+
+    def encode(self, items: Iterable[str]) -> int:
+        mask = 0
+        for item in items:
+            mask |= 1 << self.intern(item)
+        return mask
+
+    def ids(self, mask: int) -> List[int]:
+        """Term ids set in ``mask``, ascending."""
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(low.bit_length() - 1)
+            mask ^= low
+        return out
+
+    def sorted_display(self, mask: int) -> List[str]:
+        """Display forms of the terms in ``mask``, ordered by their lowercase key."""
+        cached = self._sorted.get(mask)
+        if cached is None:
+            if len(self._sorted) >= SORTED_CACHE_SIZE:
+                self._sorted.clear()
+            terms, display = self.terms, self.display
+            cached = self._sorted[mask] = tuple(display[i] for i in sorted(self.ids(mask), key=terms.__getitem__))
+        return list(cached)
+
+    def alpha_order(self) -> List[int]:
+        """All term ids ordered by lowercase key (recomputed only when the vocabulary grew)."""
+        if len(self._alpha) != len(self.terms):
+            self._alpha = sorted(range(len(self.terms)), key=self.terms.__getitem__)
+        return self._alpha
+
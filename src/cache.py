@@ -0,0 +1,157 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from .agents.parser_agent import ParserAgent
+
+# Bump whenever agents, blocks or templates change what a given raw input renders to,
+# so stale entries stop matching.
+PIPELINE_VERSION = "1"
+
+_PARSER = ParserAgent()
+
+
+def product_fields(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """The ``Product`` fields ``ParserAgent`` reads from a raw row; the pages are rendered from these.
+
+    List cells are compared after splitting (so ``"a,b"`` and ``"a, b"`` match) and
+    columns the parser ignores drop out, but scalars are kept verbatim, exactly as
+    they are rendered. Rows the parser rejects are keyed on their raw content.
+    """
+    try:
+        return asdict(_PARSER.run(raw))
+    except Exception:
+        return {"raw": raw}
+
+
+def cache_key(raw: Dict[str, Any], version: str = PIPELINE_VERSION) -> str:
+    """Stable content hash of the parsed product fields plus the pipeline version."""
+    canonical = json.dumps(
+        [version, product_fields(raw)], ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """In-memory tier bounded to ``maxsize`` entries."""
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SqliteCache:
+    """On-disk tier: one row per key holding the compact JSON bundle.
+
+    Writes are committed every ``commit_every`` puts and on ``flush``/``close``.
+    """
+
+    def __init__(self, path: str, commit_every: int = 256) -> None:
+        self.path = path
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        encoded = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)", (key, encoded))
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._conn.commit()
+                self._uncommitted = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+class ResultCache:
+    """Two-tier cache of output bundles keyed by ``cache_key``.
+
+    Lookups try the in-memory LRU first, then the optional sqlite file (promoting
+    hits into memory). Returned bundles are shared; treat them as read-only.
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_size: int = 10_000, version: str = PIPELINE_VERSION) -> None:
+        self.version = version
+        self.memory = LRUCache(memory_size)
+        self.disk = SqliteCache(path) if path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def key(self, raw: Dict[str, Any]) -> str:
+        return cache_key(raw, self.version)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.put(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+        self.writes += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.memory_hits + self.disk_hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "memory_entries": len(self.memory),
+        }
+
+    def flush(self) -> None:
+        if self.disk is not None:
+            self.disk.flush()
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
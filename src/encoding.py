@@ -0,0 +1,34 @@
+import json
+from json.encoder import encode_basestring
+from typing import Any, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:  # optional fast encoder; stdlib output is byte-identical for our documents
+    orjson = None
+
+# Compact encoding used for JSONL shards and pre-encoded fragments
+SEPARATORS = (",", ":")
+NULL = b"null"
+
+
+def dumps_compact(obj: Any) -> bytes:
+    """UTF-8 compact JSON, same bytes as ``json.dumps(obj, ensure_ascii=False, separators=(",", ":"))``."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=SEPARATORS).encode("utf-8")
+
+
+if orjson is not None:
+    encode_str = orjson.dumps
+else:
+    def encode_str(s: str) -> bytes:
+        return encode_basestring(s).encode("utf-8")
+
+
+def encode_opt_str(s: Optional[str]) -> bytes:
+    return NULL if s is None else encode_str(s)
+
+
+def encode_str_list(items: Iterable[str]) -> bytes:
+    return b"[" + b",".join(encode_str(i) for i in items) + b"]"
@@ -0,0 +1,361 @@
+from __future__ import annotations
+import multiprocessing as mp
+import os
+import pickle
+import struct
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .agent_core import Agent, Message
+from .shm_ring import ShmRing, require_tso
+from .wire import WireDecoder, WireEncoder
+
+Task = Tuple[Agent, Message]
+
+
+def invoke(agent: Agent, msg: Message) -> List[Message]:
+    """Run one subscriber and return what it published, in publish order."""
+    out: List[Message] = []
+    agent.on_message(msg, out.append)
+    return out
+
+
+def invoke_timed(agent: Agent, msg: Message) -> Tuple[List[Message], float]:
+    """``invoke`` plus the handler's wall time in seconds (used when the bus has hooks)."""
+    start = time.perf_counter()
+    out = invoke(agent, msg)
+    return out, time.perf_counter() - start
+
+
+def is_parallel_safe(agent: Agent) -> bool:
+    """Only agents that opt in (``parallel_safe = True``) may leave the bus thread.
+
+    Stateful agents such as the output collector keep running inline, in order.
+    """
+    return getattr(agent, "parallel_safe", False)
+
+
+class SerialExecutor:
+    """Runs every task inline, one after another (same behaviour as the plain bus)."""
+
+    def run_tasks(self, tasks: Sequence[Task], timed: bool = False) -> List[Any]:
+        """Published messages per task, in task order (``(messages, seconds)`` pairs if ``timed``)."""
+        fn = invoke_timed if timed else invoke
+        return [fn(agent, msg) for agent, msg in tasks]
+
+    def shutdown(self) -> None:
+        pass
+
+    def __enter__(self) -> "SerialExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+
+class _PoolExecutor(SerialExecutor):
+    """Dispatches parallel-safe tasks to a concurrent.futures pool.
+
+    Results are returned in task order regardless of completion order, so the bus
+    enqueues follow-up messages exactly as the serial executor would.
+    """
+
+    def __init__(self, pool: Executor) -> None:
+        self._pool = pool
+
+    def run_tasks(self, tasks: Sequence[Task], timed: bool = False) -> List[Any]:
+        fn = invoke_timed if timed else invoke
+        results: List[Any] = [None] * len(tasks)
+        futures = []
+        inline = []
+        for i, (agent, msg) in enumerate(tasks):
+            if is_parallel_safe(agent):
+                futures.append((i, self._pool.submit(fn, agent, msg)))
+            else:
+                inline.append(i)
+        # Stateful agents run here while the pool works on the rest
+        for i in inline:
+            agent, msg = tasks[i]
+            results[i] = fn(agent, msg)
+        for i, fut in futures:
+            results[i] = fut.result()
+        return results
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+class ThreadPoolBusExecutor(_PoolExecutor):
+    """Runs independent subscribers on a thread pool (helps when agents release the GIL or do I/O)."""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        super().__init__(ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eventbus"))
+
+
+class ProcessPoolBusExecutor(_PoolExecutor):
+    """Runs independent subscribers in worker processes.
+
+    Agents and payloads are pickled per task, and any state an agent mutates in a
+    worker is discarded, which is why only ``parallel_safe`` agents are sent there.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        super().__init__(ProcessPoolExecutor(max_workers=max_workers))
+
+
+# Shared-memory transport records (first byte): register agent, run task, quit / result, error
+_REGISTER, _TASK, _QUIT = b"A", b"T", b"Q"
+_RESULT, _ERROR = ord("R"), ord("E")
+_AGENT_ID = struct.Struct("<I")
+_COUNT = struct.Struct("<H")
+_RESULT_HEAD = struct.Struct("<dH")
+_LEN = struct.Struct("<I")
+# Agent pickles a worker keeps; the least recently used slot is overwritten by the next new one
+_AGENT_SLOTS = 256
+
+
+def _shm_worker(requests: ShmRing, responses: ShmRing) -> None:
+    """Worker loop: decode tasks straight out of the request ring, answer in task order."""
+    agents: Dict[int, Agent] = {}
+    decoder, encoder = WireDecoder(), WireEncoder()
+
+    def read(view: memoryview) -> Tuple[bytes, Any, Any]:
+        kind = bytes(view[:1])
+        if kind == _TASK:
+            (n,) = _COUNT.unpack_from(view, 1)
+            ids = struct.unpack_from(f"<{n}I", view, 3)
+            try:
+                return kind, ids, decoder.decode(view[3 + 4 * n:])
+            except Exception as exc:
+                # Still reply once per id; the subscribers fail with the decoding error
+                return kind, ids, exc
+        if kind == _REGISTER:
+            (agent_id,) = _AGENT_ID.unpack_from(view, 1)
+            try:
+                return kind, agent_id, pickle.loads(view[5:])
+            except Exception as exc:
+                return kind, agent_id, exc
+        return kind, None, None
+
+    while True:
+        kind, ids, obj = requests.consume(read)
+        if kind == _QUIT:
+            break
+        if kind == _REGISTER:
+            agents[ids] = obj
+            continue
+        # One reply per subscriber, in the order the ids were sent
+        for agent_id in ids:
+            # Strings interned for a reply that is not sent must be forgotten, or the parent's decoder drifts
+            mark = encoder.mark()
+            try:
+                agent = agents[agent_id]
+                if isinstance(agent, Exception):
+                    raise agent
+                if isinstance(obj, Exception):
+                    raise obj
+                out, elapsed = invoke_timed(agent, obj)
+                record = bytearray((_RESULT,))
+                record += _RESULT_HEAD.pack(elapsed, len(out))
+                for m in out:
+                    frame = encoder.encode(m)
+                    record += _LEN.pack(len(frame))
+                    record += frame
+                responses.put(record)
+            except Exception as exc:
+                encoder.rollback(mark)
+                try:
+                    err = pickle.dumps(exc)
+                except Exception:
+                    err = pickle.dumps(RuntimeError(repr(exc)))
+                responses.put(bytes((_ERROR,)) + err)
+    requests.close()
+    responses.close()
+
+
+class _ShmWorker:
+    """Parent-side handle: the process, its two rings and one codec per direction."""
+
+    def __init__(self, ctx: Any, capacity: int) -> None:
+        self.requests = ShmRing(capacity)
+        self.responses = ShmRing(capacity)
+        self.encoder = WireEncoder()
+        self.decoder = WireDecoder()
+        self.slots: "OrderedDict[bytes, int]" = OrderedDict()  # agent pickle -> slot in the worker, oldest first
+        self.pending: Deque[int] = deque()  # task indexes, in the order their replies will arrive
+        self.process = ctx.Process(target=_shm_worker, args=(self.requests, self.responses), daemon=True)
+        self.process.start()
+
+    def check(self) -> None:
+        if not self.process.is_alive():
+            raise RuntimeError(f"shared-memory worker {self.process.pid} exited with code {self.process.exitcode}")
+
+    def read(self, view: memoryview) -> Any:
+        if view[0] == _ERROR:
+            return pickle.loads(view[1:])
+        elapsed, count = _RESULT_HEAD.unpack_from(view, 1)
+        pos = 1 + _RESULT_HEAD.size
+        out = []
+        error = None
+        decode = self.decoder.decode
+        for _ in range(count):
+            (n,) = _LEN.unpack_from(view, pos)
+            pos += 4
+            # Every frame is decoded even after a failure, so the string table sees all of them
+            try:
+                out.append(decode(view[pos:pos + n]))
+            except Exception as exc:
+                error = error or exc
+            pos += n
+        return (out, elapsed) if error is None else error
+
+
+class SharedMemoryBusExecutor(SerialExecutor):
+    """Runs independent subscribers in long-lived worker processes fed through shared memory.
+
+    Each worker has a request and a response ``ShmRing``. Messages cross them in
+    the binary format of ``src/wire.py`` and are decoded straight out of shared
+    memory, so there is no pipe, feeder thread or full pickle round trip per
+    task. Agents are pickled once per ``run_tasks`` call, so workers always run
+    their current state, but a pickle is only sent to a worker that does not hold
+    it yet. Like ``ProcessPoolBusExecutor``, whatever state agents mutate in a
+    worker is discarded, so only ``parallel_safe`` agents are sent there. A single
+    record (one message, or all messages one task publishes) must fit in
+    ``capacity`` bytes. Only x86-64 is supported; elsewhere this raises ``RuntimeError``.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, capacity: int = 1 << 22) -> None:
+        require_tso()  # before any worker is started
+        ctx = mp.get_context()
+        self._workers = [_ShmWorker(ctx, capacity) for _ in range(max_workers or os.cpu_count() or 1)]
+        self._next = 0
+        self._pickles: Dict[int, bytes] = {}  # id(agent) -> pickle, for the current run_tasks call only
+
+    def _agent_id(self, worker: _ShmWorker, agent: Agent) -> int:
+        data = self._pickles.get(id(agent))
+        if data is None:
+            data = self._pickles[id(agent)] = pickle.dumps(agent, pickle.HIGHEST_PROTOCOL)
+        slots = worker.slots
+        slot = slots.get(data)
+        if slot is not None:
+            slots.move_to_end(data)
+            return slot
+        # Tasks already queued for an overwritten slot run first, since the worker reads records in order
+        oldest = next(iter(slots)) if len(slots) >= _AGENT_SLOTS else None
+        slot = len(slots) if oldest is None else slots[oldest]
+        self._put(worker, _REGISTER + _AGENT_ID.pack(slot) + data)
+        if oldest is not None:
+            del slots[oldest]
+        slots[data] = slot
+        return slot
+
+    def _put(self, worker: _ShmWorker, record: bytes) -> None:
+        # A full request ring means the worker is blocked on a full response ring; drain it meanwhile
+        def idle() -> None:
+            worker.check()
+            self._drain(worker, block=False)
+
+        worker.requests.put(record, idle=idle)
+
+    def _drain(self, worker: _ShmWorker, block: bool) -> None:
+        results = self._results
+        while worker.pending:
+            if block:
+                reply = worker.responses.consume(worker.read, idle=worker.check)
+            else:
+                reply = worker.responses.try_consume(worker.read)
+                if reply is None:
+                    return
+            results[worker.pending.popleft()] = reply
+
+    def _send(self, msg: Message, indexes: List[int], agents: List[Agent]) -> None:
+        """Send one message with every subscriber that should run it; it is encoded once."""
+        worker = self._workers[self._next]
+        self._next = (self._next + 1) % len(self._workers)
+        ids = [self._agent_id(worker, agent) for agent in agents]
+        mark = worker.encoder.mark()
+        try:
+            self._put(worker, _TASK + _COUNT.pack(len(ids)) + struct.pack(f"<{len(ids)}I", *ids) + worker.encoder.encode(msg))
+        except BaseException:
+            worker.encoder.rollback(mark)
+            raise
+        worker.pending.extend(indexes)
+
+    def run_tasks(self, tasks: Sequence[Task], timed: bool = False) -> List[Any]:
+        self._results: List[Any] = [None] * len(tasks)
+        workers = self._workers
+        inline = []
+        group: List[int] = []
+        group_agents: List[Agent] = []
+        group_msg: Optional[Message] = None
+        try:
+            # The bus lists a message's subscribers next to each other; batch them into one record
+            for i, (agent, msg) in enumerate(tasks):
+                if not is_parallel_safe(agent):
+                    inline.append(i)
+                    continue
+                if msg is not group_msg:
+                    if group:
+                        self._send(group_msg, group, group_agents)
+                    group, group_agents, group_msg = [], [], msg
+                group.append(i)
+                group_agents.append(agent)
+            if group:
+                self._send(group_msg, group, group_agents)
+        except BaseException:
+            # Collect the replies already in flight, or the next call would read them as its own
+            for worker in workers:
+                try:
+                    self._drain(worker, block=True)
+                except Exception:
+                    worker.pending.clear()
+            self._results = []
+            raise
+        finally:
+            self._pickles.clear()
+        results = self._results
+        for i in inline:
+            agent, msg = tasks[i]
+            try:
+                results[i] = invoke_timed(agent, msg)
+            except Exception as exc:
+                results[i] = exc
+        for worker in workers:
+            self._drain(worker, block=True)
+        self._results = []
+        # Raise the first failure only once every reply is read, so the rings stay in step
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+        return results if timed else [out for out, _ in results]
+
+    def shutdown(self) -> None:
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            if worker.process.is_alive():
+                try:
+                    worker.requests.put(_QUIT, timeout=1.0)
+                except TimeoutError:
+                    pass
+        for worker in workers:
+            worker.process.join(timeout=5.0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.requests.unlink()
+            worker.responses.unlink()
+
+
+def make_executor(mode: str = "serial", max_workers: Optional[int] = None) -> SerialExecutor:
+    """Build a bus executor by name: ``serial``, ``thread``, ``process`` or ``shm``."""
+    if mode == "serial":
+        return SerialExecutor()
+    if mode == "thread":
+        return ThreadPoolBusExecutor(max_workers)
+    if mode == "process":
+        return ProcessPoolBusExecutor(max_workers)
+    if mode == "shm":
+        return SharedMemoryBusExecutor(max_workers)
+    raise ValueError(f"Unknown executor mode: {mode}")
@@ -0,0 +1,202 @@
+"""Declarative agent graphs and the compile step that wires them onto an ``EventBus``.
+
+A ``GraphSpec`` names each node and the message types it consumes and produces.
+``compile_graph`` validates the spec (every consumed type has a producer, every
+produced type has a consumer, no cycles) and, with ``fuse=True``, replaces each
+single-producer/single-consumer hop with a direct call:
+
+    QuestionAgentNode --FAQ_PAGE_READY--> FAQRenderAgent
+
+becomes one ``FusedAgent`` that hands ``FAQ_PAGE_READY`` straight to the renderer
+instead of queueing it. Only hops whose consumer has exactly one input type are
+fused, so join nodes such as the output collector still see their inputs in bus
+order and outputs are unchanged. Compile with ``fuse=False`` to keep every hop on
+the bus, e.g. to trace individual messages with dispatch hooks.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .agent_core import Agent, EventBus, Message
+from .executors import is_parallel_safe
+
+
+class GraphError(ValueError):
+    """Raised for graph specs that cannot be compiled."""
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    consumes: Tuple[str, ...]
+    produces: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class GraphSpec:
+    """Nodes in subscription order; ``sources`` are published from outside, ``sinks`` consumed outside."""
+
+    nodes: Tuple[Node, ...]
+    sources: Tuple[str, ...] = ()
+    sinks: Tuple[str, ...] = ()
+
+    def edges(self) -> Tuple[Tuple[str, str], ...]:
+        """``(message_type, node_name)`` subscriptions, in the order the bus should dispatch them."""
+        return tuple((t, node.name) for node in self.nodes for t in node.consumes)
+
+    def restrict(self, edges: Iterable[Tuple[str, str]]) -> "GraphSpec":
+        """Keep only the given subscriptions; types left without a consumer become sinks."""
+        keep = frozenset(edges)
+        nodes = []
+        for node in self.nodes:
+            consumes = tuple(t for t in node.consumes if (t, node.name) in keep)
+            if consumes:
+                nodes.append(Node(node.name, consumes, node.produces))
+        consumed = {t for node in nodes for t in node.consumes}
+        produced = [t for node in nodes for t in node.produces]
+        sinks = tuple(dict.fromkeys(list(self.sinks) + [t for t in produced if t not in consumed]))
+        return GraphSpec(tuple(nodes), self.sources, sinks)
+
+    def validate(self) -> None:
+        names = [node.name for node in self.nodes]
+        dupes = sorted({n for n in names if names.count(n) > 1})
+        if dupes:
+            raise GraphError(f"duplicate node names: {dupes}")
+        produced = {t for node in self.nodes for t in node.produces} | set(self.sources)
+        consumed = {t for node in self.nodes for t in node.consumes} | set(self.sinks)
+        for node in self.nodes:
+            missing = [t for t in node.consumes if t not in produced]
+            if missing:
+                raise GraphError(f"{node.name} consumes {missing}, which nothing produces")
+            unused = [t for t in node.produces if t not in consumed]
+            if unused:
+                raise GraphError(f"{node.name} produces {unused}, which nothing consumes")
+        cycle = self._find_cycle()
+        if cycle:
+            raise GraphError("cycle: " + " -> ".join(cycle))
+
+    def _find_cycle(self) -> Optional[List[str]]:
+        consumers: Dict[str, List[str]] = {}
+        for node in self.nodes:
+            for t in node.consumes:
+                consumers.setdefault(t, []).append(node.name)
+        succ = {node.name: [c for t in node.produces for c in consumers.get(t, ())] for node in self.nodes}
+        state: Dict[str, int] = {}  # 1 = on the DFS stack, 2 = done
+        path: List[str] = []
+
+        def visit(name: str) -> Optional[List[str]]:
+            state[name] = 1
+            path.append(name)
+            for nxt in succ[name]:
+                if state.get(nxt) == 1:
+                    return path[path.index(nxt):] + [nxt]
+                if nxt not in state:
+                    found = visit(nxt)
+                    if found:
+                        return found
+            path.pop()
+            state[name] = 2
+            return None
+
+        for node in self.nodes:
+            if node.name not in state:
+                found = visit(node.name)
+                if found:
+                    return found
+        return None
+
+
+class FusedAgent:
+    """Runs ``head`` and delivers the fused message types straight to their consumer.
+
+    Other published messages go to the bus as usual. A route may itself be a
+    ``FusedAgent``, so whole linear chains collapse into one dispatch.
+    """
+
+    def __init__(self, head: Agent, routes: Mapping[str, Agent]) -> None:
+        self.head = head
+        self.routes = dict(routes)
+        self.name = "+".join([getattr(head, "name", type(head).__name__)] + [getattr(a, "name", type(a).__name__) for a in self.routes.values()])
+        self.parallel_safe = is_parallel_safe(head) and all(is_parallel_safe(a) for a in self.routes.values())
+
+    def _emitter(self, publish: Callable[[Message], None]) -> Callable[[Message], None]:
+        routes = self.routes
+        if len(routes) == 1:
+            ((fused_type, target),) = routes.items()
+            deliver = target.on_message
+
+            def emit(out: Message) -> None:
+                if out.type == fused_type:
+                    deliver(out, publish)
+                else:
+                    publish(out)
+        else:
+            def emit(out: Message) -> None:
+                target = routes.get(out.type)
+                if target is None:
+                    publish(out)
+                else:
+                    target.on_message(out, publish)
+        return emit
+
+    def on_message(self, msg: Message, publish: Callable[[Message], None]) -> None:
+        # Built per call: executors pass each task its own publish, possibly from several threads at once
+        self.head.on_message(msg, self._emitter(publish))
+
+
+@dataclass
+class CompiledGraph:
+    """Result of ``compile_graph``: bus subscriptions plus the hops that were fused away."""
+
+    subscriptions: List[Tuple[str, Agent]]
+    fused: List[Tuple[str, str, str]] = field(default_factory=list)  # (producer, type, consumer)
+
+    def wire(self, bus: EventBus) -> EventBus:
+        for message_type, agent in self.subscriptions:
+            bus.subscribe(message_type, agent)
+        return bus
+
+
+def compile_graph(spec: GraphSpec, agents: Mapping[str, Agent], fuse: bool = True) -> CompiledGraph:
+    """Validate ``spec`` and resolve node names to ``agents``, fusing linear hops if asked."""
+    spec.validate()
+    missing = [node.name for node in spec.nodes if node.name not in agents]
+    if missing:
+        raise GraphError(f"no agent given for nodes {missing}")
+    producers: Dict[str, List[str]] = {}
+    consumers: Dict[str, List[str]] = {}
+    for node in spec.nodes:
+        for t in node.produces:
+            producers.setdefault(t, []).append(node.name)
+        for t in node.consumes:
+            consumers.setdefault(t, []).append(node.name)
+    by_name = {node.name: node for node in spec.nodes}
+
+    fusable: Dict[str, List[Tuple[str, str]]] = {}  # producer -> [(type, consumer)]
+    fused_edges: Set[Tuple[str, str]] = set()
+    if fuse:
+        boundary: FrozenSet[str] = frozenset(spec.sources) | frozenset(spec.sinks)
+        for t, (producer,) in ((t, p) for t, p in producers.items() if len(p) == 1):
+            cons = consumers.get(t, [])
+            if t in boundary or len(cons) != 1:
+                continue
+            consumer = cons[0]
+            # Join nodes stay on the bus; so do hops that would move a bus-thread-only agent off-thread
+            if len(by_name[consumer].consumes) != 1:
+                continue
+            if is_parallel_safe(agents[producer]) and not is_parallel_safe(agents[consumer]):
+                continue
+            fusable.setdefault(producer, []).append((t, consumer))
+            fused_edges.add((t, consumer))
+
+    resolved: Dict[str, Agent] = {}
+
+    def resolve(name: str) -> Agent:
+        # Graph is acyclic (validated), so this recursion terminates
+        if name not in resolved:
+            routes = {t: resolve(consumer) for t, consumer in fusable.get(name, ())}
+            resolved[name] = FusedAgent(agents[name], routes) if routes else agents[name]
+        return resolved[name]
+
+    subscriptions = [(t, resolve(name)) for t, name in spec.edges() if (t, name) not in fused_edges]
+    fused = [(producers[t][0], t, consumer) for t, consumer in spec.edges() if (t, consumer) in fused_edges]
+    return CompiledGraph(subscriptions, fused)
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from .agents.comparison_agent import ROW_FIELDS, ComparisonAgent
+from .agents.parser_agent import ParserAgent
+from .agents.product_page_agent import SECTION_FIELDS, ProductPageAgent
+from .agents.question_agent import QuestionAgent
+from .blocks.question_sets import get_question_set
+from .blocks.questions import ANSWERERS, INTENT_FIELDS
+from .models import ComparisonPage, Product, ProductPage, Question
+from .templates.comparison_template import ComparisonTemplate
+from .templates.faq_template import FAQTemplate
+from .templates.product_template import ProductTemplate
+
+PRODUCT_FIELDS = tuple(f.name for f in fields(Product))
+
+
+def diff_products(old: Product, new: Product) -> FrozenSet[str]:
+    """Names of the ``Product`` fields whose values differ."""
+    return frozenset(f for f in PRODUCT_FIELDS if getattr(old, f) != getattr(new, f))
+
+
+@dataclass
+class PatchResult:
+    outputs: Dict[str, Any]
+    changed_fields: FrozenSet[str]
+    # Fragments that were recomputed, e.g. "all_questions:price", "product_page:Price"
+    recomputed: List[str] = field(default_factory=list)
+    full_rerun: bool = False
+
+
+class IncrementalRenderer:
+    """Re-renders only the output fragments whose source fields changed.
+
+    Dependencies come from ``INTENT_FIELDS`` (question answers), ``SECTION_FIELDS``
+    (product page sections) and ``ROW_FIELDS`` (comparison rows). The FAQ page is
+    rebuilt from the patched answers whenever any answer changed. A name change
+    touches every question text, so it falls back to ``full_run``.
+    """
+
+    def __init__(self, full_run: Callable[[Dict[str, Any]], Dict[str, Any]], question_set: str = "default") -> None:
+        self.full_run = full_run
+        self.intents = get_question_set(question_set).intents
+        self.parser = ParserAgent()
+        self.question_agent = QuestionAgent()
+        self.product_page_agent = ProductPageAgent()
+        self.comparison_agent = ComparisonAgent()
+        self.faq_tmpl = FAQTemplate()
+        self.product_tmpl = ProductTemplate()
+        self.comparison_tmpl = ComparisonTemplate()
+
+    def patch(self, old_outputs: Dict[str, Any], old_raw: Dict[str, Any], new_raw: Dict[str, Any]) -> PatchResult:
+        old_p = self.parser.run(old_raw)
+        new_p = self.parser.run(new_raw)
+        changed = diff_products(old_p, new_p)
+        if not changed:
+            return PatchResult(outputs=dict(old_outputs), changed_fields=changed)
+        if "name" in changed or len(old_outputs["all_questions"]) != len(self.intents):
+            return PatchResult(outputs=self.full_run(new_raw), changed_fields=changed, full_rerun=True)
+
+        outputs = dict(old_outputs)
+        recomputed: List[str] = []
+
+        # Question answers, then the FAQ page that selects from them
+        all_questions: Optional[List[Dict[str, Any]]] = None
+        for j, intent in enumerate(self.intents):
+            if changed.isdisjoint(INTENT_FIELDS[intent]):
+                continue
+            if all_questions is None:
+                all_questions = list(old_outputs["all_questions"])
+            answer = ANSWERERS[intent](new_p)
+            recomputed.append(f"all_questions:{intent}")
+            if answer != all_questions[j]["answer"]:
+                all_questions[j] = dict(all_questions[j], answer=answer)
+        if all_questions is not None and all_questions != old_outputs["all_questions"]:
+            outputs["all_questions"] = all_questions
+            qs = [Question(q["category"], q["question"], q["answer"]) for q in all_questions]
+            outputs["faq"] = self.faq_tmpl.render(self.question_agent.make_faq_page(new_p, qs))
+            recomputed.append("faq")
+
+        # Product page sections
+        sections = dict(old_outputs["product_page"]["sections"])
+        for key, deps in SECTION_FIELDS.items():
+            if not changed.isdisjoint(deps):
+                sections[key] = self.product_page_agent.section(key, new_p)
+                recomputed.append(f"product_page:{key}")
+        outputs["product_page"] = self.product_tmpl.render(ProductPage(product=new_p, sections=sections))
+
+        # Comparison rows
+        product_b = self.comparison_agent._make_product_b()
+        rows = dict(old_outputs["comparison_page"]["comparisons"])
+        for key, deps in ROW_FIELDS.items():
+            if not changed.isdisjoint(deps):
+                rows[key] = self.comparison_agent.row(key, new_p, product_b)
+                recomputed.append(f"comparison_page:{key}")
+        outputs["comparison_page"] = self.comparison_tmpl.render(
+            ComparisonPage(product_a=new_p, product_b=product_b, comparisons=rows)
+        )
+        return PatchResult(outputs=outputs, changed_fields=changed, recomputed=recomputed)
@@ -0,0 +1,91 @@
+import csv
+import gzip
+import io
+import json
+from typing import Any, Dict, Iterator, Optional
+
+from .agent_core import Message
+
+RAW_FIELDS = (
+    "Product Name",
+    "Concentration",
+    "Skin Type",
+    "Key Ingredients",
+    "Benefits",
+    "How to Use",
+    "Side Effects",
+    "Price",
+)
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _detect_format(path: str) -> str:
+    base = path[:-3] if path.endswith(".gz") else path
+    if base.endswith(".csv"):
+        return "csv"
+    if base.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot infer catalog format from file name: {path}")
+
+
+def _to_raw(row: Dict[str, Any], field_map: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    raw: Dict[str, Any] = {}
+    for key, value in row.items():
+        if field_map:
+            key = field_map.get(key, key)
+        # Empty cells behave like missing fields so the parser falls back to "Not specified"
+        if value is None or value == "":
+            continue
+        # JSON feeds may carry list fields; the parser expects comma-separated text
+        if isinstance(value, list):
+            value = ", ".join(str(v) for v in value)
+        raw[key] = value
+    return raw
+
+
+def iter_jsonl(path: str, field_map: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """Lazily yield one raw product dict per non-blank line of a JSONL file."""
+    with _open_text(path) as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{lineno}: invalid JSON ({e.msg})") from None
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}:{lineno}: expected a JSON object")
+            yield _to_raw(row, field_map)
+
+
+def iter_csv(path: str, field_map: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """Lazily yield one raw product dict per CSV row (header row gives the keys)."""
+    with _open_text(path) as f:
+        for row in csv.DictReader(f):
+            yield _to_raw(row, field_map)
+
+
+def iter_catalog(path: str, fmt: Optional[str] = None, field_map: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream raw product dicts from a CSV or JSONL catalog (optionally gzipped).
+
+    ``field_map`` renames source columns to the ``RAW_INPUT`` keys in ``RAW_FIELDS``.
+    Rows are read on demand, so memory stays flat and a consumer such as
+    ``Orchestrator.run_batch`` only pulls the next rows when it has capacity.
+    """
+    fmt = fmt or _detect_format(path)
+    if fmt == "csv":
+        return iter_csv(path, field_map)
+    if fmt == "jsonl":
+        return iter_jsonl(path, field_map)
+    raise ValueError(f"Unknown catalog format: {fmt}")
+
+
+def raw_input_messages(path: str, fmt: Optional[str] = None, field_map: Optional[Dict[str, str]] = None) -> Iterator[Message]:
+    """Stream ``RAW_INPUT`` messages for a catalog file, correlated by row index."""
+    for i, raw in enumerate(iter_catalog(path, fmt, field_map)):
+        yield Message(type="RAW_INPUT", payload={"raw": raw}, correlation_id=str(i))
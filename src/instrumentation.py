@@ -0,0 +1,189 @@
+import cProfile
+import io
+import json
+import pstats
+import tracemalloc
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .agent_core import Agent, EventBus, Message
+
+# Latency bucket upper bounds in seconds (Prometheus-style, cumulative on export)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; the last bucket counts values above every bound."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding quantile ``q`` (``max`` for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": {str(b): n for b, n in zip(self.bounds + (float("inf"),), self.counts)},
+        }
+
+
+def _agent_name(agent: Agent) -> str:
+    return getattr(agent, "name", type(agent).__name__)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class BusMetrics:
+    """Dispatch hook collecting EventBus counters, latency histograms and queue depth.
+
+    Attach with ``metrics.attach(orchestrator.bus)``; export with ``snapshot()``
+    (JSON-ready dict), ``to_json()`` or ``to_prometheus()``.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    def reset(self) -> None:
+        self.messages: Counter = Counter()
+        self.published: Counter = Counter()
+        self.agent_latency: Dict[str, Histogram] = {}
+        self.type_latency: Dict[str, Histogram] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+    def attach(self, bus: EventBus) -> "BusMetrics":
+        bus.add_hook(self)
+        return self
+
+    def detach(self, bus: EventBus) -> None:
+        bus.remove_hook(self)
+
+    # DispatchHook
+    def on_dequeue(self, msg: Message, queue_depth: int) -> None:
+        self.messages[msg.type] += 1
+        self.queue_depth = queue_depth
+        if queue_depth > self.max_queue_depth:
+            self.max_queue_depth = queue_depth
+
+    def before_dispatch(self, agent: Agent, msg: Message) -> None:
+        pass
+
+    def after_dispatch(self, agent: Agent, msg: Message, elapsed: float, published: int) -> None:
+        name = _agent_name(agent)
+        hist = self.agent_latency.get(name)
+        if hist is None:
+            hist = self.agent_latency[name] = Histogram(self.buckets)
+        hist.observe(elapsed)
+        hist = self.type_latency.get(msg.type)
+        if hist is None:
+            hist = self.type_latency[msg.type] = Histogram(self.buckets)
+        hist.observe(elapsed)
+        self.published[name] += published
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "messages": dict(self.messages),
+            "published": dict(self.published),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "agent_latency_seconds": {k: h.snapshot() for k, h in sorted(self.agent_latency.items())},
+            "message_type_latency_seconds": {k: h.snapshot() for k, h in sorted(self.type_latency.items())},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "eventbus") -> str:
+        lines: List[str] = [
+            f"# TYPE {prefix}_messages_total counter",
+            *(f'{prefix}_messages_total{{type="{_label(t)}"}} {n}' for t, n in sorted(self.messages.items())),
+            f"# TYPE {prefix}_published_total counter",
+            *(f'{prefix}_published_total{{agent="{_label(a)}"}} {n}' for a, n in sorted(self.published.items())),
+            f"# TYPE {prefix}_queue_depth gauge",
+            f"{prefix}_queue_depth {self.queue_depth}",
+            f"# TYPE {prefix}_queue_depth_max gauge",
+            f"{prefix}_queue_depth_max {self.max_queue_depth}",
+        ]
+        for metric, label, hists in (
+            ("dispatch_seconds", "agent", self.agent_latency),
+            ("message_type_seconds", "type", self.type_latency),
+        ):
+            lines.append(f"# TYPE {prefix}_{metric} histogram")
+            for key, hist in sorted(hists.items()):
+                lbl = f'{label}="{_label(key)}"'
+                cumulative = 0
+                for bound, n in zip(hist.bounds + (float("inf"),), hist.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_{metric}_bucket{{{lbl},le="{le}"}} {cumulative}')
+                lines.append(f"{prefix}_{metric}_sum{{{lbl}}} {hist.sum!r}")
+                lines.append(f"{prefix}_{metric}_count{{{lbl}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def capture_profile(cpu: bool = True, memory: bool = False, top: int = 20) -> Iterator[Dict[str, Any]]:
+    """Profile the enclosed block (e.g. one ``Orchestrator.run``).
+
+    The yielded dict is filled on exit: ``cpu`` holds the top ``top`` functions by
+    cumulative time (pstats text) and ``memory`` the top allocation sites plus the
+    traced peak in bytes.
+    """
+    report: Dict[str, Any] = {}
+    profiler: Optional[cProfile.Profile] = cProfile.Profile() if cpu else None
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield report
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            report["cpu"] = out.getvalue()
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            report["memory"] = {
+                "peak_bytes": peak,
+                "top": [str(stat) for stat in snapshot.statistics("lineno")[:top]],
+            }
+            if started_tracing:
+                tracemalloc.stop()
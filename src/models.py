@@ -1,5 +1,8 @@
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Literal
+import sys
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Iterator, List, Dict, Mapping, NamedTuple, Optional, Literal, Tuple
+from .blocks.vocab import Vocabulary
 
 QuestionCategory = Literal["Informational", "Safety", "Usage", "Purchase", "Comparison"]
 
@@ -19,6 +22,8 @@ class Question:
     category: QuestionCategory
     text: str
     answer: Optional[str] = None
+    # Precomputed answer intent (see blocks/questions.py); None means classify from text
+    intent: Optional[str] = None
 
 @dataclass
 class FAQPage:
@@ -35,3 +40,126 @@ class ComparisonPage:
     product_a: Product
     product_b: Product
     comparisons: Dict[str, Dict[str, str]]  # section -> {a: str, b: str, summary: str}
+
+
+# Compact, immutable variants for keeping a whole catalog in memory. NamedTuples
+# carry no per-instance __dict__, list fields become tuples, and repeated strings
+# (categories, list items) are interned so equal values share one object.
+
+def _intern_all(items) -> Tuple[str, ...]:
+    return tuple(sys.intern(i) for i in items)
+
+
+class FrozenProduct(NamedTuple):
+    name: str
+    concentration: Optional[str] = None
+    skin_types: Tuple[str, ...] = ()
+    key_ingredients: Tuple[str, ...] = ()
+    benefits: Tuple[str, ...] = ()
+    how_to_use: Optional[str] = None
+    side_effects: Optional[str] = None
+    price: Optional[str] = None
+
+    @classmethod
+    def from_product(cls, p: Product) -> "FrozenProduct":
+        return cls(
+            p.name,
+            p.concentration,
+            _intern_all(p.skin_types),
+            _intern_all(p.key_ingredients),
+            _intern_all(p.benefits),
+            p.how_to_use,
+            p.side_effects,
+            p.price,
+        )
+
+    def to_product(self) -> Product:
+        return Product(
+            self.name,
+            self.concentration,
+            list(self.skin_types),
+            list(self.key_ingredients),
+            list(self.benefits),
+            self.how_to_use,
+            self.side_effects,
+            self.price,
+        )
+
+
+class FrozenQuestion(NamedTuple):
+    category: QuestionCategory
+    text: str
+    answer: Optional[str] = None
+    intent: Optional[str] = None
+
+    @classmethod
+    def from_question(cls, q: Question) -> "FrozenQuestion":
+        return cls(
+            sys.intern(q.category),
+            q.text,
+            q.answer,
+            sys.intern(q.intent) if q.intent is not None else None,
+        )
+
+    def to_question(self) -> Question:
+        return Question(self.category, self.text, self.answer, self.intent)
+
+
+class FrozenFAQPage(NamedTuple):
+    product_name: str
+    faqs: Tuple[FrozenQuestion, ...]
+
+
+class FrozenProductPage(NamedTuple):
+    product: FrozenProduct
+    sections: Mapping[str, str]
+
+
+class FrozenComparisonPage(NamedTuple):
+    product_a: FrozenProduct
+    product_b: FrozenProduct
+    comparisons: Mapping[str, Mapping[str, str]]
+
+
+class ProductFrame:
+    """Column-oriented batch of parsed products, built by ``ParserAgent.parse_many``.
+
+    Each ``Product`` field is a list with one entry per row; list fields hold
+    interned tuples, and ``<field>_mask`` holds their bitmask in the frame's own
+    ``vocabs[<field>]`` (masks from different frames are not comparable). Ingest also fills ``how_to_use_text``,
+    ``side_effects_text`` and ``price_text`` (punctuation already normalized) and
+    the numeric ``price_value`` / ``concentration_pct`` arrays (NaN when missing
+    or unparseable). ``row(i)`` / ``rows()`` give ``FrozenProduct`` views for code
+    written against single products.
+    """
+
+    FIELDS = tuple(f.name for f in fields(Product))
+    LIST_FIELDS = ("skin_types", "key_ingredients", "benefits")
+
+    def __init__(self) -> None:
+        self.name: List[str] = []
+        self.concentration: List[Optional[str]] = []
+        self.skin_types: List[Tuple[str, ...]] = []
+        self.key_ingredients: List[Tuple[str, ...]] = []
+        self.benefits: List[Tuple[str, ...]] = []
+        self.how_to_use: List[Optional[str]] = []
+        self.side_effects: List[Optional[str]] = []
+        self.price: List[Optional[str]] = []
+        self.skin_types_mask: List[int] = []
+        self.key_ingredients_mask: List[int] = []
+        self.benefits_mask: List[int] = []
+        self.how_to_use_text: List[Optional[str]] = []
+        self.side_effects_text: List[Optional[str]] = []
+        self.price_text: List[Optional[str]] = []
+        self.price_value = array("d")
+        self.concentration_pct = array("d")
+        self.vocabs: Dict[str, Vocabulary] = {f: Vocabulary() for f in self.LIST_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def row(self, i: int) -> FrozenProduct:
+        return FrozenProduct._make(getattr(self, f)[i] for f in self.FIELDS)
+
+    def rows(self) -> Iterator[FrozenProduct]:
+        return map(FrozenProduct._make, zip(*(getattr(self, f) for f in self.FIELDS)))
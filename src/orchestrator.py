@@ -1,6 +1,15 @@
+import asyncio
 import json
-from typing import Dict, Any
-from .agent_core import EventBus, Message
+import queue
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Any, AbstractSet, AsyncIterator, Callable, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from .agent_core import AsyncEventBus, EventBus, Message
+from .cache import ResultCache
+from .graph import CompiledGraph, GraphSpec, Node, compile_graph
+from .incremental import IncrementalRenderer, PatchResult
 from .agents.bus_agents import (
     ParseAgentNode,
     QuestionAgentNode,
@@ -15,6 +24,81 @@ from .agents.render_agents import (
 )
 
 
+class _QueueLatch:
+    """Forwards completed bundles to an asyncio queue (used by ``arun_batch``)."""
+
+    name = "QueueLatch"
+
+    def __init__(self, done: "asyncio.Queue") -> None:
+        self.done = done
+
+    def on_message(self, msg: Message, publish) -> None:
+        if msg.type == "ALL_OUTPUTS_READY":
+            self.done.put_nowait((msg.correlation_id, msg.payload["outputs"]))
+
+
+# The agent graph, by Orchestrator attribute name. Node order is dispatch order
+# for subscribers of the same message type.
+PIPELINE = GraphSpec(
+    nodes=(
+        Node("parse_node", ("RAW_INPUT",), ("PRODUCT_PARSED",)),
+        Node("question_node", ("PRODUCT_PARSED",), ("QUESTIONS_ANSWERED", "FAQ_PAGE_READY")),
+        Node("product_page_node", ("PRODUCT_PARSED",), ("PRODUCT_PAGE_READY",)),
+        Node("comparison_node", ("PRODUCT_PARSED",), ("COMPARISON_PAGE_READY",)),
+        Node("faq_renderer", ("FAQ_PAGE_READY",), ("FAQ_JSON",)),
+        Node("product_renderer", ("PRODUCT_PAGE_READY",), ("PRODUCT_JSON",)),
+        Node("comparison_renderer", ("COMPARISON_PAGE_READY",), ("COMPARISON_JSON",)),
+        Node(
+            "collector",
+            ("FAQ_JSON", "PRODUCT_JSON", "COMPARISON_JSON", "QUESTIONS_ANSWERED"),
+            ("ALL_OUTPUTS_READY",),
+        ),
+    ),
+    sources=("RAW_INPUT",),
+    sinks=("ALL_OUTPUTS_READY",),
+)
+
+# Graph edges each output key depends on; ``run(raw, outputs=...)`` wires only these
+OUTPUT_EDGES: Dict[str, FrozenSet[Tuple[str, str]]] = {
+    "faq": frozenset({
+        ("RAW_INPUT", "parse_node"),
+        ("PRODUCT_PARSED", "question_node"),
+        ("FAQ_PAGE_READY", "faq_renderer"),
+        ("FAQ_JSON", "collector"),
+    }),
+    "product_page": frozenset({
+        ("RAW_INPUT", "parse_node"),
+        ("PRODUCT_PARSED", "product_page_node"),
+        ("PRODUCT_PAGE_READY", "product_renderer"),
+        ("PRODUCT_JSON", "collector"),
+    }),
+    "comparison_page": frozenset({
+        ("RAW_INPUT", "parse_node"),
+        ("PRODUCT_PARSED", "comparison_node"),
+        ("COMPARISON_PAGE_READY", "comparison_renderer"),
+        ("COMPARISON_JSON", "collector"),
+    }),
+    "all_questions": frozenset({
+        ("RAW_INPUT", "parse_node"),
+        ("PRODUCT_PARSED", "question_node"),
+        ("QUESTIONS_ANSWERED", "collector"),
+    }),
+}
+
+
+class _OutputLatch:
+    """Stores completed bundles by correlation id (used by ``run``/``run_batch``)."""
+
+    name = "OutputLatch"
+
+    def __init__(self, completed: "OrderedDict[Optional[str], Dict[str, Any]]") -> None:
+        self.completed = completed
+
+    def on_message(self, msg: Message, publish) -> None:
+        if msg.type == "ALL_OUTPUTS_READY":
+            self.completed[msg.correlation_id] = msg.payload["outputs"]
+
+
 class Orchestrator:
     """Coordinates autonomous agents via an event bus (message-passing graph).
 
@@ -25,61 +109,315 @@ class Orchestrator:
         - ComparisonAgentNode -> COMPARISON_PAGE_READY -> ComparisonRenderAgent -> COMPARISON_JSON
       Questions also emit QUESTIONS_ANSWERED -> OutputCollectorAgent
       OutputCollectorAgent waits for all pieces and emits ALL_OUTPUTS_READY
+
+    Every message carries the correlation id of the product it belongs to, so a
+    single graph can process a whole catalog via ``run_batch``.
+
+    Pass a bus executor (``src.executors.make_executor("thread" | "process")``) to
+    run independent branches and products concurrently; output is identical to
+    the default serial bus. Pass a ``ResultCache`` to reuse bundles for raw inputs
+    that were already rendered by the same pipeline version. ``template_mode="trusted"``
+    skips schema validation of pages built by our own agents. With ``as_bytes=True``
+    every page in a bundle is compact UTF-8 JSON bytes assembled from pre-encoded
+    fragments instead of a dict, ready to be written without re-encoding.
+    ``max_queued`` / ``spill_dir`` cap the messages each of its buses holds in
+    memory, spilling the rest to disk (see ``EventBus``); useful with a large
+    ``max_in_flight``.
+
+    The wiring is declared in ``PIPELINE`` and compiled by ``src.graph.compile_graph``.
+    By default every hop stays on ``self.bus``, so extra subscribers and dispatch
+    hooks see each message and agent. ``fuse=True`` turns the linear page -> render
+    hops into direct calls: the ``*_PAGE_READY`` messages are then no longer
+    published and the renderers no longer dispatched on their own, so only use it
+    when nothing outside the pipeline listens to them.
     """
 
-    def __init__(self) -> None:
-        self.bus = EventBus()
+    def __init__(
+        self,
+        executor: Optional[Any] = None,
+        cache: Optional[ResultCache] = None,
+        template_mode: str = "strict",
+        as_bytes: bool = False,
+        fuse: bool = False,
+        max_queued: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        if as_bytes and cache is not None:
+            raise ValueError("ResultCache stores dict bundles; it cannot be combined with as_bytes=True")
+        self.bus = EventBus(executor=executor, max_queued=max_queued, spill_dir=spill_dir)
+        self.max_queued = max_queued
+        self.spill_dir = spill_dir
+        self.as_bytes = as_bytes
+        # Optional result cache: unchanged products skip the agent graph entirely
+        self.cache = cache
+        # Built on first use of ``rerender``
+        self._incremental: Optional[IncrementalRenderer] = None
         # Workers
         self.parse_node = ParseAgentNode()
         self.question_node = QuestionAgentNode()
         self.product_page_node = ProductPageAgentNode()
         self.comparison_node = ComparisonAgentNode()
         # Renderers
-        self.faq_renderer = FAQRenderAgent()
-        self.product_renderer = ProductRenderAgent()
-        self.comparison_renderer = ComparisonRenderAgent()
+        self.faq_renderer = FAQRenderAgent(template_mode, as_bytes)
+        self.product_renderer = ProductRenderAgent(template_mode, as_bytes)
+        self.comparison_renderer = ComparisonRenderAgent(template_mode, as_bytes)
         # Collector
-        self.collector = OutputCollectorAgent()
-
-        # Subscriptions (graph wiring)
-        self.bus.subscribe("RAW_INPUT", self.parse_node)
-        self.bus.subscribe("PRODUCT_PARSED", self.question_node)
-        self.bus.subscribe("PRODUCT_PARSED", self.product_page_node)
-        self.bus.subscribe("PRODUCT_PARSED", self.comparison_node)
-
-        self.bus.subscribe("FAQ_PAGE_READY", self.faq_renderer)
-        self.bus.subscribe("PRODUCT_PAGE_READY", self.product_renderer)
-        self.bus.subscribe("COMPARISON_PAGE_READY", self.comparison_renderer)
-
-        self.bus.subscribe("FAQ_JSON", self.collector)
-        self.bus.subscribe("PRODUCT_JSON", self.collector)
-        self.bus.subscribe("COMPARISON_JSON", self.collector)
-        self.bus.subscribe("QUESTIONS_ANSWERED", self.collector)
-
-        self._outputs: Dict[str, Any] = {}
-        # Capture final outputs
-        class _OutputLatch:
-            name = "OutputLatch"
-
-            def on_message(_, msg: Message, publish):
-                if msg.type == "ALL_OUTPUTS_READY":
-                    self._outputs = msg.payload["outputs"]
-        self.bus.subscribe("ALL_OUTPUTS_READY", _OutputLatch())
-
-    def run(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        self.collector = OutputCollectorAgent(as_bytes)
+
+        # Subscriptions (graph wiring), optionally with linear hops fused into direct calls
+        self.fuse = fuse
+        self.graph: CompiledGraph = compile_graph(PIPELINE, self._agents(), fuse)
+        self.graph.wire(self.bus)
+
+        # Completed bundles in completion order, keyed by correlation id
+        self._completed: "OrderedDict[Optional[str], Dict[str, Any]]" = OrderedDict()
+        self.bus.subscribe("ALL_OUTPUTS_READY", _OutputLatch(self._completed))
+        # Pruned buses for partial output requests, built on first use
+        self._partial: Dict[FrozenSet[str], Tuple[EventBus, OutputCollectorAgent]] = {}
+
+    def _agents(self) -> Dict[str, Any]:
+        return {node.name: getattr(self, node.name) for node in PIPELINE.nodes}
+
+    def reset(self) -> None:
+        """Discard in-flight state so the instance can be reused after a failed run."""
+        self.bus.clear()
+        self.collector.reset()
+        for bus, collector in self._partial.values():
+            bus.clear()
+            collector.reset()
+        self._completed.clear()
+
+    def _bus_for(self, outputs: Optional[AbstractSet[str]]) -> Optional[EventBus]:
+        """Return the bus to use for ``outputs``, or None for the full graph.
+
+        A partial bus shares this instance's agents, executor, queue limit and dispatch hooks
+        (as attached at the time it is built) but is compiled from only the edges
+        the requested keys depend on, with a collector that waits for just those keys.
+        """
+        if outputs is None:
+            return None
+        wanted = frozenset(outputs)
+        unknown = wanted.difference(OutputCollectorAgent.REQUIRED)
+        if unknown or not wanted:
+            raise ValueError(f"outputs must be a non-empty subset of {OutputCollectorAgent.REQUIRED}, got {sorted(outputs)}")
+        if len(wanted) == len(OutputCollectorAgent.REQUIRED):
+            return None
+        if wanted not in self._partial:
+            edges = frozenset().union(*(OUTPUT_EDGES[k] for k in wanted))
+            bus = EventBus(self.bus.executor, self.bus.wave_size, self.max_queued, self.spill_dir)
+            for hook in self.bus.hooks():
+                bus.add_hook(hook)
+            collector = OutputCollectorAgent(self.as_bytes, [k for k in OutputCollectorAgent.REQUIRED if k in wanted])
+            agents = dict(self._agents(), collector=collector)
+            compile_graph(PIPELINE.restrict(edges), agents, self.fuse).wire(bus)
+            bus.subscribe("ALL_OUTPUTS_READY", _OutputLatch(self._completed))
+            self._partial[wanted] = (bus, collector)
+        return self._partial[wanted][0]
+
+    def run(self, raw: Dict[str, Any], outputs: Optional[AbstractSet[str]] = None) -> Dict[str, Any]:
+        """Render one product; ``outputs`` (e.g. ``{"product_page"}``) limits the work to those keys."""
+        bus = self._bus_for(outputs)
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(raw)
+            hit = self.cache.get(key)
+            if hit is not None:
+                return dict(hit) if bus is None else {k: hit[k] for k in outputs}
         # Kick off the flow
-        self.bus.publish(Message(type="RAW_INPUT", payload={"raw": raw}))
-        self.bus.run()
-        return dict(self._outputs)
+        bus = bus or self.bus
+        bus.publish(Message(type="RAW_INPUT", payload={"raw": raw}))
+        bus.run()
+        result = self._completed.pop(None, {})
+        # Only complete bundles are cached
+        if key is not None and result and bus is self.bus:
+            self.cache.put(key, result)
+        return dict(result)
+
+    def run_batch(
+        self,
+        raws: Iterable[Dict[str, Any]],
+        max_in_flight: int = 64,
+        outputs: Optional[AbstractSet[str]] = None,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Process many raw products through the same bus and agent instances.
+
+        Each raw dict gets a correlation id (its position in ``raws`` as a string).
+        At most ``max_in_flight`` products are queued on the bus at a time, and
+        ``(correlation_id, outputs)`` pairs are yielded as each product completes;
+        cache hits are yielded straight away without touching the bus. ``outputs``
+        limits each bundle to the given keys, as in ``run``.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        partial = self._bus_for(outputs)
+        bus = partial or self.bus
+        # Partial bundles are never written to the cache
+        cache = self.cache
+        keys: Dict[str, str] = {}
+        it = enumerate(raws)
+        while True:
+            chunk = list(islice(it, max_in_flight))
+            if not chunk:
+                break
+            for i, raw in chunk:
+                cid = str(i)
+                if cache is not None:
+                    key = cache.key(raw)
+                    hit = cache.get(key)
+                    if hit is not None:
+                        yield cid, hit if partial is None else {k: hit[k] for k in outputs}
+                        continue
+                    if partial is None:
+                        keys[cid] = key
+                bus.publish(Message(type="RAW_INPUT", payload={"raw": raw}, correlation_id=cid))
+            bus.run()
+            while self._completed:
+                cid, bundle = self._completed.popitem(last=False)
+                if cid in keys:
+                    cache.put(keys.pop(cid), bundle)
+                yield cid, bundle
+
+    async def arun_batch(
+        self,
+        raws: Iterable[Dict[str, Any]],
+        max_pending: int = 1024,
+        max_concurrency: int = 64,
+        offload_sync: bool = False,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Async counterpart of ``run_batch`` driven by an ``AsyncEventBus``.
+
+        The same agent instances are wired onto an async bus, so agents may be
+        swapped for ``AsyncAgent`` implementations. Bundles are yielded in
+        completion order, which may differ from input order. Do not run this
+        concurrently with ``run``/``run_batch`` on the same instance.
+        """
+        abus = AsyncEventBus(max_concurrency=max_concurrency, max_pending=max_pending, offload_sync=offload_sync)
+        for message_type, agent in self.bus.subscriptions():
+            if message_type != "ALL_OUTPUTS_READY":
+                abus.subscribe(message_type, agent)
+        done: "asyncio.Queue" = asyncio.Queue()
+        abus.subscribe("ALL_OUTPUTS_READY", _QueueLatch(done))
+        finished = object()
+
+        cache = self.cache
+        keys: Dict[str, str] = {}
+
+        async def feed() -> None:
+            try:
+                async with abus:
+                    for i, raw in enumerate(raws):
+                        cid = str(i)
+                        if cache is not None:
+                            key = cache.key(raw)
+                            hit = cache.get(key)
+                            if hit is not None:
+                                done.put_nowait((cid, hit))
+                                continue
+                            keys[cid] = key
+                        await abus.publish(Message(type="RAW_INPUT", payload={"raw": raw}, correlation_id=cid))
+            finally:
+                done.put_nowait(finished)
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                item = await done.get()
+                if item is finished:
+                    break
+                cid, outputs = item
+                if cid in keys:
+                    cache.put(keys.pop(cid), outputs)
+                yield item
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+            await asyncio.gather(feeder, return_exceptions=True)
+        # Surface agent errors raised while draining
+        feeder.result()
+
+    def rerender(self, old_outputs: Dict[str, Any], old_raw: Dict[str, Any], new_raw: Dict[str, Any]) -> PatchResult:
+        """Patch a stored bundle for an edited product, recomputing only affected fragments."""
+        if self._incremental is None:
+            self._incremental = IncrementalRenderer(full_run=self.run)
+        result = self._incremental.patch(old_outputs, old_raw, new_raw)
+        if self.cache is not None and not result.full_rerun:
+            self.cache.put(self.cache.key(new_raw), result.outputs)
+        return result
 
     def write_outputs(self, outputs: Dict[str, Any], out_dir: str = "outputs") -> None:
         import os
         os.makedirs(out_dir, exist_ok=True)
-        with open(os.path.join(out_dir, "faq.json"), "w", encoding="utf-8") as f:
-            json.dump(outputs["faq"], f, ensure_ascii=False, indent=2)
-        with open(os.path.join(out_dir, "product_page.json"), "w", encoding="utf-8") as f:
-            json.dump(outputs["product_page"], f, ensure_ascii=False, indent=2)
-        with open(os.path.join(out_dir, "comparison_page.json"), "w", encoding="utf-8") as f:
-            json.dump(outputs["comparison_page"], f, ensure_ascii=False, indent=2)
-        with open(os.path.join(out_dir, "all_questions.json"), "w", encoding="utf-8") as f:
-            json.dump(outputs["all_questions"], f, ensure_ascii=False, indent=2)
+        for key in ("faq", "product_page", "comparison_page", "all_questions"):
+            value = outputs[key]
+            path = os.path.join(out_dir, key + ".json")
+            if isinstance(value, bytes):
+                # Pre-encoded bundles (as_bytes=True) are written as-is, in compact form
+                with open(path, "wb") as f:
+                    f.write(value)
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(value, f, ensure_ascii=False, indent=2)
+
+
+class OrchestratorPool:
+    """Thread-safe pool of ready-wired orchestrators for request-serving processes.
+
+    ``size`` instances are built up front by ``factory`` (default: ``Orchestrator``
+    with ``kwargs``), so a request only pays for ``acquire``/``release``. Instances
+    are reset on release, so one that raised mid-run goes back clean. A
+    ``ResultCache`` passed via ``kwargs`` would be shared by every instance and is
+    not thread-safe; give each instance its own through ``factory`` instead.
+
+        pool = OrchestratorPool(size=8, template_mode="trusted")
+        outputs = pool.run(raw)            # or: with pool.lease() as orch: ...
+    """
+
+    def __init__(self, size: int = 4, factory: Optional[Callable[[], Orchestrator]] = None, **kwargs: Any) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        factory = factory or (lambda: Orchestrator(**kwargs))
+        self.size = size
+        self._all: List[Orchestrator] = [factory() for _ in range(size)]
+        # LIFO keeps recently used (warm) instances in rotation
+        self._idle: "queue.LifoQueue[Orchestrator]" = queue.LifoQueue()
+        for orch in self._all:
+            self._idle.put(orch)
+        self._lock = threading.Lock()
+        self._leased: Set[int] = set()  # ids of instances handed out and not yet released
+
+    def acquire(self, timeout: Optional[float] = None) -> Orchestrator:
+        """Take an idle orchestrator, waiting up to ``timeout`` seconds (forever if None)."""
+        try:
+            orch = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"no idle orchestrator within {timeout}s (pool size {self.size})") from None
+        with self._lock:
+            self._leased.add(id(orch))
+        return orch
+
+    def release(self, orch: Orchestrator) -> None:
+        if not any(orch is o for o in self._all):
+            raise ValueError("orchestrator does not belong to this pool")
+        with self._lock:
+            if id(orch) not in self._leased:
+                raise ValueError("orchestrator is not leased (already released?)")
+            self._leased.discard(id(orch))
+        orch.reset()
+        self._idle.put(orch)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[Orchestrator]:
+        orch = self.acquire(timeout)
+        try:
+            yield orch
+        finally:
+            self.release(orch)
+
+    def run(self, raw: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        with self.lease(timeout) as orch:
+            return orch.run(raw)
+
+    @property
+    def in_use(self) -> int:
+        with self._lock:
+            return len(self._leased)
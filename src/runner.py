@@ -0,0 +1,246 @@
+"""Sharded, resumable catalog runs across worker processes (driven by ``run.py``).
+
+The catalog is cut into chunks of ``chunk_size`` consecutive products. Chunk ``k``
+belongs to shard ``k % shard_count``, so several machines can split one catalog
+with ``--shard i/N``. Each chunk is rendered by a worker process with its own
+``Orchestrator`` and written to ``<out_dir>/chunks/<k>/`` by a ``JsonlShardSink``.
+Finished chunks are appended to a checkpoint file; a re-run with the same
+settings skips them. Once every chunk is done the per-chunk files are merged, in
+catalog order, into one JSONL file per page type.
+"""
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .ingest import iter_catalog
+from .orchestrator import Orchestrator
+from .sinks import PAGE_KEYS, JsonlShardSink
+
+CHECKPOINT_NAME = "checkpoint.jsonl"
+CHUNKS_DIR = "chunks"
+
+Chunk = Tuple[int, List[Tuple[int, Dict[str, Any]]]]
+
+# Per-process orchestrator, created by ``_init_worker``
+_worker_orch: Optional[Orchestrator] = None
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse ``"i/N"`` into ``(i, N)`` with ``0 <= i < N``."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {spec!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"shard index must be in [0, {count}), got {spec!r}")
+    return index, count
+
+
+def iter_chunks(raws: Iterable[Dict[str, Any]], chunk_size: int, shard: Tuple[int, int] = (0, 1)) -> Iterator[Chunk]:
+    """Yield ``(chunk_id, [(product_index, raw), ...])`` for the chunks in ``shard``."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    index, count = shard
+    it = enumerate(raws)
+    chunk_id = 0
+    while True:
+        rows = list(islice(it, chunk_size))
+        if not rows:
+            return
+        if chunk_id % count == index:
+            yield chunk_id, rows
+        chunk_id += 1
+
+
+def _init_worker(template_mode: str, max_queued: Optional[int] = None, spill_dir: Optional[str] = None) -> None:
+    global _worker_orch
+    _worker_orch = Orchestrator(template_mode=template_mode, as_bytes=True, max_queued=max_queued, spill_dir=spill_dir)
+
+
+def _chunk_dir(out_dir: str, chunk_id: int) -> str:
+    return os.path.join(out_dir, CHUNKS_DIR, f"{chunk_id:08d}")
+
+
+def process_chunk(chunk: Chunk, out_dir: str, use_gzip: bool = False) -> Tuple[int, int, float]:
+    """Render one chunk into its own directory; returns ``(chunk_id, records, seconds)``."""
+    chunk_id, rows = chunk
+    start = time.perf_counter()
+    orch = _worker_orch
+    if orch is None:
+        _init_worker("strict")
+        orch = _worker_orch
+    ids = [str(i) for i, _ in rows]
+    results = ((ids[int(cid)], outputs) for cid, outputs in orch.run_batch(raw for _, raw in rows))
+    with JsonlShardSink(_chunk_dir(out_dir, chunk_id), gzip=use_gzip) as sink:
+        records = sink.write_all(results)
+    return chunk_id, records, time.perf_counter() - start
+
+
+class Checkpoint:
+    """Append-only record of finished chunks for one run configuration.
+
+    The first line holds the run settings (including the input's size and
+    mtime); resuming with different settings is refused, since chunk ids would
+    no longer refer to the same products.
+    """
+
+    def __init__(self, path: str, settings: Dict[str, Any]) -> None:
+        self.path = path
+        self.done: Dict[int, int] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            lines = [line for line in text.splitlines() if line.strip()]
+            if lines:
+                stored = json.loads(lines[0])
+                if stored != settings:
+                    raise ValueError(f"checkpoint {path} was written with different settings: {stored}")
+                for line in lines[1:]:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn line from a crash mid-write
+                    self.done[entry["chunk"]] = entry["records"]
+            torn = bool(text) and not text.endswith("\n")
+        else:
+            lines, torn = [], False
+        self._fh = open(path, "a", encoding="utf-8")
+        if torn:
+            self._fh.write("\n")
+        if not lines:
+            self._append(settings)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self._fh.write(json.dumps(entry, sort_keys=True) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def mark(self, chunk_id: int, records: int) -> None:
+        self.done[chunk_id] = records
+        self._append({"chunk": chunk_id, "records": records})
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def merge_chunks(out_dir: str, chunk_ids: Iterable[int], use_gzip: bool = False, suffix: str = "") -> List[str]:
+    """Concatenate per-chunk page files in chunk order into one file per page type.
+
+    Gzip members can be concatenated as-is, so compressed chunks are not re-encoded.
+    """
+    ext = ".jsonl.gz" if use_gzip else ".jsonl"
+    ordered = sorted(chunk_ids)
+    paths = []
+    for page in PAGE_KEYS:
+        path = os.path.join(out_dir, page + suffix + ext)
+        with open(path + ".part", "wb") as dst:
+            for chunk_id in ordered:
+                src_path = os.path.join(_chunk_dir(out_dir, chunk_id), page + ext)
+                if os.path.exists(src_path):
+                    with open(src_path, "rb") as src:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(path + ".part", path)
+        paths.append(path)
+    return paths
+
+
+def run_catalog(
+    input_path: str,
+    out_dir: str = "outputs",
+    workers: int = 1,
+    shard: Tuple[int, int] = (0, 1),
+    chunk_size: int = 1000,
+    use_gzip: bool = False,
+    template_mode: str = "strict",
+    keep_chunks: bool = False,
+    max_queued: Optional[int] = None,
+    spill_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Render a catalog file into merged JSONL outputs; returns a summary dict.
+
+    ``workers=1`` renders in this process. Interrupted runs resume from the
+    checkpoint in ``out_dir``; the checkpoint and chunk files are removed after a
+    successful merge unless ``keep_chunks`` is set. ``max_queued`` / ``spill_dir``
+    bound each worker's bus queue in memory (see ``EventBus``); they do not change
+    the output, so a run may be resumed with different values.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    os.makedirs(os.path.join(out_dir, CHUNKS_DIR), exist_ok=True)
+    stat = os.stat(input_path)
+    settings = {
+        "input": os.path.abspath(input_path),
+        # A regenerated catalog at the same path must not resume the old run
+        "input_size": stat.st_size,
+        "input_mtime_ns": stat.st_mtime_ns,
+        "chunk_size": chunk_size,
+        "shard": list(shard),
+        "gzip": use_gzip,
+        "template_mode": template_mode,
+    }
+    checkpoint = Checkpoint(os.path.join(out_dir, CHECKPOINT_NAME), settings)
+    resumed = dict(checkpoint.done)
+    chunk_ids: Set[int] = set(resumed)
+    processed = 0
+    start = time.perf_counter()
+    pending = (c for c in iter_chunks(iter_catalog(input_path), chunk_size, shard) if c[0] not in resumed)
+    try:
+        if workers == 1:
+            _init_worker(template_mode, max_queued, spill_dir)
+            for chunk in pending:
+                chunk_id, records, _ = process_chunk(chunk, out_dir, use_gzip)
+                checkpoint.mark(chunk_id, records)
+                chunk_ids.add(chunk_id)
+                processed += records
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(template_mode, max_queued, spill_dir)) as pool:
+                in_flight: Set[Future] = set()
+                try:
+                    for chunk in pending:
+                        in_flight.add(pool.submit(process_chunk, chunk, out_dir, use_gzip))
+                        chunk_ids.add(chunk[0])
+                        # Bound the chunks held in memory to two per worker
+                        if len(in_flight) >= 2 * workers:
+                            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            processed += _record(finished, checkpoint)
+                    processed += _record(in_flight, checkpoint)
+                except BaseException:
+                    # Drop chunks that have not started (shutdown's cancel_futures needs Python 3.9)
+                    for future in in_flight:
+                        future.cancel()
+                    pool.shutdown(wait=True)
+                    raise
+    finally:
+        checkpoint.close()
+    elapsed = time.perf_counter() - start
+
+    index, count = shard
+    suffix = "" if count == 1 else f"-shard{index:03d}of{count:03d}"
+    paths = merge_chunks(out_dir, chunk_ids, use_gzip, suffix)
+    if not keep_chunks:
+        shutil.rmtree(os.path.join(out_dir, CHUNKS_DIR), ignore_errors=True)
+        os.remove(checkpoint.path)
+    return {
+        "products": processed,
+        "resumed_products": sum(resumed.values()),
+        "chunks": len(chunk_ids),
+        "resumed_chunks": len(resumed),
+        "workers": workers,
+        "seconds": elapsed,
+        "products_per_sec": processed / elapsed if elapsed else 0.0,
+        "outputs": paths,
+    }
+
+
+def _record(futures: Iterable[Future], checkpoint: Checkpoint) -> int:
+    """Checkpoint chunks as they finish; a failing chunk re-raises after the others are recorded."""
+    n = 0
+    for fut in as_completed(futures):
+        chunk_id, records, _ = fut.result()
+        checkpoint.mark(chunk_id, records)
+        n += records
+    return n
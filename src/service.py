@@ -0,0 +1,418 @@
+"""HTTP content-generation service with request micro-batching (stdlib asyncio only).
+
+Endpoints:
+
+- ``POST /generate`` – body is one raw product as a JSON object (the
+  ``RAW_INPUT`` shape: field name -> string); returns
+  ``{"faq": ..., "product_page": ..., "comparison_page": ...}``. Add
+  ``?outputs=faq,all_questions`` to ask for other keys.
+- ``GET /metrics`` – request/batch counters, p50/p99 latency and throughput as
+  JSON (``?format=prometheus`` for the text format).
+- ``GET /healthz`` – liveness.
+
+Concurrent requests are coalesced by a ``MicroBatcher``: the first waiting
+request opens a batch, which closes after ``max_batch_size`` requests or
+``max_wait`` seconds, and the whole batch goes through one warm
+``Orchestrator.run_batch`` on a dedicated thread, so the event loop keeps
+accepting connections meanwhile. Pages are produced as pre-encoded JSON
+(``as_bytes=True``) and spliced into the response body.
+
+Start it with ``python run.py --serve 8080``; ``benchmarks/loadgen.py`` drives it.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .agents.bus_agents import OutputCollectorAgent
+from .encoding import dumps_compact, encode_str
+from .instrumentation import Histogram
+from .orchestrator import Orchestrator
+
+DEFAULT_OUTPUTS: Tuple[str, ...] = ("faq", "product_page", "comparison_page")
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class ServiceMetrics:
+    """Request latency and throughput for the service.
+
+    Quantiles are exact over the last ``window`` requests; ``latency`` is an
+    all-time ``Histogram`` for Prometheus export.
+    """
+
+    def __init__(self, window: int = 10_000) -> None:
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.max_batch = 0
+        self.latency = Histogram()
+        self.batch_seconds = Histogram()
+        self._recent: Deque[Tuple[float, float]] = deque(maxlen=self.window)  # (finished_at, latency)
+
+    def observe_request(self, latency: float, ok: bool) -> None:
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.latency.observe(latency)
+        self._recent.append((time.monotonic(), latency))
+
+    def observe_batch(self, size: int, seconds: float) -> None:
+        self.batches += 1
+        self.batched_requests += size
+        if size > self.max_batch:
+            self.max_batch = size
+        self.batch_seconds.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        recent = list(self._recent)
+        latencies = sorted(lat for _, lat in recent)
+        span = now - recent[0][0] if recent else 0.0
+        uptime = now - self.started
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "uptime_seconds": uptime,
+            "throughput_rps": self.requests / uptime if uptime else 0.0,
+            "recent_throughput_rps": len(recent) / span if span else 0.0,
+            "latency_seconds": {
+                "window": len(latencies),
+                "p50": _percentile(latencies, 0.50),
+                "p90": _percentile(latencies, 0.90),
+                "p99": _percentile(latencies, 0.99),
+                "max": latencies[-1] if latencies else 0.0,
+                "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            },
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+            "batch_seconds": self.batch_seconds.snapshot(),
+        }
+
+    def to_prometheus(self, prefix: str = "content_service") -> str:
+        latency = self.snapshot()["latency_seconds"]
+        lines = [
+            f"# TYPE {prefix}_requests_total counter",
+            f"{prefix}_requests_total {self.requests}",
+            f"# TYPE {prefix}_errors_total counter",
+            f"{prefix}_errors_total {self.errors}",
+            f"# TYPE {prefix}_batches_total counter",
+            f"{prefix}_batches_total {self.batches}",
+            f"# TYPE {prefix}_batched_requests_total counter",
+            f"{prefix}_batched_requests_total {self.batched_requests}",
+            f"# TYPE {prefix}_latency_seconds summary",
+            *(f'{prefix}_latency_seconds{{quantile="{q}"}} {latency[key]!r}' for q, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"))),
+            f"{prefix}_latency_seconds_sum {self.latency.sum!r}",
+            f"{prefix}_latency_seconds_count {self.latency.count}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 when empty)."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))]
+
+
+class MicroBatcher:
+    """Coalesces concurrent ``submit`` calls into ``Orchestrator.run_batch`` calls.
+
+    The orchestrator is only ever used from one worker thread, which ``stop`` shuts
+    down and the next ``start`` / ``submit`` creates again. If a batch fails, its
+    requests are retried one by one so a bad product fails only its own request.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        max_batch_size: int = 32,
+        max_wait: float = 0.002,
+        metrics: Optional[ServiceMetrics] = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait must not be negative")
+        self.orchestrator = orchestrator
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.metrics = metrics or ServiceMetrics()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._worker: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            # Created here rather than in __init__ so the batcher can be started again after ``stop``
+            if self._worker is None:
+                self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="microbatch")
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._worker is not None:
+            self._worker.shutdown(wait=True)
+            self._worker = None
+
+    async def submit(self, raw: Dict[str, Any], outputs: Tuple[str, ...] = DEFAULT_OUTPUTS) -> Dict[str, Any]:
+        """Render one product; resolves once the batch it joined has run."""
+        self.start()
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((raw, outputs, fut))
+        return await fut
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # Take whatever is already waiting; only sleep for the rest of the window
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._worker, self._process, [(raw, outputs) for raw, outputs, _ in batch])
+            except Exception as exc:
+                results = [exc] * len(batch)
+            self.metrics.observe_batch(len(batch), time.perf_counter() - start)
+            for (_, _, fut), result in zip(batch, results):
+                if fut.done():  # the client went away
+                    continue
+                if isinstance(result, Exception):
+                    fut.set_exception(result)
+                else:
+                    fut.set_result(result)
+
+    def _process(self, items: List[Tuple[Dict[str, Any], Tuple[str, ...]]]) -> List[Any]:
+        orch = self.orchestrator
+        results: List[Any] = [None] * len(items)
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i, (_, outputs) in enumerate(items):
+            groups.setdefault(outputs, []).append(i)
+        for outputs, indexes in groups.items():
+            raws = [items[i][0] for i in indexes]
+            try:
+                for cid, bundle in orch.run_batch(raws, max_in_flight=len(raws), outputs=set(outputs)):
+                    results[indexes[int(cid)]] = bundle
+            except Exception:
+                orch.reset()
+                for i in indexes:
+                    try:
+                        results[i] = orch.run(items[i][0], outputs=set(outputs))
+                    except Exception as exc:
+                        orch.reset()
+                        results[i] = exc
+        return results
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _bundle_body(bundle: Dict[str, Any], outputs: Tuple[str, ...]) -> bytes:
+    """JSON object of the requested pages; pre-encoded pages are spliced in as-is."""
+    parts = []
+    for key in outputs:
+        page = bundle[key]
+        parts.append(encode_str(key) + b":" + (page if isinstance(page, bytes) else dumps_compact(page)))
+    return b"{" + b",".join(parts) + b"}"
+
+
+def _parse_outputs(query: str) -> Tuple[str, ...]:
+    values = parse_qs(query).get("outputs")
+    if not values:
+        return DEFAULT_OUTPUTS
+    wanted = [k for v in values for k in v.split(",") if k]
+    unknown = sorted(set(wanted).difference(OutputCollectorAgent.REQUIRED))
+    if unknown or not wanted:
+        raise _HTTPError(400, f"outputs must be a subset of {list(OutputCollectorAgent.REQUIRED)}")
+    return tuple(k for k in OutputCollectorAgent.REQUIRED if k in wanted)
+
+
+def _parse_product(body: bytes) -> Dict[str, str]:
+    try:
+        raw = json.loads(body)
+    except ValueError as e:
+        raise _HTTPError(400, f"invalid JSON: {e}") from None
+    if not isinstance(raw, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in raw.items()):
+        raise _HTTPError(400, "body must be a JSON object of string fields")
+    return raw
+
+
+class ContentService:
+    """Minimal HTTP/1.1 server (keep-alive, Content-Length bodies) around a ``MicroBatcher``."""
+
+    def __init__(
+        self,
+        orchestrator: Optional[Orchestrator] = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_batch_size: int = 32,
+        max_wait: float = 0.002,
+        max_body: int = 1 << 20,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.max_body = max_body
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(orchestrator or Orchestrator(as_bytes=True), max_batch_size, max_wait, self.metrics)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 asks the OS for a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self) -> "ContentService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = await self._respond(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request_line: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Read the rest of one request, write its response; returns whether to keep the connection."""
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self._write(writer, 400, b'{"error":"malformed request line"}', False)
+            return False
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        url = urlsplit(target)
+
+        start = time.perf_counter()
+        content_type = "application/json"
+        try:
+            if url.path == "/generate":
+                if method != "POST":
+                    raise _HTTPError(405, "use POST")
+                if "content-length" not in headers:
+                    raise _HTTPError(411, "Content-Length required")
+                try:
+                    length = int(headers["content-length"])
+                except ValueError:
+                    keep_alive = False
+                    raise _HTTPError(400, "invalid Content-Length") from None
+                if length > self.max_body:
+                    keep_alive = False  # the unread body would be parsed as the next request
+                    raise _HTTPError(413, f"body larger than {self.max_body} bytes")
+                body = await reader.readexactly(length)
+                outputs = _parse_outputs(url.query)
+                raw = _parse_product(body)
+                try:
+                    bundle = await self.batcher.submit(raw, outputs)
+                except Exception as e:
+                    raise _HTTPError(500, f"{type(e).__name__}: {e}") from None
+                status, payload = 200, _bundle_body(bundle, outputs)
+                self.metrics.observe_request(time.perf_counter() - start, True)
+            elif url.path == "/metrics" and method == "GET":
+                if parse_qs(url.query).get("format") == ["prometheus"]:
+                    content_type = "text/plain; version=0.0.4"
+                    status, payload = 200, self.metrics.to_prometheus().encode("utf-8")
+                else:
+                    status, payload = 200, dumps_compact(self.metrics.snapshot())
+            elif url.path == "/healthz" and method == "GET":
+                status, payload = 200, b'{"status":"ok"}'
+            else:
+                raise _HTTPError(404, f"no route for {method} {url.path}")
+        except _HTTPError as e:
+            if url.path == "/generate":
+                self.metrics.observe_request(time.perf_counter() - start, False)
+            status, payload = e.status, dumps_compact({"error": str(e)})
+        self._write(writer, status, payload, keep_alive, content_type)
+        return keep_alive
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, body: bytes, keep_alive: bool, content_type: str = "application/json") -> None:
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, template_mode: str = "strict", **kwargs: Any) -> None:
+    """Run a ``ContentService`` until cancelled (used by ``run.py --serve``)."""
+    service = ContentService(Orchestrator(template_mode=template_mode, as_bytes=True), host, port, **kwargs)
+    await service.start()
+    print(f"Serving on http://{service.host}:{service.port} (POST /generate, GET /metrics)", flush=True)
+    await service.serve_forever()
@@ -0,0 +1,203 @@
+"""Single-producer/single-consumer record ring buffer in ``multiprocessing.shared_memory``.
+
+One process appends length-prefixed records and another reads them in order,
+with no pipe, feeder thread or per-record system call in between. The reader
+can decode a record straight out of shared memory (``consume``) before the
+space is handed back to the writer.
+
+Layout: a 64-byte header holding the writer's and reader's byte counters
+(``head`` and ``tail``, both monotonically increasing u64), followed by
+``capacity`` data bytes. A record is ``u32 length`` + data. When a record does
+not fit before the end of the buffer, the writer pads to the end (with a wrap
+marker if there is room for one) and continues at offset 0.
+
+Each counter has a single writer and is updated only after the bytes it
+publishes are in place. The counters are 8-byte aligned ``ctypes.c_uint64``
+cells, so each is read and written with one machine load/store (``struct``
+would write them byte by byte and the other side could see a torn value).
+That ordering is sufficient on x86-64 (total store order); it is what CPython
+gives us without atomics, so creating a ring on any other machine raises
+``RuntimeError`` (see ``require_tso``).
+"""
+import ctypes
+import platform
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_U32 = struct.Struct("<I")
+HEADER = 64
+_HEAD, _TAIL = 0, 8
+_WRAP = 0xFFFFFFFF
+
+
+TSO_MACHINES = ("x86_64", "amd64")
+
+
+def require_tso() -> None:
+    """Raise ``RuntimeError`` unless this machine orders stores the way the ring needs (x86-64)."""
+    machine = platform.machine()
+    if machine.lower() not in TSO_MACHINES:
+        raise RuntimeError(f"ShmRing needs x86-64 store ordering; {machine or 'this machine'} is not supported")
+
+
+def _backoff(attempt: int) -> None:
+    """Spin briefly, then yield, then sleep up to 1ms while waiting on the other side."""
+    if attempt < 64:
+        return
+    time.sleep(0 if attempt < 256 else min(0.001, 1e-5 * (attempt - 255)))
+
+
+class ShmRing:
+    """SPSC byte-record queue over a shared memory segment.
+
+    Create it in the parent (``ShmRing(capacity)``) and hand it to the other
+    process (it pickles as its segment name); exactly one process may write and
+    one may read. The creator should ``unlink()`` it once both sides are done.
+    """
+
+    def __init__(self, capacity: int = 1 << 22, name: Optional[str] = None) -> None:
+        require_tso()
+        if name is None:
+            if capacity < 64:
+                raise ValueError("capacity must be at least 64 bytes")
+            self._shm = shared_memory.SharedMemory(create=True, size=HEADER + capacity)
+            self._shm.buf[:HEADER] = bytes(HEADER)
+            self.owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+            _untrack(self._shm)
+        self.name = self._shm.name
+        self.capacity = capacity
+        self._buf = self._shm.buf
+        self._data = self._buf[HEADER:HEADER + capacity]
+        self._head_cell = ctypes.c_uint64.from_buffer(self._buf, _HEAD)
+        self._tail_cell = ctypes.c_uint64.from_buffer(self._buf, _TAIL)
+        self._head = self._head_cell.value
+        self._tail = self._tail_cell.value
+
+    def __reduce__(self):
+        return (ShmRing, (self.capacity, self.name))
+
+    # -- writer side ---------------------------------------------------------
+    def try_put(self, data: Any) -> bool:
+        """Append one record if it fits right now; returns False when the ring is full."""
+        n = len(data)
+        need = 4 + n
+        cap = self.capacity
+        if need > cap:
+            raise ValueError(f"record of {n} bytes does not fit a {cap}-byte ring")
+        head = self._head
+        pos = head % cap
+        pad = cap - pos if cap - pos < need else 0
+        tail = self._tail_cell.value
+        if head - tail + pad + need > cap:
+            return False
+        if pad:
+            if pad >= 4:
+                _U32.pack_into(self._data, pos, _WRAP)
+            head += pad
+            pos = 0
+        _U32.pack_into(self._data, pos, n)
+        self._data[pos + 4:pos + need] = data
+        self._head = head + need
+        self._head_cell.value = self._head
+        return True
+
+    def put(self, data: Any, timeout: Optional[float] = None, idle: Optional[Callable[[], None]] = None) -> None:
+        """Append one record, waiting for space; ``idle`` runs while waiting (e.g. to drain replies)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        attempt = 0
+        while not self.try_put(data):
+            if idle is not None:
+                idle()
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("ring buffer full")
+            _backoff(attempt)
+            attempt += 1
+
+    # -- reader side ---------------------------------------------------------
+    def _peek(self) -> Optional[int]:
+        """Offset of the next record's length prefix, or None when empty (skips wrap padding)."""
+        tail = self._tail
+        if tail == self._head_cell.value:
+            return None
+        cap = self.capacity
+        pos = tail % cap
+        if cap - pos < 4 or _U32.unpack_from(self._data, pos)[0] == _WRAP:
+            self._tail = tail + cap - pos
+            pos = 0
+        return pos
+
+    def _take(self, pos: int, fn: Callable[[memoryview], T]) -> T:
+        (n,) = _U32.unpack_from(self._data, pos)
+        view = self._data[pos + 4:pos + 4 + n]
+        try:
+            return fn(view)
+        finally:
+            view.release()
+            self._tail += 4 + n
+            self._tail_cell.value = self._tail
+
+    def try_consume(self, fn: Callable[[memoryview], T]) -> Optional[T]:
+        """Pass the next record to ``fn`` as a view into shared memory and return its result.
+
+        The view is only valid inside ``fn``; the space is released afterwards.
+        Returns None when the ring is empty.
+        """
+        pos = self._peek()
+        return None if pos is None else self._take(pos, fn)
+
+    def consume(
+        self, fn: Callable[[memoryview], T], timeout: Optional[float] = None, idle: Optional[Callable[[], None]] = None
+    ) -> T:
+        """Like ``try_consume`` but waits for a record."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        attempt = 0
+        while True:
+            pos = self._peek()
+            if pos is not None:
+                return self._take(pos, fn)
+            if idle is not None:
+                idle()
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("ring buffer empty")
+            _backoff(attempt)
+            attempt += 1
+
+    def get(self, timeout: Optional[float] = None) -> bytes:
+        """Next record as a bytes copy, waiting for one."""
+        return self.consume(bytes, timeout)
+
+    def __len__(self) -> int:
+        """Bytes currently queued (including framing)."""
+        return self._head_cell.value - self._tail_cell.value
+
+    # -- lifecycle -----------------------------------------------------------
+    def close(self) -> None:
+        if self._buf is None:
+            return
+        self._data.release()
+        # The counter cells export the buffer; drop them or the segment cannot close
+        del self._head_cell, self._tail_cell
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    # Attaching registers the segment with this process's resource tracker, which
+    # would unlink it when the process exits; only the creator should do that.
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
@@ -0,0 +1,172 @@
+import gzip
+import json
+import os
+from typing import Any, Dict, IO, Iterable, List, Optional, Sequence, Tuple
+
+from .encoding import SEPARATORS, encode_opt_str
+
+PAGE_KEYS = ("faq", "product_page", "comparison_page", "all_questions")
+
+
+class _Shard:
+    """One append-only output file written to ``<final>.part`` and renamed on close."""
+
+    def __init__(self, path: str, use_gzip: bool, compresslevel: int) -> None:
+        self.path = path
+        self.tmp_path = path + ".part"
+        if use_gzip:
+            self.fh: IO[bytes] = gzip.open(self.tmp_path, "wb", compresslevel=compresslevel)
+        else:
+            self.fh = open(self.tmp_path, "wb")
+        self.records = 0
+
+    def commit(self) -> None:
+        self.fh.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self) -> None:
+        self.fh.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class JsonlShardSink:
+    """Batched writer that appends each page type to its own JSONL shard.
+
+    - One line per product: ``{"id": <correlation id>, "data": <page>}``.
+    - ``compact=True`` drops the spaces after separators; output is never indented.
+      Pre-encoded (bytes) pages are spliced in as-is and require compact mode.
+    - Encoded lines are buffered per page type and written once ``flush_bytes`` is
+      reached, so the number of write calls does not grow with the product count.
+    - ``gzip=True`` writes ``.jsonl.gz`` shards; ``shard_records`` rotates to a new
+      numbered shard after that many records (``None`` keeps one file per page).
+    - Files are written as ``*.part`` and atomically renamed by ``close()``;
+      ``abort()`` (or an exception inside ``with``) removes them instead.
+    - Every written bundle must hold all of ``pages``; for ``run_batch(outputs=...)``
+      pass the same keys as ``pages=``.
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        pages: Sequence[str] = PAGE_KEYS,
+        compact: bool = True,
+        flush_bytes: int = 1 << 20,
+        gzip: bool = False,
+        compresslevel: int = 6,
+        shard_records: Optional[int] = None,
+    ) -> None:
+        if shard_records is not None and shard_records < 1:
+            raise ValueError("shard_records must be at least 1")
+        self.out_dir = out_dir
+        self.pages = tuple(pages)
+        self.separators = SEPARATORS if compact else (", ", ": ")
+        self.flush_bytes = flush_bytes
+        self.gzip = gzip
+        self.compresslevel = compresslevel
+        self.shard_records = shard_records
+        self.records = 0
+        self._buffers: Dict[str, List[bytes]] = {p: [] for p in self.pages}
+        self._buffered: Dict[str, int] = {p: 0 for p in self.pages}
+        self._shards: Dict[str, _Shard] = {}
+        self._shard_index: Dict[str, int] = {p: 0 for p in self.pages}
+        self._committed: List[str] = []
+        self._closed = False
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _shard_path(self, page: str) -> str:
+        ext = ".jsonl.gz" if self.gzip else ".jsonl"
+        if self.shard_records is None:
+            return os.path.join(self.out_dir, page + ext)
+        return os.path.join(self.out_dir, f"{page}-{self._shard_index[page]:05d}{ext}")
+
+    def _shard(self, page: str) -> _Shard:
+        shard = self._shards.get(page)
+        if shard is None:
+            shard = self._shards[page] = _Shard(self._shard_path(page), self.gzip, self.compresslevel)
+        return shard
+
+    def _flush_page(self, page: str) -> None:
+        buf = self._buffers[page]
+        if buf:
+            self._shard(page).fh.write(b"".join(buf))
+            buf.clear()
+            self._buffered[page] = 0
+
+    def _encode(self, correlation_id: Optional[str], data: Any) -> bytes:
+        if isinstance(data, bytes):
+            # Pre-encoded page (Orchestrator(as_bytes=True)): splice it in untouched
+            if self.separators != SEPARATORS:
+                raise ValueError("pre-encoded pages can only be written by a compact sink")
+            return b'{"id":' + encode_opt_str(correlation_id) + b',"data":' + data + b"}\n"
+        line = json.dumps({"id": correlation_id, "data": data}, ensure_ascii=False, separators=self.separators)
+        return line.encode("utf-8") + b"\n"
+
+    def write(self, correlation_id: Optional[str], outputs: Dict[str, Any]) -> None:
+        if self._closed:
+            raise ValueError("write to a closed sink")
+        missing = [page for page in self.pages if page not in outputs]
+        if missing:
+            raise ValueError(
+                f"outputs for {correlation_id!r} lack page(s) {missing}; pass pages= matching the rendered outputs"
+            )
+        for page in self.pages:
+            line = self._encode(correlation_id, outputs[page])
+            self._buffers[page].append(line)
+            self._buffered[page] += len(line)
+            if self.shard_records is not None:
+                shard = self._shard(page)
+                shard.records += 1
+                if shard.records >= self.shard_records:
+                    self._flush_page(page)
+                    shard.commit()
+                    self._committed.append(shard.path)
+                    del self._shards[page]
+                    self._shard_index[page] += 1
+                    continue
+            if self._buffered[page] >= self.flush_bytes:
+                self._flush_page(page)
+        self.records += 1
+
+    def write_all(self, results: Iterable[Tuple[Optional[str], Dict[str, Any]]]) -> int:
+        """Write ``(correlation_id, outputs)`` pairs, e.g. straight from ``run_batch``."""
+        n = 0
+        for correlation_id, outputs in results:
+            self.write(correlation_id, outputs)
+            n += 1
+        return n
+
+    def flush(self) -> None:
+        for page in self.pages:
+            self._flush_page(page)
+            shard = self._shards.get(page)
+            if shard is not None:
+                shard.fh.flush()
+
+    def close(self) -> List[str]:
+        """Flush everything, atomically publish the shards and return their paths."""
+        if not self._closed:
+            for page in self.pages:
+                self._flush_page(page)
+                shard = self._shards.pop(page, None)
+                if shard is not None:
+                    shard.commit()
+                    self._committed.append(shard.path)
+            self._closed = True
+        return list(self._committed)
+
+    def abort(self) -> None:
+        """Drop buffered data and remove unfinished shards (already rotated shards are kept)."""
+        for shard in self._shards.values():
+            shard.discard()
+        self._shards.clear()
+        self._closed = True
+
+    def __enter__(self) -> "JsonlShardSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
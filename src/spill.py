@@ -0,0 +1,169 @@
+"""FIFO message queue with a memory ceiling that spills to an on-disk segment log.
+
+``SpillQueue`` keeps up to ``max_in_memory`` messages in a deque. Once that is
+full, newer messages collect in a write buffer that is pickled to disk a block
+(``block_size`` messages) at a time; blocks are appended to segment files of
+about ``segment_bytes`` each. When the in-memory part runs dry the oldest block
+is read back, so messages always come out in publish order and at most
+``max_in_memory + 2 * block_size`` of them are resident. Consumed segments are
+deleted, and the directory is removed when the queue is closed or collected.
+
+Used by ``EventBus(max_queued=...)``; payloads must be picklable.
+"""
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import weakref
+from collections import deque
+from typing import Any, BinaryIO, Deque, Dict, List, Optional
+
+_LEN = struct.Struct("<I")
+
+
+class SpillQueue:
+    """Deque-like queue (``append``/``popleft``/``len``/``clear``) bounded in memory."""
+
+    def __init__(
+        self,
+        max_in_memory: int,
+        spill_dir: Optional[str] = None,
+        block_size: int = 256,
+        segment_bytes: int = 64 << 20,
+    ) -> None:
+        if max_in_memory < 1 or block_size < 1:
+            raise ValueError("max_in_memory and block_size must be at least 1")
+        self.max_in_memory = max_in_memory
+        self.block_size = block_size
+        self.segment_bytes = segment_bytes
+        self._spill_dir = spill_dir
+        self._dir: Optional[str] = None
+        self._finalizer: Optional[weakref.finalize] = None
+        self._head: Deque[Any] = deque()  # oldest messages, in memory
+        self._tail: List[Any] = []  # newest messages, waiting to be written as a block
+        self._on_disk = 0  # messages in blocks between head and tail
+        self._segments: Deque[str] = deque()  # oldest first; the last one is being written
+        self._writer: Optional[BinaryIO] = None
+        self._reader: Optional[BinaryIO] = None
+        self._seq = 0
+        self.spilled = 0
+        self.restored = 0
+        self.blocks_written = 0
+        self.bytes_written = 0
+        self.peak_resident = 0
+
+    # -- deque interface ------------------------------------------------------
+    def append(self, msg: Any) -> None:
+        head = self._head
+        if not self._on_disk and not self._tail and len(head) < self.max_in_memory:
+            head.append(msg)
+            if len(head) > self.peak_resident:
+                self.peak_resident = len(head)
+            return
+        tail = self._tail
+        tail.append(msg)
+        if len(tail) >= self.block_size:
+            self._write_block()
+        elif len(head) + len(tail) > self.peak_resident:
+            self.peak_resident = len(head) + len(tail)
+
+    def popleft(self) -> Any:
+        if not self._head:
+            self._refill()
+        return self._head.popleft()
+
+    def __len__(self) -> int:
+        return len(self._head) + self._on_disk + len(self._tail)
+
+    def clear(self) -> None:
+        self._head.clear()
+        self._tail.clear()
+        self._drop_segments()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "spilled": self.spilled,
+            "restored": self.restored,
+            "on_disk": self._on_disk,
+            "blocks_written": self.blocks_written,
+            "bytes_written": self.bytes_written,
+            "peak_resident": self.peak_resident,
+        }
+
+    def close(self) -> None:
+        """Drop everything queued and remove the spill directory."""
+        self.clear()
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._dir = None
+
+    # -- segment log ----------------------------------------------------------
+    def _write_block(self) -> None:
+        block, self._tail = self._tail, []
+        data = pickle.dumps(block, pickle.HIGHEST_PROTOCOL)
+        writer = self._writer
+        if writer is None or writer.tell() >= self.segment_bytes:
+            writer = self._new_segment()
+        writer.write(_LEN.pack(len(data)))
+        writer.write(data)
+        # The reader may be on this segment; it must see whole blocks
+        writer.flush()
+        self._on_disk += len(block)
+        self.spilled += len(block)
+        self.blocks_written += 1
+        self.bytes_written += 4 + len(data)
+
+    def _new_segment(self) -> BinaryIO:
+        if self._dir is None:
+            self._dir = tempfile.mkdtemp(prefix="eventbus-spill-", dir=self._spill_dir)
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._dir, True)
+        if self._writer is not None:
+            self._writer.close()
+        self._seq += 1
+        path = os.path.join(self._dir, f"{self._seq:08d}.seg")
+        self._segments.append(path)
+        self._writer = open(path, "wb")
+        return self._writer
+
+    def _refill(self) -> None:
+        if self._on_disk:
+            self._head.extend(self._read_block())
+        elif self._tail:
+            # Everything older has been consumed, so the write buffer is next in line
+            self._head.extend(self._tail)
+            self._tail = []
+        if len(self._head) + len(self._tail) > self.peak_resident:
+            self.peak_resident = len(self._head) + len(self._tail)
+        if not self._on_disk and not self._tail:
+            self._drop_segments()
+
+    def _read_block(self) -> List[Any]:
+        while True:
+            if self._reader is None:
+                self._reader = open(self._segments[0], "rb")
+            header = self._reader.read(_LEN.size)
+            if header:
+                (n,) = _LEN.unpack(header)
+                block = pickle.loads(self._reader.read(n))
+                self._on_disk -= len(block)
+                self.restored += len(block)
+                return block
+            # Finished with this segment (the writer has moved on, or there would be data)
+            self._reader.close()
+            self._reader = None
+            os.remove(self._segments.popleft())
+
+    def _drop_segments(self) -> None:
+        for fh in (self._reader, self._writer):
+            if fh is not None and not fh.closed:
+                fh.close()
+        self._reader = self._writer = None
+        for path in self._segments:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._segments.clear()
+        self._on_disk = 0
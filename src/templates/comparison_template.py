@@ -1,11 +1,39 @@
 from typing import Dict, Any
 from ..models import ComparisonPage, Product
+from ..encoding import dumps_compact, encode_opt_str, encode_str, encode_str_list
+from .schema import check_mode, compile_schema
+
+_OPTIONAL_STRING = {"type": ["string", "null"]}
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+_PRODUCT = {
+    "type": "object",
+    "required": ["name", "concentration", "skin_types", "ingredients", "benefits", "usage", "side_effects", "price"],
+    "properties": {
+        "name": {"type": "string"},
+        "concentration": _OPTIONAL_STRING,
+        "skin_types": _STRINGS,
+        "ingredients": _STRINGS,
+        "benefits": _STRINGS,
+        "usage": _OPTIONAL_STRING,
+        "side_effects": _OPTIONAL_STRING,
+        "price": _OPTIONAL_STRING,
+    },
+}
 
 class ComparisonTemplate:
     schema = {
         "type": "object",
         "required": ["product_a", "product_b", "comparisons"],
+        "properties": {
+            "product_a": _PRODUCT,
+            "product_b": _PRODUCT,
+            "comparisons": {"type": "object"},
+        },
     }
+    _check = staticmethod(compile_schema(schema, "ComparisonTemplate"))
+
+    def __init__(self, mode: str = "strict") -> None:
+        self.mode = check_mode(mode)
 
     def _product_to_dict(self, p: Product) -> Dict[str, Any]:
         return {
@@ -19,12 +47,20 @@ class ComparisonTemplate:
             "price": p.price,
         }
 
+    def _product_to_bytes(self, p: Product) -> bytes:
+        return (
+            b'{"name":' + encode_str(p.name)
+            + b',"concentration":' + encode_opt_str(p.concentration)
+            + b',"skin_types":' + encode_str_list(p.skin_types)
+            + b',"ingredients":' + encode_str_list(p.key_ingredients)
+            + b',"benefits":' + encode_str_list(p.benefits)
+            + b',"usage":' + encode_opt_str(p.how_to_use)
+            + b',"side_effects":' + encode_opt_str(p.side_effects)
+            + b',"price":' + encode_opt_str(p.price) + b"}"
+        )
+
     def _validate(self, data: Dict[str, Any]) -> None:
-        for k in ("product_a", "product_b", "comparisons"):
-            if k not in data:
-                raise ValueError(f"ComparisonTemplate missing required field: {k}")
-        if not isinstance(data["comparisons"], dict):
-            raise ValueError("comparisons must be an object")
+        self._check(data)
 
     def render(self, page: ComparisonPage) -> Dict[str, Any]:
         data = {
@@ -32,5 +68,16 @@ class ComparisonTemplate:
             "product_b": self._product_to_dict(page.product_b),
             "comparisons": page.comparisons,
         }
-        self._validate(data)
+        if self.mode == "strict":
+            self._validate(data)
         return data
+
+    def render_bytes(self, page: ComparisonPage) -> bytes:
+        """Bytes counterpart of ``render`` (see ``FAQTemplate.render_bytes``)."""
+        if self.mode == "strict":
+            return dumps_compact(self.render(page))
+        return (
+            b'{"product_a":' + self._product_to_bytes(page.product_a)
+            + b',"product_b":' + self._product_to_bytes(page.product_b)
+            + b',"comparisons":' + dumps_compact(page.comparisons) + b"}"
+        )
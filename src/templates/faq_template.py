@@ -1,5 +1,7 @@
 from typing import List, Dict, Any
 from ..models import FAQPage, Question
+from ..encoding import dumps_compact, encode_str
+from .schema import check_mode, compile_schema
 
 class FAQTemplate:
     schema = {
@@ -22,12 +24,13 @@ class FAQTemplate:
             },
         },
     }
+    _check = staticmethod(compile_schema(schema, "FAQTemplate"))
+
+    def __init__(self, mode: str = "strict") -> None:
+        self.mode = check_mode(mode)
 
     def _validate(self, data: Dict[str, Any]) -> None:
-        if "product_name" not in data or "faqs" not in data:
-            raise ValueError("FAQTemplate missing required fields")
-        if not isinstance(data["faqs"], list) or len(data["faqs"]) < 5:
-            raise ValueError("FAQTemplate requires at least 5 FAQ items")
+        self._check(data)
 
     def render(self, page: FAQPage) -> Dict[str, Any]:
         data = {
@@ -37,5 +40,21 @@ class FAQTemplate:
                 for q in page.faqs
             ],
         }
-        self._validate(data)
+        if self.mode == "strict":
+            self._validate(data)
         return data
+
+    def render_bytes(self, page: FAQPage) -> bytes:
+        """Compact UTF-8 JSON of ``render(page)``, assembled from pre-encoded fragments.
+
+        Strict mode encodes the validated dict; trusted mode never builds it.
+        """
+        if self.mode == "strict":
+            return dumps_compact(self.render(page))
+        items = b",".join(
+            b'{"category":' + encode_str(q.category)
+            + b',"question":' + encode_str(q.text)
+            + b',"answer":' + encode_str(q.answer or "Not specified.") + b"}"
+            for q in page.faqs
+        )
+        return b'{"product_name":' + encode_str(page.product_name) + b',"faqs":[' + items + b"]}"
@@ -1,18 +1,34 @@
-from typing import Dict, Any
-from ..models import Product, ProductPage
+from typing import Dict, Any, List, Sequence
+from ..models import FrozenProductPage, Product, ProductFrame, ProductPage
 from ..blocks.transform import join_list, fmt_price, normalize_punctuation
+from ..encoding import dumps_compact, encode_str, encode_str_list
+from .schema import check_mode, compile_schema
+
+_STRINGS = {"type": "array", "items": {"type": "string"}}
 
 class ProductTemplate:
     schema = {
         "type": "object",
         "required": ["name", "concentration", "skin_types", "ingredients", "benefits", "usage", "side_effects", "price"],
+        "properties": {
+            "name": {"type": "string"},
+            "concentration": {"type": "string"},
+            "skin_types": _STRINGS,
+            "ingredients": _STRINGS,
+            "benefits": _STRINGS,
+            "usage": {"type": "string"},
+            "side_effects": {"type": "string"},
+            "price": {"type": "string"},
+            "sections": {"type": "object"},
+        },
     }
+    _check = staticmethod(compile_schema(schema, "ProductTemplate"))
+
+    def __init__(self, mode: str = "strict") -> None:
+        self.mode = check_mode(mode)
 
     def _validate(self, data: Dict[str, Any]) -> None:
-        required = ["name", "concentration", "skin_types", "ingredients", "benefits", "usage", "side_effects", "price"]
-        for k in required:
-            if k not in data:
-                raise ValueError(f"ProductTemplate missing required field: {k}")
+        self._check(data)
 
     def render(self, page: ProductPage) -> Dict[str, Any]:
         p: Product = page.product
@@ -27,5 +43,47 @@ class ProductTemplate:
             "price": fmt_price(p.price),
             "sections": page.sections,
         }
-        self._validate(data)
+        if self.mode == "strict":
+            self._validate(data)
         return data
+
+    def render_bytes(self, page: ProductPage) -> bytes:
+        """Bytes counterpart of ``render`` (see ``FAQTemplate.render_bytes``)."""
+        if self.mode == "strict":
+            return dumps_compact(self.render(page))
+        p: Product = page.product
+        return (
+            b'{"name":' + encode_str(p.name)
+            + b',"concentration":' + encode_str(p.concentration or "Not specified")
+            + b',"skin_types":' + encode_str_list(p.skin_types)
+            + b',"ingredients":' + encode_str_list(p.key_ingredients)
+            + b',"benefits":' + encode_str_list(p.benefits)
+            + b',"usage":' + encode_str(normalize_punctuation(p.how_to_use) or "Not specified")
+            + b',"side_effects":' + encode_str(normalize_punctuation(p.side_effects) or "Not specified")
+            + b',"price":' + encode_str(fmt_price(p.price))
+            + b',"sections":' + dumps_compact(page.sections) + b"}"
+        )
+
+    def render_frame(self, frame: ProductFrame, pages: Sequence[FrozenProductPage]) -> List[Dict[str, Any]]:
+        """``render`` for every row of ``frame`` (``pages`` from ``ProductPageAgent.run_frame``).
+
+        Reads the frame's pre-normalized text columns instead of normalizing per page.
+        """
+        out = []
+        for page, usage, side_effects, price in zip(pages, frame.how_to_use_text, frame.side_effects_text, frame.price_text):
+            p = page.product
+            data = {
+                "name": p.name,
+                "concentration": p.concentration or "Not specified",
+                "skin_types": list(p.skin_types),
+                "ingredients": list(p.key_ingredients),
+                "benefits": list(p.benefits),
+                "usage": usage or "Not specified",
+                "side_effects": side_effects or "Not specified",
+                "price": price or "Not specified",
+                "sections": page.sections,
+            }
+            if self.mode == "strict":
+                self._validate(data)
+            out.append(data)
+        return out
@@ -0,0 +1,104 @@
+from typing import Any, Callable, Dict, List
+
+# JSON-schema type name -> isinstance() check expression over variable ``{v}``
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, (list, tuple))",
+    "string": "isinstance({v}, str)",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+}
+
+# "strict" validates every render against the full schema; "trusted" skips validation
+# for pages built by our own agents, which already satisfy it.
+TEMPLATE_MODES = ("strict", "trusted")
+
+SUPPORTED_KEYWORDS = {"type", "required", "properties", "items", "minItems", "maxItems", "enum"}
+
+
+class _Codegen:
+    def __init__(self, owner: str) -> None:
+        self.owner = owner
+        self.lines: List[str] = []
+        self.consts: Dict[str, Any] = {}
+        self._n = 0
+
+    def var(self) -> str:
+        self._n += 1
+        return f"v{self._n}"
+
+    def emit(self, depth: int, line: str) -> None:
+        self.lines.append("    " * depth + line)
+
+    def fail(self, depth: int, message: str) -> None:
+        self.emit(depth, f"raise ValueError({message!r})")
+
+    def node(self, schema: Dict[str, Any], v: str, path: str, depth: int) -> None:
+        unknown = set(schema) - SUPPORTED_KEYWORDS
+        if unknown:
+            raise ValueError(f"{self.owner} schema uses unsupported keywords at {path}: {sorted(unknown)}")
+        types = schema.get("type")
+        if types is not None:
+            names = [types] if isinstance(types, str) else list(types)
+            check = " or ".join(_TYPE_CHECKS[t].format(v=v) for t in names)
+            self.emit(depth, f"if not ({check}):")
+            self.fail(depth + 1, f"{self.owner}: {path} must be {' or '.join(names)}")
+        if "enum" in schema:
+            const = f"enum{len(self.consts)}"
+            self.consts[const] = tuple(schema["enum"])
+            self.emit(depth, f"if {v} not in {const}:")
+            self.fail(depth + 1, f"{self.owner}: {path} must be one of {list(schema['enum'])}")
+        if "required" in schema or "properties" in schema:
+            self.emit(depth, f"if isinstance({v}, dict):")
+            for key in schema.get("required", ()):
+                self.emit(depth + 1, f"if {key!r} not in {v}:")
+                self.fail(depth + 2, f"{self.owner} missing required field: {self._join(path, key)}")
+            for key, sub in schema.get("properties", {}).items():
+                child = self.var()
+                self.emit(depth + 1, f"if {key!r} in {v}:")
+                self.emit(depth + 2, f"{child} = {v}[{key!r}]")
+                self.node(sub, child, self._join(path, key), depth + 2)
+            self.emit(depth + 1, "pass")
+        if any(k in schema for k in ("items", "minItems", "maxItems")):
+            self.emit(depth, f"if isinstance({v}, (list, tuple)):")
+            if "minItems" in schema:
+                self.emit(depth + 1, f"if len({v}) < {int(schema['minItems'])}:")
+                self.fail(depth + 2, f"{self.owner} requires at least {schema['minItems']} items in {path}")
+            if "maxItems" in schema:
+                self.emit(depth + 1, f"if len({v}) > {int(schema['maxItems'])}:")
+                self.fail(depth + 2, f"{self.owner} allows at most {schema['maxItems']} items in {path}")
+            if "items" in schema:
+                item = self.var()
+                self.emit(depth + 1, f"for {item} in {v}:")
+                self.node(schema["items"], item, path + "[]", depth + 2)
+                self.emit(depth + 2, "pass")
+            self.emit(depth + 1, "pass")
+
+    @staticmethod
+    def _join(path: str, key: str) -> str:
+        return key if path == "$" else f"{path}.{key}"
+
+
+def compile_schema(schema: Dict[str, Any], owner: str) -> Callable[[Any], None]:
+    """Compile a JSON-schema subset into a specialised validator function.
+
+    Supports ``type`` (one name or a list), ``required``, ``properties``, ``items``,
+    ``minItems``, ``maxItems`` and ``enum``; anything else is rejected at compile
+    time. The generated function raises ``ValueError`` naming ``owner`` and the
+    offending path, and returns None for valid data.
+    """
+    gen = _Codegen(owner)
+    gen.emit(0, "def validate(v0):")
+    gen.node(schema, "v0", "$", 1)
+    gen.emit(1, "return None")
+    namespace: Dict[str, Any] = dict(gen.consts)
+    exec(compile("\n".join(gen.lines), f"<schema:{owner}>", "exec"), namespace)
+    return namespace["validate"]
+
+
+def check_mode(mode: str) -> str:
+    if mode not in TEMPLATE_MODES:
+        raise ValueError(f"Unknown template mode: {mode} (expected one of {TEMPLATE_MODES})")
+    return mode
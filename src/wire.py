@@ -0,0 +1,302 @@
+"""Compact binary wire format for the pipeline's messages.
+
+Each message type that crosses a process boundary has a fixed field layout (see
+``_CODECS``), so a ``Product`` travels as its eight fields in order rather than as
+a pickled class reference plus attribute dict. Strings that repeat across
+products (message types, list items, question categories and intents, section
+and row names) are interned per stream: the first occurrence carries the text
+and later ones a 2-byte id. The ``WireEncoder`` / ``WireDecoder`` pair of one
+stream must therefore see the same records in the same order, which an ordered
+channel such as ``src.shm_ring.ShmRing`` guarantees; records that are encoded
+but never sent are undone with ``WireEncoder.mark`` / ``rollback``.
+
+Rendered pages travel as compact JSON (dicts) or as-is (pre-encoded bytes).
+Payloads that do not match the expected layout fall back to pickle, so any
+message can be sent.
+
+Record layout (little-endian):
+
+    u8 kind (0 = wire, 1 = pickle) | istr type | str? correlation_id | payload
+"""
+import json
+import pickle
+import struct
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .agent_core import Message
+from .encoding import dumps_compact
+from .models import ComparisonPage, FAQPage, Product, ProductPage, Question
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+
+# String tags
+_NONE, _LITERAL, _NEW, _REF = 0, 1, 2, 3
+# Page payload tags
+_JSON, _BYTES = 0, 1
+
+KIND_WIRE, KIND_PICKLE = 0, 1
+MAX_INTERNED = 0xFFFF
+
+
+class _Unsupported(Exception):
+    """Payload does not fit the wire layout for its type; the record falls back to pickle."""
+
+
+class WireEncoder:
+    """Encodes messages for one direction of a stream (keeps that stream's string table)."""
+
+    def __init__(self) -> None:
+        self._refs: Dict[str, bytes] = {}  # interned string -> its encoded reference
+        self._order: List[str] = []  # interned strings by id
+        self._out = bytearray()
+
+    # -- primitives -------------------------------------------------------
+    def _str(self, s: Optional[str]) -> None:
+        out = self._out
+        if s is None:
+            out.append(_NONE)
+            return
+        if type(s) is not str:
+            raise _Unsupported
+        data = s.encode("utf-8")
+        out.append(_LITERAL)
+        out += _U32.pack(len(data))
+        out += data
+
+    def _istr(self, s: str) -> None:
+        ref = self._refs.get(s)
+        if ref is not None:
+            self._out += ref
+            return
+        if type(s) is not str:
+            raise _Unsupported
+        out = self._out
+        data = s.encode("utf-8")
+        if len(self._refs) < MAX_INTERNED:
+            self._refs[s] = bytes((_REF,)) + _U16.pack(len(self._refs))
+            self._order.append(s)
+            out.append(_NEW)
+        else:
+            out.append(_LITERAL)
+        out += _U32.pack(len(data))
+        out += data
+
+    def _istr_list(self, items: List[str]) -> None:
+        if type(items) is not list:
+            raise _Unsupported
+        out = self._out
+        out += _U16.pack(len(items))
+        refs = self._refs
+        for s in items:
+            ref = refs.get(s)
+            if ref is not None:
+                out += ref
+            else:
+                self._istr(s)
+
+    def _page_data(self, data: Any) -> None:
+        out = self._out
+        if isinstance(data, bytes):
+            out.append(_BYTES)
+        elif isinstance(data, dict):
+            out.append(_JSON)
+            data = dumps_compact(data)
+        else:
+            raise _Unsupported
+        out += _U32.pack(len(data))
+        out += data
+
+    # -- model layouts ----------------------------------------------------
+    def _product(self, p: Any) -> None:
+        if type(p) is not Product:
+            raise _Unsupported
+        self._str(p.name)
+        self._istr_opt(p.concentration)
+        self._istr_list(p.skin_types)
+        self._istr_list(p.key_ingredients)
+        self._istr_list(p.benefits)
+        self._istr_opt(p.how_to_use)
+        self._istr_opt(p.side_effects)
+        self._istr_opt(p.price)
+
+    def _istr_opt(self, s: Optional[str]) -> None:
+        if s is None:
+            self._out.append(_NONE)
+        else:
+            self._istr(s)
+
+    def _questions(self, qs: Any) -> None:
+        if type(qs) is not list:
+            raise _Unsupported
+        self._out += _U16.pack(len(qs))
+        for q in qs:
+            if type(q) is not Question:
+                raise _Unsupported
+            self._istr(q.category)
+            self._str(q.text)
+            self._str(q.answer)
+            self._istr_opt(q.intent)
+
+    def _str_map(self, m: Any) -> None:
+        if type(m) is not dict:
+            raise _Unsupported
+        self._out += _U16.pack(len(m))
+        for k, v in m.items():
+            self._istr(k)
+            self._str(v)
+
+    def _raw(self, payload: Dict[str, Any]) -> None:
+        self._str_map(payload["raw"])
+
+    def _product_parsed(self, payload: Dict[str, Any]) -> None:
+        self._product(payload["product"])
+
+    def _questions_answered(self, payload: Dict[str, Any]) -> None:
+        self._questions(payload["questions"])
+
+    def _faq_page(self, payload: Dict[str, Any]) -> None:
+        page = payload["page"]
+        if type(page) is not FAQPage:
+            raise _Unsupported
+        self._str(page.product_name)
+        self._questions(page.faqs)
+
+    def _product_page(self, payload: Dict[str, Any]) -> None:
+        page = payload["page"]
+        if type(page) is not ProductPage:
+            raise _Unsupported
+        self._product(page.product)
+        self._str_map(page.sections)
+
+    def _comparison_page(self, payload: Dict[str, Any]) -> None:
+        page = payload["page"]
+        if type(page) is not ComparisonPage:
+            raise _Unsupported
+        self._product(page.product_a)
+        self._product(page.product_b)
+        rows = page.comparisons
+        if type(rows) is not dict:
+            raise _Unsupported
+        self._out += _U16.pack(len(rows))
+        for key, row in rows.items():
+            self._istr(key)
+            self._str_map(row)
+
+    def _rendered(self, payload: Dict[str, Any]) -> None:
+        self._page_data(payload["data"])
+
+    # -- string table -----------------------------------------------------
+    def mark(self) -> int:
+        """Size of the string table, to ``rollback`` to if the records encoded after it are never sent."""
+        return len(self._order)
+
+    def rollback(self, mark: int) -> None:
+        """Forget strings interned since ``mark``, so the decoder (which never saw them) stays in sync."""
+        order = self._order
+        for s in order[mark:]:
+            del self._refs[s]
+        del order[mark:]
+
+    # -- records ----------------------------------------------------------
+    def encode(self, msg: Message) -> bytes:
+        codec = _ENCODERS.get(msg.type)
+        if codec is not None and len(msg.payload) == 1:
+            self._out = bytearray((KIND_WIRE,))
+            mark = len(self._order)
+            try:
+                self._istr(msg.type)
+                self._str(msg.correlation_id)
+                codec(self, msg.payload)
+                return bytes(self._out)
+            except (_Unsupported, KeyError, AttributeError):
+                self.rollback(mark)
+        return bytes((KIND_PICKLE,)) + pickle.dumps(msg, pickle.HIGHEST_PROTOCOL)
+
+
+class WireDecoder:
+    """Decodes records produced by the ``WireEncoder`` on the other end of the same stream."""
+
+    def __init__(self) -> None:
+        self._strings: List[str] = []
+        self._buf: Any = b""
+        self._pos = 0
+
+    def _u16(self) -> int:
+        buf, pos = self._buf, self._pos
+        self._pos = pos + 2
+        return buf[pos] | buf[pos + 1] << 8
+
+    def _str(self) -> Optional[str]:
+        buf, pos = self._buf, self._pos
+        tag = buf[pos]
+        if tag == _REF:
+            self._pos = pos + 3
+            return self._strings[buf[pos + 1] | buf[pos + 2] << 8]
+        if tag == _NONE:
+            self._pos = pos + 1
+            return None
+        (n,) = _U32.unpack_from(buf, pos + 1)
+        start = pos + 5
+        self._pos = start + n
+        s = str(buf[start:start + n], "utf-8")
+        if tag == _NEW:
+            s = sys.intern(s)
+            self._strings.append(s)
+        return s
+
+    def _str_list(self) -> List[str]:
+        return [self._str() for _ in range(self._u16())]
+
+    def _str_map(self) -> Dict[str, str]:
+        return {self._str(): self._str() for _ in range(self._u16())}
+
+    def _product(self) -> Product:
+        s, sl = self._str, self._str_list
+        return Product(s(), s(), sl(), sl(), sl(), s(), s(), s())
+
+    def _questions(self) -> List[Question]:
+        s = self._str
+        return [Question(s(), s(), s(), s()) for _ in range(self._u16())]
+
+    def _page_data(self) -> Any:
+        tag = self._buf[self._pos]
+        self._pos += 1
+        (n,) = _U32.unpack_from(self._buf, self._pos)
+        start = self._pos + 4
+        self._pos = start + n
+        data = self._buf[start:self._pos]
+        return bytes(data) if tag == _BYTES else json.loads(str(data, "utf-8"))
+
+    def decode(self, buf: Any) -> Message:
+        """Decode one record from a bytes-like object (e.g. a memoryview into shared memory)."""
+        if buf[0] == KIND_PICKLE:
+            return pickle.loads(buf[1:])
+        self._buf, self._pos = buf, 1
+        try:
+            msg_type = self._str()
+            correlation_id = self._str()
+            payload = _DECODERS[msg_type](self)
+        finally:
+            self._buf = b""
+        return Message(msg_type, payload, correlation_id)
+
+
+_CODECS: Dict[str, Tuple[Callable[[WireEncoder, Dict[str, Any]], None], Callable[[WireDecoder], Dict[str, Any]]]] = {
+    "RAW_INPUT": (WireEncoder._raw, lambda d: {"raw": d._str_map()}),
+    "PRODUCT_PARSED": (WireEncoder._product_parsed, lambda d: {"product": d._product()}),
+    "QUESTIONS_ANSWERED": (WireEncoder._questions_answered, lambda d: {"questions": d._questions()}),
+    "FAQ_PAGE_READY": (WireEncoder._faq_page, lambda d: {"page": FAQPage(d._str(), d._questions())}),
+    "PRODUCT_PAGE_READY": (WireEncoder._product_page, lambda d: {"page": ProductPage(d._product(), d._str_map())}),
+    "COMPARISON_PAGE_READY": (
+        WireEncoder._comparison_page,
+        lambda d: {"page": ComparisonPage(d._product(), d._product(), {d._str(): d._str_map() for _ in range(d._u16())})},
+    ),
+    "FAQ_JSON": (WireEncoder._rendered, lambda d: {"data": d._page_data()}),
+    "PRODUCT_JSON": (WireEncoder._rendered, lambda d: {"data": d._page_data()}),
+    "COMPARISON_JSON": (WireEncoder._rendered, lambda d: {"data": d._page_data()}),
+}
+_ENCODERS = {t: enc for t, (enc, _) in _CODECS.items()}
+_DECODERS = {t: dec for t, (_, dec) in _CODECS.items()}
@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+from src.agent_core import AsyncEventBus, Message
+from src.orchestrator import Orchestrator
+from tests.test_pipeline import RAW_INPUT
+
+
+class _SlowEcho:
+    name = "SlowEcho"
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def on_message(self, msg, publish):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        publish(msg.derive("ECHO", msg.payload))
+
+
+class _Sink:
+    name = "Sink"
+
+    def __init__(self):
+        self.seen = []
+
+    def on_message(self, msg, publish):
+        self.seen.append(msg.payload["i"])
+
+
+class _Boom:
+    name = "Boom"
+
+    def on_message(self, msg, publish):
+        raise RuntimeError("boom")
+
+
+class TestAsyncEventBus(unittest.TestCase):
+    def test_mixed_agents_with_bounded_concurrency(self):
+        echo, sink = _SlowEcho(), _Sink()
+
+        async def main():
+            bus = AsyncEventBus(max_concurrency=4, max_pending=8)
+            bus.subscribe("PING", echo)
+            bus.subscribe("ECHO", sink)
+            async with bus:
+                for i in range(50):
+                    await bus.publish(Message(type="PING", payload={"i": i}))
+                    self.assertLessEqual(bus._queue.qsize(), 8)
+
+        asyncio.run(main())
+        self.assertEqual(sorted(sink.seen), list(range(50)))
+        self.assertLessEqual(echo.peak, 4)
+        self.assertGreater(echo.peak, 1)
+
+    def test_agent_errors_surface_from_run(self):
+        async def main():
+            bus = AsyncEventBus()
+            bus.subscribe("PING", _Boom())
+            await bus.publish(Message(type="PING", payload={}))
+            await bus.run()
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(main())
+
+    def test_arun_batch_matches_run_batch(self):
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(20)]
+        expected = dict(Orchestrator().run_batch(raws))
+
+        async def main():
+            return {cid: out async for cid, out in Orchestrator().arun_batch(raws, max_pending=4, offload_sync=True)}
+
+        self.assertEqual(asyncio.run(main()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
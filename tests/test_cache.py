@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from src.cache import ResultCache, cache_key
+from src.orchestrator import Orchestrator
+from tests.test_pipeline import RAW_INPUT
+
+
+class TestResultCache(unittest.TestCase):
+    def test_key_follows_what_the_parser_keeps(self):
+        # Noise the parser drops shares a key: list spacing, unread columns
+        spaced = dict(RAW_INPUT, **{"Skin Type": RAW_INPUT["Skin Type"].replace(", ", " ,  "), "Notes": "x"})
+        self.assertEqual(cache_key(spaced), cache_key(RAW_INPUT))
+        # Anything rendered verbatim does not
+        self.assertNotEqual(cache_key(dict(RAW_INPUT, Price=" ₹699 ")), cache_key(dict(RAW_INPUT, Price="₹699")))
+        missing = {k: v for k, v in RAW_INPUT.items() if k != "Concentration"}
+        self.assertNotEqual(cache_key(dict(RAW_INPUT, Concentration="")), cache_key(missing))
+        self.assertNotEqual(cache_key(dict(RAW_INPUT, Price="₹799")), cache_key(RAW_INPUT))
+        self.assertNotEqual(cache_key(RAW_INPUT, version="other"), cache_key(RAW_INPUT))
+
+    def test_verbatim_fields_are_not_served_from_each_others_entries(self):
+        orch = Orchestrator(cache=ResultCache())
+        padded = orch.run(dict(RAW_INPUT, Price=" ₹699 "))
+        plain = orch.run(dict(RAW_INPUT, Price="₹699"))
+        self.assertEqual(padded["product_page"], Orchestrator().run(dict(RAW_INPUT, Price=" ₹699 "))["product_page"])
+        self.assertEqual(plain["product_page"], Orchestrator().run(dict(RAW_INPUT, Price="₹699"))["product_page"])
+        self.assertEqual(orch.cache.stats()["hits"], 0)
+
+    def test_batch_hits_skip_the_graph(self):
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(4)]
+        cache = ResultCache(memory_size=100)
+        orch = Orchestrator(cache=cache)
+        first = dict(orch.run_batch(raws))
+        self.assertEqual(cache.stats()["misses"], 4)
+
+        calls = []
+        parse = orch.parse_node.on_message
+        orch.parse_node.on_message = lambda msg, publish: (calls.append(msg), parse(msg, publish))
+        raws[2] = dict(raws[2], Price="₹1")
+        second = dict(orch.run_batch(raws))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second["2"]["product_page"]["price"], "₹1")
+        self.assertEqual({k: v for k, v in second.items() if k != "2"}, {k: v for k, v in first.items() if k != "2"})
+        self.assertEqual(cache.stats()["memory_hits"], 3)
+
+    def test_sqlite_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "cache.sqlite")
+            cache = ResultCache(path=path)
+            expected = Orchestrator(cache=cache).run(RAW_INPUT)
+            cache.close()
+            cache = ResultCache(path=path)
+            self.assertEqual(Orchestrator(cache=cache).run(RAW_INPUT), expected)
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            self.assertEqual(cache.stats()["misses"], 0)
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from src.agents.comparison_agent import ComparisonAgent
+from src.blocks.competitors import CompetitorIndex
+from src.models import Product
+
+
+def _p(name, ingredients, benefits=(), skin=(), price=None, conc=None):
+    return Product(name=name, key_ingredients=list(ingredients), benefits=list(benefits),
+                   skin_types=list(skin), price=price, concentration=conc)
+
+
+CATALOG = [
+    _p("A", ["Vitamin C", "Hyaluronic Acid"], ["Brightening"], ["Oily"], "₹699", "10% Vitamin C"),
+    _p("B", ["vitamin c", "Hyaluronic Acid"], ["Brightening"], ["Oily"], "₹1,299", "15% Vitamin C"),
+    _p("C", ["Vitamin C", "Hyaluronic Acid"], ["Brightening"], ["Oily"], "₹650", "10% Vitamin C"),
+    _p("D", ["Retinol"], ["Anti-aging"], ["Dry"], "₹900"),
+    _p("E", ["Niacinamide"], ["Oil control"], ["Combination"], "₹720"),
+]
+
+
+class TestCompetitorIndex(unittest.TestCase):
+    def test_nearest_prefers_overlap_then_price(self):
+        index = CompetitorIndex(CATALOG)
+        self.assertEqual([j for j, _ in index.nearest(0, k=2)], [2, 1])
+        self.assertAlmostEqual(index.similarity(0, 1), 1.0)
+        self.assertEqual(index.price[1], 1299.0)
+        self.assertEqual(index.concentration[0], 10.0)
+
+    def test_products_without_overlap_fall_back_to_price(self):
+        index = CompetitorIndex(CATALOG)
+        self.assertEqual([j for j, _ in index.nearest(4, k=2)], [0, 2])
+
+    def test_compare_catalog_yields_k_pages_per_product(self):
+        pages = list(ComparisonAgent().compare_catalog(CATALOG, k=2))
+        self.assertEqual(len(pages), 10)
+        for i, j, page in pages:
+            self.assertNotEqual(i, j)
+            self.assertIs(page.product_a, CATALOG[i])
+            self.assertIs(page.product_b, CATALOG[j])
+            self.assertEqual(page.comparisons["Price"]["b"], CATALOG[j].price)
+            self.assertEqual(page.comparisons, ComparisonAgent().run(CATALOG[i], CATALOG[j]).comparisons)
+
+    def test_summaries_follow_direction(self):
+        agent = ComparisonAgent()
+        cheaper_weaker = agent.run(CATALOG[1], CATALOG[2]).comparisons
+        self.assertEqual(cheaper_weaker["Price"]["summary"], "Product B is priced lower")
+        self.assertEqual(cheaper_weaker["Concentration"]["summary"], "Higher concentration in Product A")
+        pricier_stronger = agent.run(CATALOG[2], CATALOG[1]).comparisons
+        self.assertEqual(pricier_stronger["Price"]["summary"], "Product B is priced higher")
+        self.assertEqual(pricier_stronger["Concentration"]["summary"], "Higher concentration in Product B")
+        same = agent.run(CATALOG[0], CATALOG[2]).comparisons
+        self.assertEqual(same["Concentration"]["summary"], "Similar concentration")
+        unparsed = agent.run(CATALOG[0], CATALOG[3]).comparisons
+        self.assertEqual(unparsed["Concentration"]["summary"], "Similar or unspecified")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import unittest
+from src.encoding import dumps_compact
+from src.orchestrator import Orchestrator
+from src.sinks import JsonlShardSink
+from tests.test_pipeline import RAW_INPUT
+
+TRICKY = dict(RAW_INPUT, **{
+    "Product Name": 'Glow "Boost" \\ Serum\t✨',
+    "Side Effects": "Line one\nline two\x01",
+    "Concentration": None,
+})
+
+
+def _compact(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class TestBytesSerialization(unittest.TestCase):
+    def test_pages_are_byte_identical_to_compact_dumps(self):
+        for raw in (RAW_INPUT, TRICKY, {"Product Name": "Bare"}):
+            expected = Orchestrator().run(raw)
+            for mode in ("strict", "trusted"):
+                with self.subTest(raw=raw["Product Name"], mode=mode):
+                    encoded = Orchestrator(template_mode=mode, as_bytes=True).run(raw)
+                    self.assertEqual(set(encoded), set(expected))
+                    for key, value in expected.items():
+                        self.assertIsInstance(encoded[key], bytes)
+                        self.assertEqual(encoded[key], _compact(value))
+                        self.assertEqual(dumps_compact(value), _compact(value))
+
+    def test_sink_output_matches_dict_mode(self):
+        raws = [RAW_INPUT, TRICKY]
+        with tempfile.TemporaryDirectory() as d:
+            for name, orch in (("dicts", Orchestrator()), ("bytes", Orchestrator(template_mode="trusted", as_bytes=True))):
+                with JsonlShardSink(os.path.join(d, name)) as sink:
+                    sink.write_all(orch.run_batch(raws))
+            for page in ("faq", "product_page", "comparison_page", "all_questions"):
+                with open(os.path.join(d, "dicts", page + ".jsonl"), "rb") as a, open(os.path.join(d, "bytes", page + ".jsonl"), "rb") as b:
+                    self.assertEqual(a.read(), b.read())
+
+    def test_bytes_mode_rejects_cache_and_pretty_sinks(self):
+        from src.cache import ResultCache
+        with self.assertRaises(ValueError):
+            Orchestrator(as_bytes=True, cache=ResultCache())
+        with tempfile.TemporaryDirectory() as d, self.assertRaises(ValueError):
+            JsonlShardSink(d, compact=False).write("0", Orchestrator(as_bytes=True).run(RAW_INPUT))
+
+
+if __name__ == "__main__":
+    unittest.main()
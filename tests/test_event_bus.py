@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from src.agent_core import EventBus, Message
+from src.executors import SerialExecutor
+from src.orchestrator import Orchestrator
+from tests.test_pipeline import RAW_INPUT
+
+
+class _WaveSizes(SerialExecutor):
+    def __init__(self):
+        self.sizes = []
+
+    def run_tasks(self, tasks, timed=False):
+        self.sizes.append(len(tasks))
+        return super().run_tasks(tasks, timed)
+
+
+class _Recorder:
+    def __init__(self, name, log, emit=None):
+        self.name = name
+        self.log = log
+        self.emit = emit or {}
+
+    def on_message(self, msg, publish):
+        self.log.append((self.name, msg.type))
+        for t in self.emit.get(msg.type, ()):
+            publish(msg.derive(t, {}))
+
+
+class TestEventBus(unittest.TestCase):
+    def test_fifo_fanout_order(self):
+        log = []
+        bus = EventBus()
+        bus.subscribe("A", _Recorder("first", log, {"A": ["B", "C"]}))
+        bus.subscribe("A", _Recorder("second", log))
+        bus.subscribe("B", _Recorder("b", log))
+        bus.subscribe("C", _Recorder("c", log))
+        bus.publish(Message(type="A", payload={}))
+        bus.run()
+        self.assertEqual(log, [("first", "A"), ("second", "A"), ("b", "B"), ("c", "C")])
+
+    def test_subscribe_after_publish_is_dispatched(self):
+        log = []
+        bus = EventBus()
+        bus.publish(Message(type="A", payload={}))
+        bus.subscribe("A", _Recorder("late", log))
+        bus.run()
+        self.assertEqual(log, [("late", "A")])
+
+    def test_spilling_bus_keeps_fifo_order(self):
+        def drain(bus):
+            log = []
+            bus.subscribe("A", _Recorder("a", log, {"A": ["B"]}))
+            bus.subscribe("B", _Recorder("b", log))
+            for i in range(1000):
+                bus.publish(Message(type="A", payload={"i": i}, correlation_id=str(i)))
+            bus.run()
+            return log, bus.spill_stats()
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            expected, no_stats = drain(EventBus())
+            log, stats = drain(EventBus(max_queued=50, spill_dir=spill_dir))
+            self.assertEqual(log, expected)
+            self.assertEqual(no_stats, {})
+            self.assertEqual(stats["spilled"], stats["restored"])
+            self.assertGreater(stats["spilled"], 900)
+            self.assertLessEqual(stats["peak_resident"], 50 + 2 * 256)
+            # Consumed segments are deleted as the log drains
+            self.assertEqual([f for d in os.listdir(spill_dir) for f in os.listdir(os.path.join(spill_dir, d))], [])
+
+    def test_waves_stay_within_max_queued(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            executor = _WaveSizes()
+            log = []
+            bus = EventBus(executor=executor, max_queued=50, spill_dir=spill_dir)
+            bus.subscribe("A", _Recorder("a", log))
+            for i in range(300):
+                bus.publish(Message(type="A", payload={"i": i}))
+            bus.run()
+        self.assertEqual(len(log), 300)
+        self.assertEqual(max(executor.sizes), 50)
+
+    def test_spilling_bus_renders_identical_pages(self):
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(600)]
+        expected = list(Orchestrator().run_batch(raws))
+        orch = Orchestrator(max_queued=100)
+        # The whole catalog is queued at once, so the bus has to spill
+        self.assertEqual(list(orch.run_batch(raws, max_in_flight=len(raws))), expected)
+        self.assertGreater(orch.bus.spill_stats()["spilled"], 0)
+        partial = list(orch.run_batch(raws, max_in_flight=len(raws), outputs={"faq"}))
+        self.assertEqual(partial, [(cid, {"faq": bundle["faq"]}) for cid, bundle in expected])
+        self.assertGreater(orch._bus_for({"faq"}).spill_stats()["spilled"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
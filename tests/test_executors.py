@@ -0,0 +1,34 @@
+import json
+import unittest
+from src.executors import make_executor
+from src.orchestrator import Orchestrator
+from tests.test_pipeline import RAW_INPUT
+
+
+def _catalog(n):
+    return [dict(RAW_INPUT, **{"Product Name": f"Serum {i}", "Price": f"₹{500 + i}"}) for i in range(n)]
+
+
+def _dump(results):
+    return json.dumps(results, ensure_ascii=False, sort_keys=False).encode("utf-8")
+
+
+class TestExecutors(unittest.TestCase):
+    def test_pooled_executors_match_serial_bytes(self):
+        serial = _dump(list(Orchestrator().run_batch(_catalog(12), max_in_flight=5)))
+        for mode in ("serial", "thread", "process"):
+            with self.subTest(mode=mode), make_executor(mode, max_workers=2) as ex:
+                pooled = _dump(list(Orchestrator(executor=ex).run_batch(_catalog(12), max_in_flight=5)))
+                self.assertEqual(pooled, serial)
+
+    def test_single_run_with_thread_pool(self):
+        with make_executor("thread") as ex:
+            self.assertEqual(Orchestrator(executor=ex).run(RAW_INPUT), Orchestrator().run(RAW_INPUT))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            make_executor("gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import math
+import unittest
+
+from benchmarks.catalog import synthetic_catalog
+from src.agents.comparison_agent import ComparisonAgent
+from src.agents.parser_agent import ParserAgent
+from src.agents.product_page_agent import ProductPageAgent
+from src.blocks.questions import generate_questions_bulk
+from src.models import FrozenProduct
+from src.templates.comparison_template import ComparisonTemplate
+from src.templates.product_template import ProductTemplate
+from tests.test_pipeline import RAW_INPUT
+
+
+class TestProductFrame(unittest.TestCase):
+    def setUp(self):
+        self.raws = [RAW_INPUT, {"Product Name": "Bare"}] + synthetic_catalog(50)
+        self.parser = ParserAgent()
+        self.products = [self.parser.run(raw) for raw in self.raws]
+        self.frame = self.parser.parse_many(self.raws)
+
+    def test_columns_match_row_parser(self):
+        self.assertEqual(len(self.frame), len(self.raws))
+        self.assertEqual(list(self.frame.rows()), [FrozenProduct.from_product(p) for p in self.products])
+        self.assertIs(self.frame.skin_types[0][0], self.frame.row(0).skin_types[0])
+        self.assertEqual(self.frame.how_to_use_text[0], "Apply 2-3 drops in the morning before sunscreen")
+        self.assertEqual((self.frame.price_value[0], self.frame.concentration_pct[0]), (699.0, 10.0))
+        self.assertTrue(math.isnan(self.frame.price_value[1]))
+        # Each frame encodes into its own vocabularies
+        small = self.parser.parse_many([RAW_INPUT])
+        self.assertEqual(small.vocabs["skin_types"].terms, ["oily", "combination"])
+        self.assertEqual(small.skin_types_mask, [0b11])
+
+    def test_frame_consumers_match_per_product_path(self):
+        page_agent, cmp_agent = ProductPageAgent(), ComparisonAgent()
+        tmpl, cmp_tmpl = ProductTemplate(), ComparisonTemplate()
+        rendered = tmpl.render_frame(self.frame, page_agent.run_frame(self.frame))
+        self.assertEqual(rendered, [tmpl.render(page_agent.run(p)) for p in self.products])
+        dump = lambda pages: [json.dumps(cmp_tmpl.render(page)) for page in pages]
+        self.assertEqual(dump(cmp_agent.run_frame(self.frame)), dump(cmp_agent.run(p) for p in self.products))
+        bulk = generate_questions_bulk(list(self.frame.rows()))
+        self.assertEqual(bulk.answers, generate_questions_bulk(self.products).answers)
+
+
+if __name__ == "__main__":
+    unittest.main()
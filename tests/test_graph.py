@@ -0,0 +1,58 @@
+import json
+import unittest
+
+from src.agent_core import EventBus, Message
+from src.graph import GraphError, GraphSpec, Node, compile_graph
+from src.orchestrator import Orchestrator
+from tests.test_pipeline import RAW_INPUT
+
+
+class _Echo:
+    def __init__(self, name, out, log):
+        self.name, self.out, self.log = name, out, log
+
+    def on_message(self, msg, publish):
+        self.log.append(self.name)
+        for t in self.out:
+            publish(msg.derive(t, {}))
+
+
+class TestGraphCompiler(unittest.TestCase):
+    def test_validation_rejects_dangling_types_and_cycles(self):
+        cases = {
+            "nothing produces": GraphSpec((Node("a", ("X",), ("Y",)),), sinks=("Y",)),
+            "nothing consumes": GraphSpec((Node("a", ("X",), ("Y",)),), sources=("X",)),
+            "cycle": GraphSpec((Node("a", ("X", "Z"), ("Y",)), Node("b", ("Y",), ("Z",))), sources=("X",)),
+        }
+        for message, spec in cases.items():
+            with self.assertRaisesRegex(GraphError, message):
+                compile_graph(spec, {"a": None, "b": None})
+
+    def test_linear_chain_fuses_into_one_dispatch(self):
+        spec = GraphSpec(
+            (Node("a", ("IN",), ("AB", "SIDE")), Node("b", ("AB",), ("BC",)), Node("c", ("BC",), ("OUT",))),
+            sources=("IN",),
+            sinks=("OUT", "SIDE"),
+        )
+        log, outs = [], []
+        agents = {n.name: _Echo(n.name, n.produces, log) for n in spec.nodes}
+        graph = compile_graph(spec, agents)
+        self.assertEqual(graph.fused, [("a", "AB", "b"), ("b", "BC", "c")])
+        bus = graph.wire(EventBus())
+        bus.subscribe("OUT", _Echo("sink", (), outs))
+        bus.publish(Message("IN", {}))
+        bus.run()
+        self.assertEqual((log, outs), (["a", "b", "c"], ["sink"]))
+        self.assertEqual([a.name for _, a in bus.subscriptions()], ["a+b+c", "sink"])
+
+    def test_pipeline_fusion_keeps_outputs(self):
+        self.assertEqual(Orchestrator().graph.fused, [])
+        fused = Orchestrator(fuse=True).graph.fused
+        self.assertEqual([t for _, t, _ in fused], ["FAQ_PAGE_READY", "PRODUCT_PAGE_READY", "COMPARISON_PAGE_READY"])
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(6)]
+        dump = lambda orch: json.dumps(list(orch.run_batch(raws, max_in_flight=4)))
+        self.assertEqual(dump(Orchestrator(fuse=True)), dump(Orchestrator()))
+
+
+if __name__ == "__main__":
+    unittest.main()
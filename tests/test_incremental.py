@@ -0,0 +1,45 @@
+import unittest
+from src.orchestrator import Orchestrator
+from tests.test_pipeline import RAW_INPUT
+
+EDITS = [
+    {"Price": "₹749"},
+    {"Concentration": "15% Vitamin C"},
+    {"How to Use": "Apply 4 drops at night"},
+    {"Side Effects": "None known"},
+    {"Skin Type": "Dry"},
+    {"Key Ingredients": "Vitamin C, Ferulic Acid", "Benefits": "Brightening"},
+    {"Product Name": "GlowBoost Max"},
+]
+
+
+class TestIncrementalRerender(unittest.TestCase):
+    def test_patched_bundle_matches_full_run(self):
+        orch = Orchestrator()
+        old = orch.run(RAW_INPUT)
+        for edit in EDITS:
+            with self.subTest(edit=edit):
+                new_raw = dict(RAW_INPUT, **edit)
+                result = orch.rerender(old, RAW_INPUT, new_raw)
+                self.assertEqual(result.outputs, Orchestrator().run(new_raw))
+
+    def test_price_change_touches_only_price_fragments(self):
+        orch = Orchestrator()
+        old = orch.run(RAW_INPUT)
+        result = orch.rerender(old, RAW_INPUT, dict(RAW_INPUT, Price="₹749"))
+        self.assertFalse(result.full_rerun)
+        self.assertEqual(result.changed_fields, {"price"})
+        self.assertEqual(result.recomputed, ["all_questions:price", "faq", "product_page:Price", "comparison_page:Price"])
+        # Unaffected pieces are carried over untouched
+        self.assertIs(result.outputs["product_page"]["sections"]["Overview"], old["product_page"]["sections"]["Overview"])
+        self.assertIs(result.outputs["comparison_page"]["comparisons"]["Usage"], old["comparison_page"]["comparisons"]["Usage"])
+
+    def test_name_change_falls_back_to_full_run(self):
+        orch = Orchestrator()
+        old = orch.run(RAW_INPUT)
+        self.assertTrue(orch.rerender(old, RAW_INPUT, dict(RAW_INPUT, **{"Product Name": "Other"})).full_rerun)
+        self.assertEqual(orch.rerender(old, RAW_INPUT, dict(RAW_INPUT)).recomputed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from itertools import islice
+from src.ingest import RAW_FIELDS, iter_catalog, raw_input_messages
+from src.orchestrator import Orchestrator
+from tests.test_pipeline import RAW_INPUT
+
+
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rows = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(3)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_csv_and_gzipped_jsonl_yield_same_raws(self):
+        csv_path = self._path("catalog.csv")
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=RAW_FIELDS)
+            w.writeheader()
+            w.writerows(self.rows)
+        jsonl_path = self._path("catalog.jsonl.gz")
+        with gzip.open(jsonl_path, "wt", encoding="utf-8") as f:
+            for row in self.rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.write("\n")
+        self.assertEqual(list(iter_catalog(csv_path)), self.rows)
+        self.assertEqual(list(iter_catalog(jsonl_path)), self.rows)
+
+    def test_field_map_lists_and_empty_cells(self):
+        path = self._path("feed.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"name": "Serum X", "Benefits": ["Brightening", "Hydration"], "Price": ""}) + "\n")
+        (raw,) = iter_catalog(path, field_map={"name": "Product Name"})
+        self.assertEqual(raw, {"Product Name": "Serum X", "Benefits": "Brightening, Hydration"})
+        out = Orchestrator().run(raw)
+        self.assertEqual(out["product_page"]["price"], "Not specified")
+
+    def test_streams_into_run_batch(self):
+        path = self._path("catalog.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for row in self.rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        first = next(raw_input_messages(path))
+        self.assertEqual((first.type, first.correlation_id), ("RAW_INPUT", "0"))
+        results = list(islice(Orchestrator().run_batch(iter_catalog(path), max_in_flight=1), 2))
+        self.assertEqual([cid for cid, _ in results], ["0", "1"])
+        self.assertEqual(results[1][1]["faq"]["product_name"], "Serum 1")
+
+    def test_non_object_line_names_its_position(self):
+        path = self._path("catalog.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.rows[0]) + "\n\n[1, 2]\n")
+        with self.assertRaisesRegex(ValueError, r"catalog\.jsonl:3: expected a JSON object"):
+            list(iter_catalog(path))
+
+    def test_unknown_extension(self):
+        with self.assertRaises(ValueError):
+            iter_catalog(self._path("catalog.xml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
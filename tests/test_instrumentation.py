@@ -0,0 +1,62 @@
+import json
+import unittest
+from src.executors import make_executor
+from src.instrumentation import BusMetrics, Histogram, capture_profile
+from src.orchestrator import Orchestrator
+from tests.test_pipeline import RAW_INPUT
+
+AGENTS = {
+    "ParseAgentNode", "QuestionAgentNode", "ProductPageAgentNode", "ComparisonAgentNode",
+    "FAQRenderAgent", "ProductRenderAgent", "ComparisonRenderAgent", "OutputCollectorAgent", "OutputLatch",
+}
+
+
+class TestBusMetrics(unittest.TestCase):
+    def _check(self, metrics, products):
+        snap = metrics.snapshot()
+        self.assertEqual(snap["messages"]["RAW_INPUT"], products)
+        self.assertEqual(snap["messages"]["ALL_OUTPUTS_READY"], products)
+        self.assertEqual(set(snap["agent_latency_seconds"]), AGENTS)
+        self.assertEqual(snap["agent_latency_seconds"]["QuestionAgentNode"]["count"], products)
+        self.assertEqual(snap["published"]["QuestionAgentNode"], 2 * products)
+        json.loads(metrics.to_json())
+        prom = metrics.to_prometheus()
+        self.assertIn('eventbus_messages_total{type="RAW_INPUT"} %d' % products, prom)
+        self.assertIn('eventbus_dispatch_seconds_count{agent="ParseAgentNode"} %d' % products, prom)
+        self.assertIn('eventbus_dispatch_seconds_bucket{agent="ParseAgentNode",le="+Inf"} %d' % products, prom)
+
+    def test_serial_bus(self):
+        orch = Orchestrator()
+        metrics = BusMetrics().attach(orch.bus)
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(3)]
+        self.assertEqual(len(list(orch.run_batch(raws))), 3)
+        self._check(metrics, 3)
+        self.assertGreaterEqual(metrics.max_queue_depth, 2)
+        metrics.detach(orch.bus)
+        orch.run(RAW_INPUT)
+        self.assertEqual(metrics.messages["RAW_INPUT"], 3)
+
+    def test_wave_mode(self):
+        with make_executor("thread", max_workers=2) as ex:
+            orch = Orchestrator(executor=ex)
+            metrics = BusMetrics().attach(orch.bus)
+            self.assertEqual(orch.run(RAW_INPUT), Orchestrator().run(RAW_INPUT))
+        self._check(metrics, 1)
+
+    def test_histogram_quantiles(self):
+        h = Histogram((0.001, 0.01))
+        for v in (0.0005, 0.0005, 0.005, 2.0):
+            h.observe(v)
+        self.assertEqual(h.counts, [2, 1, 1])
+        self.assertEqual(h.quantile(0.5), 0.001)
+        self.assertEqual(h.quantile(0.99), 2.0)
+
+    def test_capture_profile(self):
+        with capture_profile(cpu=True, memory=True, top=5) as report:
+            Orchestrator().run(RAW_INPUT)
+        self.assertIn("cumulative", report["cpu"])
+        self.assertGreater(report["memory"]["peak_bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
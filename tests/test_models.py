@@ -0,0 +1,41 @@
+import unittest
+from src.agents.parser_agent import ParserAgent
+from src.blocks.question_sets import QuestionTable
+from src.blocks.questions import answer_question, generate_questions, generate_questions_bulk
+from src.models import FrozenProduct, FrozenQuestion
+from tests.test_pipeline import RAW_INPUT
+
+
+class TestCompactModels(unittest.TestCase):
+    def setUp(self):
+        self.product = ParserAgent().run(RAW_INPUT)
+
+    def test_frozen_round_trip_and_immutability(self):
+        fp = FrozenProduct.from_product(self.product)
+        self.assertEqual(fp.to_product(), self.product)
+        self.assertEqual(fp.skin_types, ("Oily", "Combination"))
+        self.assertFalse(hasattr(fp, "__dict__"))
+        with self.assertRaises(AttributeError):
+            fp.price = "₹1"
+        q = FrozenQuestion.from_question(answer_question(generate_questions(self.product)[0], self.product))
+        self.assertEqual(q.to_question().answer, q.answer)
+
+    def test_frozen_product_answers_like_product(self):
+        fp = FrozenProduct.from_product(self.product)
+        expected = [answer_question(q, self.product).answer for q in generate_questions(self.product)]
+        self.assertEqual([answer_question(q, fp).answer for q in generate_questions(fp)], expected)
+
+    def test_question_table(self):
+        products = [ParserAgent().run(dict(RAW_INPUT, **{"Product Name": f"Serum {i}"})) for i in range(3)]
+        table = QuestionTable()
+        table.extend(generate_questions_bulk(products))
+        self.assertEqual(len(table), 48)
+        expected = [FrozenQuestion.from_question(answer_question(q, products[1])) for q in generate_questions(products[1])]
+        self.assertEqual(table.questions_for(1), expected)
+        self.assertEqual(table.answer_counts("price"), {"₹699": 3})
+        with self.assertRaises(ValueError):
+            table.add("Serum X", ["only one answer"])
+
+
+if __name__ == "__main__":
+    unittest.main()
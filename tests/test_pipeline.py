@@ -30,5 +30,33 @@ class TestPipeline(unittest.TestCase):
         # Ensure price is present
         self.assertEqual(outputs["product_page"]["price"], "₹699")
 
+    def test_partial_outputs_prune_unneeded_branches(self):
+        full = Orchestrator().run(RAW_INPUT)
+        orch = Orchestrator()
+        calls = []
+        orch.comparison_node.agent.run = lambda *a: calls.append(a)
+        for wanted in ({"product_page"}, {"faq", "all_questions"}):
+            self.assertEqual(orch.run(RAW_INPUT, outputs=wanted), {k: full[k] for k in wanted})
+        self.assertEqual(calls, [])
+        results = dict(orch.run_batch([RAW_INPUT] * 3, outputs={"product_page"}))
+        self.assertEqual(results["2"], {"product_page": full["product_page"]})
+        with self.assertRaises(ValueError):
+            orch.run(RAW_INPUT, outputs={"nope"})
+
+    def test_run_batch_keeps_products_apart(self):
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}", "Price": f"₹{100 + i}"}) for i in range(5)]
+        orch = Orchestrator()
+        results = dict(orch.run_batch(raws, max_in_flight=2))
+        self.assertEqual(sorted(results), [str(i) for i in range(5)])
+        for i in range(5):
+            out = results[str(i)]
+            self.assertEqual(out["faq"]["product_name"], f"Serum {i}")
+            self.assertEqual(out["product_page"]["price"], f"₹{100 + i}")
+            self.assertEqual(out["comparison_page"]["product_a"]["name"], f"Serum {i}")
+        # Collector state is released once each bundle completes
+        self.assertEqual(orch.collector.outputs, {})
+        # The same instance can still serve single runs afterwards
+        self.assertEqual(orch.run(RAW_INPUT), Orchestrator().run(RAW_INPUT))
+
 if __name__ == "__main__":
     unittest.main()
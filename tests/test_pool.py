@@ -0,0 +1,66 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.orchestrator import Orchestrator, OrchestratorPool
+from tests.test_pipeline import RAW_INPUT
+
+
+class _FailOnce:
+    name = "FailOnce"
+
+    def __init__(self):
+        self.failed = False
+
+    def on_message(self, msg, publish):
+        if not self.failed:
+            self.failed = True
+            raise RuntimeError("boom")
+
+
+class TestOrchestratorReuse(unittest.TestCase):
+    def test_reset_recovers_from_failed_run(self):
+        expected = Orchestrator().run(RAW_INPUT)
+        orch = Orchestrator()
+        orch.bus.subscribe("FAQ_PAGE_READY", _FailOnce())
+        with self.assertRaises(RuntimeError):
+            orch.run(RAW_INPUT)
+        self.assertTrue(orch.collector.outputs)
+        orch.reset()
+        self.assertEqual(orch.collector.outputs, {})
+        self.assertEqual(orch.run(RAW_INPUT), expected)
+
+
+class TestOrchestratorPool(unittest.TestCase):
+    def test_concurrent_runs_match_single_instance(self):
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(40)]
+        expected = [Orchestrator().run(raw) for raw in raws]
+        pool = OrchestratorPool(size=3)
+        with ThreadPoolExecutor(max_workers=6) as ex:
+            results = list(ex.map(pool.run, raws))
+        self.assertEqual(results, expected)
+        self.assertEqual(pool.in_use, 0)
+
+    def test_acquire_times_out_when_exhausted(self):
+        pool = OrchestratorPool(size=1)
+        with pool.lease() as orch:
+            with self.assertRaises(TimeoutError):
+                pool.acquire(timeout=0.01)
+            self.assertEqual(pool.in_use, 1)
+        with self.assertRaises(ValueError):
+            pool.release(Orchestrator())
+        self.assertIs(pool.acquire(timeout=0.01), orch)
+
+    def test_double_release_is_rejected(self):
+        pool = OrchestratorPool(size=1)
+        orch = pool.acquire()
+        pool.release(orch)
+        with self.assertRaises(ValueError):
+            pool.release(orch)
+        self.assertEqual(pool.in_use, 0)
+        self.assertIs(pool.acquire(timeout=0.01), orch)
+        with self.assertRaises(TimeoutError):
+            pool.acquire(timeout=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+from src.agents.parser_agent import ParserAgent
+from src.blocks.question_sets import QuestionSet, QuestionSkeleton
+from src.blocks.questions import ANSWERERS, answer_question, classify_question, generate_questions, generate_questions_bulk
+from src.models import Question
+from tests.test_pipeline import RAW_INPUT
+
+
+class TestQuestions(unittest.TestCase):
+    def setUp(self):
+        self.product = ParserAgent().run(RAW_INPUT)
+
+    def test_generated_intents_match_text_classification(self):
+        for q in generate_questions(self.product):
+            self.assertIn(q.intent, ANSWERERS)
+            self.assertEqual(classify_question(q.text), q.intent, q.text)
+
+    def test_questions_without_intent_fall_back_to_text(self):
+        q = answer_question(Question("Usage", "How many drops should I apply?"), self.product)
+        self.assertEqual(q.intent, "drops")
+        self.assertEqual(q.answer, "Apply 2-3 drops.")
+        q = answer_question(Question("Usage", "Anything else?"), self.product)
+        self.assertEqual(q.answer, "Not specified.")
+
+    def test_intent_wins_over_misleading_name(self):
+        product = ParserAgent().run(dict(RAW_INPUT, **{"Product Name": "Best Price Serum"}))
+        answers = {q.intent: q.answer for q in (answer_question(q, product) for q in generate_questions(product))}
+        self.assertEqual(answers["what_is"], "Best Price Serum is a skincare serum.")
+        self.assertEqual(answers["price"], "₹699")
+
+    def test_bulk_generation_matches_per_product(self):
+        products = [ParserAgent().run(dict(RAW_INPUT, **{"Product Name": f"Serum {i}"})) for i in range(4)]
+        columns = generate_questions_bulk(products)
+        self.assertEqual(len(columns), 4)
+        for i, p in enumerate(products):
+            expected = [answer_question(q, p) for q in generate_questions(p)]
+            self.assertEqual(columns.questions_for(i), expected)
+
+    def test_question_set_from_file(self):
+        items = [{"category": "Usage", "template": "Is {name} vegan?", "intent": "unknown"}]
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "set.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(items, f)
+            qs = QuestionSet.from_file(path).render("Serum X")
+        self.assertEqual([(q.category, q.text, q.intent) for q in qs], [("Usage", "Is Serum X vegan?", "unknown")])
+
+    def test_skeleton_rejects_repeated_slot(self):
+        with self.assertRaises(ValueError):
+            QuestionSkeleton("Usage", "{name} or {name}?", "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import runner
+from src.orchestrator import Orchestrator
+from src.sinks import PAGE_KEYS, JsonlShardSink
+from tests.test_pipeline import RAW_INPUT
+
+
+class TestCatalogRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(23)]
+        self.catalog = os.path.join(self.tmp.name, "catalog.jsonl.gz")
+        with gzip.open(self.catalog, "wt", encoding="utf-8") as f:
+            for raw in self.raws:
+                f.write(json.dumps(raw, ensure_ascii=False) + "\n")
+        ref_dir = os.path.join(self.tmp.name, "ref")
+        with JsonlShardSink(ref_dir) as sink:
+            sink.write_all(Orchestrator().run_batch(self.raws))
+        self.expected = {p: self._read(os.path.join(ref_dir, p + ".jsonl")) for p in PAGE_KEYS}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_shards_partition_the_catalog(self):
+        self.assertEqual(runner.parse_shard("2/3"), (2, 3))
+        for bad in ("3/3", "x", "1/0"):
+            with self.assertRaises(ValueError):
+                runner.parse_shard(bad)
+        seen = [i for s in range(3) for _, rows in runner.iter_chunks(self.raws, 4, (s, 3)) for i, _ in rows]
+        self.assertEqual(sorted(seen), list(range(23)))
+
+    def test_resume_after_crash_matches_single_pass(self):
+        out = os.path.join(self.tmp.name, "out")
+        real = runner.process_chunk
+
+        def crash_on_third(chunk, *args):
+            if chunk[0] == 2:
+                raise RuntimeError("worker died")
+            return real(chunk, *args)
+
+        with mock.patch.object(runner, "process_chunk", crash_on_third):
+            with self.assertRaises(RuntimeError):
+                runner.run_catalog(self.catalog, out, chunk_size=5)
+        summary = runner.run_catalog(self.catalog, out, chunk_size=5)
+        self.assertEqual((summary["resumed_chunks"], summary["resumed_products"], summary["products"]), (2, 10, 13))
+        for page in PAGE_KEYS:
+            self.assertEqual(self._read(os.path.join(out, page + ".jsonl")), self.expected[page])
+        self.assertEqual(sorted(os.listdir(out)), sorted(p + ".jsonl" for p in PAGE_KEYS))
+
+    def test_checkpoint_from_other_settings_is_refused(self):
+        out = os.path.join(self.tmp.name, "out")
+        runner.run_catalog(self.catalog, out, chunk_size=5, keep_chunks=True)
+        self.assertTrue(os.path.exists(os.path.join(out, runner.CHECKPOINT_NAME)))
+        with self.assertRaises(ValueError):
+            runner.run_catalog(self.catalog, out, chunk_size=7)
+
+    def test_checkpoint_for_changed_input_is_refused(self):
+        out = os.path.join(self.tmp.name, "out")
+        runner.run_catalog(self.catalog, out, chunk_size=5, keep_chunks=True)
+        with gzip.open(self.catalog, "wt", encoding="utf-8") as f:
+            for raw in reversed(self.raws):
+                f.write(json.dumps(raw, ensure_ascii=False) + "\n")
+        with self.assertRaisesRegex(ValueError, "different settings"):
+            runner.run_catalog(self.catalog, out, chunk_size=5)
+
+    def test_worker_processes_match_single_pass(self):
+        out = os.path.join(self.tmp.name, "out")
+        spill_dir = os.path.join(self.tmp.name, "spill")
+        os.mkdir(spill_dir)
+        summary = runner.run_catalog(self.catalog, out, workers=2, chunk_size=4, max_queued=2, spill_dir=spill_dir)
+        self.assertEqual(summary["products"], 23)
+        for page in PAGE_KEYS:
+            self.assertEqual(self._read(os.path.join(out, page + ".jsonl")), self.expected[page])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import gc
+import json
+import tracemalloc
+import unittest
+
+from src.orchestrator import Orchestrator
+from src.service import ContentService, MicroBatcher
+from tests.test_pipeline import RAW_INPUT
+
+
+async def _call(port, method, path, body=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b"\r\n":
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        return status, json.loads(await reader.readexactly(length))
+    finally:
+        writer.close()
+
+
+def _raws(n):
+    return [dict(RAW_INPUT, **{"Product Name": f"Serum {i}", "Price": f"₹{500 + i}"}) for i in range(n)]
+
+
+def _unseen(start, stop):
+    # Every list term is new, so nothing can be served from earlier products
+    return [
+        dict(RAW_INPUT, **{"Product Name": f"P{i}", "Key Ingredients": f"Ing {i}, Oil {i}", "Benefits": f"Glow {i}", "Skin Type": f"Type {i}"})
+        for i in range(start, stop)
+    ]
+
+
+class TestContentService(unittest.TestCase):
+    def test_concurrent_requests_are_batched_and_match_orchestrator(self):
+        raws = _raws(24)
+        expected = [Orchestrator().run(raw) for raw in raws]
+
+        async def scenario():
+            async with ContentService(port=0, max_batch_size=8, max_wait=0.05) as service:
+                bodies = [json.dumps(raw).encode() for raw in raws]
+                replies = await asyncio.gather(*(_call(service.port, "POST", "/generate", b) for b in bodies))
+                partial = await _call(service.port, "POST", "/generate?outputs=product_page", bodies[0])
+                metrics = await _call(service.port, "GET", "/metrics")
+                return replies, partial, metrics
+
+        replies, partial, (_, metrics) = asyncio.run(scenario())
+        for (status, body), want in zip(replies, expected):
+            self.assertEqual(status, 200)
+            self.assertEqual(list(body), ["faq", "product_page", "comparison_page"])
+            self.assertEqual(body, {k: want[k] for k in body})
+        self.assertEqual(partial, (200, {"product_page": expected[0]["product_page"]}))
+        self.assertEqual(metrics["requests"], 25)
+        self.assertLess(metrics["batches"], 25)
+        self.assertLessEqual(metrics["max_batch_size"], 8)
+        self.assertGreater(metrics["latency_seconds"]["p99"], 0)
+
+    def test_bad_requests_get_client_errors(self):
+        async def scenario():
+            async with ContentService(port=0) as service:
+                return [
+                    await _call(service.port, "POST", "/generate", b"{not json"),
+                    await _call(service.port, "POST", "/generate", b'{"Product Name": 5}'),
+                    await _call(service.port, "POST", "/generate?outputs=poster", json.dumps(RAW_INPUT).encode()),
+                    await _call(service.port, "GET", "/generate"),
+                    await _call(service.port, "GET", "/nope"),
+                ]
+
+        self.assertEqual([status for status, _ in asyncio.run(scenario())], [400, 400, 400, 405, 404])
+
+    def test_failing_product_only_fails_its_own_request(self):
+        async def scenario():
+            batcher = MicroBatcher(Orchestrator(), max_batch_size=4, max_wait=0.05)
+            try:
+                raws = _raws(3)
+                raws.insert(1, {"Product Name": 5})
+                return await asyncio.gather(*(batcher.submit(raw) for raw in raws), return_exceptions=True)
+            finally:
+                await batcher.stop()
+
+        results = asyncio.run(scenario())
+        self.assertIsInstance(results[1], TypeError)
+        self.assertEqual([r["faq"] for i, r in enumerate(results) if i != 1], [Orchestrator().run(raw)["faq"] for raw in _raws(3)])
+
+    def test_batcher_can_be_restarted_after_stop(self):
+        batcher = MicroBatcher(Orchestrator(), max_wait=0)
+
+        async def once():
+            try:
+                return await batcher.submit(RAW_INPUT)
+            finally:
+                await batcher.stop()
+
+        first, second = asyncio.run(once()), asyncio.run(once())
+        self.assertEqual(first, second)
+        self.assertEqual(first["faq"], Orchestrator().run(RAW_INPUT)["faq"])
+
+    def test_resident_state_stays_flat_across_distinct_products(self):
+        orch = Orchestrator(as_bytes=True)
+
+        async def scenario():
+            batcher = MicroBatcher(orch, max_batch_size=32, max_wait=0.001)
+            sizes = []
+            try:
+                for r in range(8):
+                    await asyncio.gather(*(batcher.submit(raw) for raw in _unseen(r * 400, (r + 1) * 400)))
+                    gc.collect()
+                    sizes.append(tracemalloc.get_traced_memory()[0])
+            finally:
+                await batcher.stop()
+            return sizes
+
+        tracemalloc.start()
+        try:
+            sizes = asyncio.run(scenario())
+        finally:
+            tracemalloc.stop()
+        # Once the bounded memos are full, another 1,200 unseen products add (almost) nothing
+        self.assertLess(sizes[-1] - sizes[4], 256 * 1024, sizes)
+        self.assertEqual(orch.collector.outputs, {})
+        self.assertTrue(all(not collector.outputs for _, collector in orch._partial.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from src.orchestrator import Orchestrator
+from src.sinks import PAGE_KEYS, JsonlShardSink
+from tests.test_pipeline import RAW_INPUT
+
+
+def _read_jsonl(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestJsonlShardSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(5)]
+        self.results = list(Orchestrator().run_batch(raws))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_one_shard_per_page_type(self):
+        with JsonlShardSink(self.tmp.name, flush_bytes=1) as sink:
+            self.assertEqual(sink.write_all(self.results), 5)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), sorted(p + ".jsonl" for p in PAGE_KEYS))
+        rows = _read_jsonl(os.path.join(self.tmp.name, "faq.jsonl"))
+        self.assertEqual([r["id"] for r in rows], ["0", "1", "2", "3", "4"])
+        self.assertEqual(rows[2]["data"], self.results[2][1]["faq"])
+        with open(os.path.join(self.tmp.name, "product_page.jsonl"), encoding="utf-8") as f:
+            self.assertNotIn('": ', f.readline())
+
+    def test_gzip_rotation(self):
+        sink = JsonlShardSink(self.tmp.name, pages=("product_page",), gzip=True, shard_records=2)
+        sink.write_all(self.results)
+        paths = sink.close()
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         ["product_page-00000.jsonl.gz", "product_page-00001.jsonl.gz", "product_page-00002.jsonl.gz"])
+        self.assertEqual(sum(len(_read_jsonl(p)) for p in paths), 5)
+
+    def test_partial_bundles_need_matching_pages(self):
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(3)]
+        partial = list(Orchestrator().run_batch(raws, outputs={"faq"}))
+        with JsonlShardSink(self.tmp.name, pages=("faq",)) as sink:
+            self.assertEqual(sink.write_all(partial), 3)
+        self.assertEqual(os.listdir(self.tmp.name), ["faq.jsonl"])
+        sink = JsonlShardSink(self.tmp.name)
+        with self.assertRaisesRegex(ValueError, "product_page.*pages="):
+            sink.write(*partial[0])
+        self.assertEqual(sink.records, 0)
+        sink.abort()
+
+    def test_failure_leaves_no_partial_files(self):
+        with self.assertRaises(RuntimeError):
+            with JsonlShardSink(self.tmp.name, flush_bytes=1) as sink:
+                sink.write_all(self.results)
+                raise RuntimeError("crash")
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from src.agents.parser_agent import ParserAgent
+from src.agents.question_agent import QuestionAgent
+from src.models import FAQPage
+from src.orchestrator import Orchestrator
+from src.templates.faq_template import FAQTemplate
+from src.templates.schema import compile_schema
+from tests.test_pipeline import RAW_INPUT
+
+
+class TestSchemaCompiler(unittest.TestCase):
+    def test_nested_types_and_paths(self):
+        validate = compile_schema(FAQTemplate.schema, "FAQTemplate")
+        good = {"product_name": "X", "faqs": [{"category": "Usage", "question": "Q?", "answer": "A"}] * 5}
+        self.assertIsNone(validate(good))
+        bad_item = dict(good, faqs=good["faqs"][:4] + [{"category": "Usage", "question": "Q?", "answer": None}])
+        with self.assertRaisesRegex(ValueError, r"faqs\[\]\.answer must be string"):
+            validate(bad_item)
+        with self.assertRaisesRegex(ValueError, "at least 5 items"):
+            validate(dict(good, faqs=good["faqs"][:4]))
+        with self.assertRaisesRegex(ValueError, "missing required field: product_name"):
+            validate({"faqs": good["faqs"]})
+
+    def test_enum_and_unsupported_keywords(self):
+        validate = compile_schema({"type": "string", "enum": ["a", "b"]}, "T")
+        validate("a")
+        with self.assertRaises(ValueError):
+            validate("c")
+        with self.assertRaises(ValueError):
+            compile_schema({"type": "string", "pattern": "x"}, "T")
+
+
+class TestTemplateModes(unittest.TestCase):
+    def test_strict_rejects_and_trusted_skips(self):
+        product = ParserAgent().run(RAW_INPUT)
+        page = FAQPage(product_name=product.name, faqs=QuestionAgent().run(product)[:3])
+        with self.assertRaises(ValueError):
+            FAQTemplate().render(page)
+        self.assertEqual(len(FAQTemplate("trusted").render(page)["faqs"]), 3)
+        with self.assertRaises(ValueError):
+            FAQTemplate("lenient")
+
+    def test_trusted_pipeline_output_matches_strict(self):
+        self.assertEqual(Orchestrator(template_mode="trusted").run(RAW_INPUT), Orchestrator().run(RAW_INPUT))
+
+
+if __name__ == "__main__":
+    unittest.main()
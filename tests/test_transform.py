@@ -0,0 +1,49 @@
+import unittest
+from unittest import mock
+from src.blocks import transform
+from src.blocks.transform import compare_lists, compare_one_to_many, parse_percent, parse_price
+from src.blocks.vocab import Vocabulary
+
+
+class TestCompareLists(unittest.TestCase):
+    def test_case_insensitive_sorted_title_case(self):
+        out = compare_lists(["Vitamin C", "hyaluronic acid", "Zinc"], ["vitamin c", "Niacinamide"], Vocabulary())
+        self.assertEqual(out, {
+            "overlap": ["Vitamin C"],
+            "only_a": ["Hyaluronic Acid", "Zinc"],
+            "only_b": ["Niacinamide"],
+        })
+        self.assertEqual(compare_lists([], []), {"overlap": [], "only_a": [], "only_b": []})
+
+    def test_given_vocabulary_is_used_even_when_empty(self):
+        vocab = Vocabulary()
+        a, b = ["Zinc", "Retinol"], ["zinc", "Ceramides"]
+        self.assertEqual(compare_lists(a, b, vocab), compare_lists(a, b))
+        self.assertEqual(vocab.terms, ["zinc", "retinol", "ceramides"])
+        compare_one_to_many(["Squalane"], [["Zinc"]], vocab)
+        self.assertEqual(len(vocab), 4)
+
+    def test_one_to_many_matches_pairwise(self):
+        a = ["Vitamin C", "Retinol"]
+        many = [["retinol"], [], ["Zinc", "Vitamin C", "Ceramides"], ["Vitamin C", "RETINOL"]]
+        expected = [compare_lists(a, b) for b in many]
+        self.assertEqual(compare_one_to_many(a, many), expected)
+        with mock.patch.object(transform, "np", None):
+            self.assertEqual(compare_one_to_many(a, many), expected)
+
+    @unittest.skipUnless(transform.np is not None, "NumPy not installed")
+    def test_one_to_many_numpy_path_with_grown_vocabulary(self):
+        vocab = Vocabulary()
+        vocab.encode(["Aloe", "Zinc", "Bakuchiol"])  # terms the comparison does not use
+        a, many = ["Vitamin C", "zinc"], [["ZINC", "Aloe"], ["Vitamin C"], []]
+        self.assertEqual(compare_one_to_many(a, many, vocab), [compare_lists(a, b) for b in many])
+
+    def test_parse_numbers(self):
+        self.assertEqual(parse_percent("10% Vitamin C"), 10.0)
+        self.assertIsNone(parse_percent("Vitamin C"))
+        self.assertEqual(parse_price("₹1,299"), 1299.0)
+        self.assertIsNone(parse_price(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
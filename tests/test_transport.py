@@ -0,0 +1,184 @@
+import multiprocessing as mp
+import platform
+import random
+import threading
+import unittest
+from unittest import mock
+
+from src.agent_core import EventBus, Message
+from src.executors import make_executor
+from src.models import Product
+from src.orchestrator import Orchestrator
+from src.shm_ring import TSO_MACHINES, ShmRing
+from src.wire import KIND_PICKLE, KIND_WIRE, WireDecoder, WireEncoder
+from tests.test_pipeline import RAW_INPUT
+
+
+class _Tap:
+    def __init__(self, log):
+        self.log = log
+
+    def on_message(self, msg, publish):
+        self.log.append(msg)
+
+
+class _Boom:
+    parallel_safe = True
+
+    def on_message(self, msg, publish):
+        raise KeyError(msg.payload["missing"])
+
+
+class _ParseThenFail:
+    """Publishes a product, then (when asked) a message that cannot cross the ring."""
+
+    parallel_safe = True
+
+    def on_message(self, msg, publish):
+        n = msg.payload["n"]
+        publish(msg.derive("PRODUCT_PARSED", {"product": Product(f"p{n}", f"conc-{n}", [f"skin-{n}"])}))
+        if msg.payload.get("fail"):
+            publish(msg.derive("UNSENDABLE", {"lock": threading.Lock()}))
+
+
+class _Tagger:
+    parallel_safe = True
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def on_message(self, msg, publish):
+        publish(msg.derive("TAG", {"tag": self.tag}))
+
+
+class _Republish:
+    parallel_safe = True
+
+    def on_message(self, msg, publish):
+        publish(msg.derive("PRODUCT_PARSED", {"product": msg.payload["product"]}))
+
+
+def _echo(requests, responses):
+    while True:
+        data = requests.get()
+        if not data:
+            break
+        responses.put(data[::-1])
+
+
+def _messages():
+    bus = EventBus()
+    log = []
+    orch = Orchestrator(fuse=False)
+    tap = _Tap(log)
+    for message_type in dict(orch.bus.subscriptions()):
+        if message_type != "ALL_OUTPUTS_READY":
+            bus.subscribe(message_type, tap)
+    orch.graph.wire(bus)
+    for i in range(3):
+        bus.publish(Message("RAW_INPUT", {"raw": dict(RAW_INPUT, **{"Product Name": f"Serum {i}"})}, str(i)))
+    bus.run()
+    return log
+
+
+class TestWireFormat(unittest.TestCase):
+    def test_round_trip_all_pipeline_messages(self):
+        enc, dec = WireEncoder(), WireDecoder()
+        messages = _messages()
+        self.assertGreater(len({m.type for m in messages}), 6)
+        for msg in messages:
+            record = enc.encode(msg)
+            self.assertEqual(record[0], KIND_WIRE, msg.type)
+            self.assertEqual(dec.decode(memoryview(record)), msg)
+        # Repeated strings are sent as references after their first use
+        fresh = WireEncoder()
+        first, again = fresh.encode(messages[1]), fresh.encode(messages[1])
+        self.assertLess(len(again), len(first))
+
+    def test_unknown_payloads_fall_back_to_pickle_without_desync(self):
+        enc, dec = WireEncoder(), WireDecoder()
+        odd = Message("PRODUCT_PARSED", {"product": {"not": "a Product"}}, "x")
+        for msg in (odd, Message("CUSTOM", {"n": 1}), Message("RAW_INPUT", {"raw": {"Product Name": "A"}}, "1")):
+            record = enc.encode(msg)
+            self.assertEqual(dec.decode(record), msg)
+        self.assertEqual(enc.encode(odd)[0], KIND_PICKLE)
+
+
+class TestShmPlatform(unittest.TestCase):
+    def test_shm_executor_refuses_weakly_ordered_machines(self):
+        with mock.patch("platform.machine", return_value="arm64"):
+            with self.assertRaisesRegex(RuntimeError, "x86-64"):
+                make_executor("shm", max_workers=1)
+            with self.assertRaises(RuntimeError):
+                ShmRing(256)
+
+
+@unittest.skipUnless(platform.machine().lower() in TSO_MACHINES, "ShmRing needs x86-64")
+class TestShmTransport(unittest.TestCase):
+    def test_ring_wraps_across_processes(self):
+        requests, responses = ShmRing(256), ShmRing(256)
+        proc = mp.Process(target=_echo, args=(requests, responses))
+        proc.start()
+        try:
+            rng = random.Random(7)
+            sent = [bytes(rng.getrandbits(8) for _ in range(rng.randrange(1, 90))) for _ in range(2000)]
+            got = []
+            for data in sent:
+                requests.put(data, idle=lambda: got.extend(iter(lambda: responses.try_consume(bytes), None)), timeout=10)
+            while len(got) < len(sent):
+                got.append(responses.get(timeout=10))
+            requests.put(b"")
+            proc.join(10)
+            self.assertEqual(got, [d[::-1] for d in sent])
+        finally:
+            requests.unlink()
+            responses.unlink()
+
+    def test_shm_executor_matches_serial_and_surfaces_errors(self):
+        raws = [dict(RAW_INPUT, **{"Product Name": f"Serum {i}"}) for i in range(20)]
+        serial = list(Orchestrator().run_batch(raws, max_in_flight=7))
+        with make_executor("shm", max_workers=2) as ex:
+            self.assertEqual(list(Orchestrator(executor=ex).run_batch(raws, max_in_flight=7)), serial)
+            bus = EventBus(executor=ex)
+            bus.subscribe("X", _Boom())
+            bus.publish(Message("X", {"missing": "k"}))
+            with self.assertRaises(KeyError):
+                bus.run()
+            # The executor stays usable after a failed task
+            self.assertEqual(Orchestrator(executor=ex).run(RAW_INPUT), Orchestrator().run(RAW_INPUT))
+
+    def test_failed_multi_frame_reply_keeps_string_tables_in_step(self):
+        agent = _ParseThenFail()
+        with make_executor("shm", max_workers=1) as ex:
+            run = lambda n, fail=False: ex.run_tasks([(agent, Message("GO", {"n": n, "fail": fail}))])[0]
+            self.assertEqual(run(1)[0].payload["product"], Product("p1", "conc-1", ["skin-1"]))
+            with self.assertRaises(TypeError):
+                run(2, fail=True)
+            # The strings of the discarded PRODUCT_PARSED frame are sent again, not referenced
+            for n in (2, 1, 3):
+                self.assertEqual(run(n)[0].payload["product"], Product(f"p{n}", f"conc-{n}", [f"skin-{n}"]))
+            # Parent side: a record that does not fit is never sent, so its strings are forgotten too
+            big = Product("big", skin_types=["skin-5"], how_to_use="x" * (1 << 23))
+            with self.assertRaises(ValueError):
+                ex.run_tasks([(_Republish(), Message("PRODUCT_PARSED", {"product": big}))])
+            small = Product("small", skin_types=["skin-5"])
+            out = ex.run_tasks([(_Republish(), Message("PRODUCT_PARSED", {"product": small}))])[0]
+            self.assertEqual(out[0].payload["product"], small)
+
+    def test_workers_see_agent_changes_between_calls(self):
+        tagger = _Tagger("a")
+        with make_executor("shm", max_workers=1) as ex:
+            run = lambda tasks: [out[0].payload["tag"] for out in ex.run_tasks(tasks)]
+            self.assertEqual(run([(tagger, Message("GO", {}))]), ["a"])
+            tagger.tag = "b"
+            self.assertEqual(run([(tagger, Message("GO", {}))]), ["b"])
+            tagger.tag = "a"
+            self.assertEqual(run([(tagger, Message("GO", {}))]), ["a"])
+            # More distinct agents than a worker keeps: old slots are overwritten in order
+            taggers = [_Tagger(str(i)) for i in range(600)]
+            self.assertEqual(run([(t, Message("GO", {})) for t in taggers]), [t.tag for t in taggers])
+            self.assertEqual(run([(t, Message("GO", {})) for t in taggers[:3]]), ["0", "1", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()